@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""Benchmark the manifest and verification scripts against a synthetic snapshot."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+if __package__ in {None, ""}:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.common import OG_DIR, og_placeholder  # noqa: E402
+from scripts.verify_projection_manifest import SEARCH_BASE_URL, verify, verify_search_surface  # noqa: E402
+from scripts.verify_sponsorships import validate  # noqa: E402
+from scripts.write_projection_manifest import build_manifest  # noqa: E402
+
+SCHEMA_VERSION = "cast-event.benchmark.v1"
+SOURCE_COMMIT = "0" * 40
+GENERATED_AT = "2026-08-10T00:00:00Z"
+EPOCH = datetime(2026, 8, 10, 12, 0, tzinfo=timezone.utc)
+CATEGORIES = ("music", "learning", "community", "game")
+SITEMAP_URL_LIMIT = 50_000
+SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+DEFAULT_THRESHOLD = 0.25
+
+
+def iso(value: datetime) -> str:
+    return value.isoformat().replace("+00:00", "Z")
+
+
+def synthetic_event(index: int) -> dict[str, Any]:
+    starts_at = EPOCH + timedelta(hours=index)
+    event_id = f"event-{index:07d}"
+    return {
+        "id": event_id,
+        "occurrence_id": event_id,
+        "title": f"Synthetic event {index}",
+        "canonical_name": f"Synthetic event {index}",
+        "starts_at": iso(starts_at),
+        "ends_at": iso(starts_at + timedelta(hours=1)),
+        "location": "VRChat",
+        "category": CATEGORIES[index % len(CATEGORIES)],
+        "status": "scheduled",
+        "source": "synthetic",
+        "review_required": False,
+        "official_url": f"https://example.com/events/{index}",
+        "participation_url": f"https://example.com/events/{index}/join",
+        "primary_action_url": f"https://example.com/events/{index}",
+        "official_links": [
+            {"url": f"https://example.com/events/{index}", "kind": "official_site", "label": "公式サイト"}
+        ],
+        "tags": ["VRChat", "synthetic"],
+    }
+
+
+def write_json(path: Path, payload: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def write_page(path: Path, url: str, body: str = "") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        f'<!doctype html><html><head><link rel="canonical" href="{SEARCH_BASE_URL}{url}"></head>'
+        f"<body>{body}</body></html>\n",
+        encoding="utf-8",
+    )
+
+
+def write_sitemap(root: Path, urls: list[str]) -> None:
+    """Write sitemap.xml, switching to a sitemapindex once the URL limit is exceeded."""
+    def urlset(chunk: list[str]) -> str:
+        body = "".join(f"<url><loc>{url}</loc></url>" for url in chunk)
+        return f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="{SITEMAP_NAMESPACE}">{body}</urlset>'
+
+    if len(urls) <= SITEMAP_URL_LIMIT:
+        (root / "sitemap.xml").write_text(urlset(urls), encoding="utf-8")
+        return
+    shards = []
+    for start in range(0, len(urls), SITEMAP_URL_LIMIT):
+        name = f"sitemaps/sitemap-{start // SITEMAP_URL_LIMIT:04d}.xml"
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_text(urlset(urls[start:start + SITEMAP_URL_LIMIT]), encoding="utf-8")
+        shards.append(f"<sitemap><loc>{SEARCH_BASE_URL}{name}</loc></sitemap>")
+    (root / "sitemap.xml").write_text(
+        f'<?xml version="1.0" encoding="UTF-8"?><sitemapindex xmlns="{SITEMAP_NAMESPACE}">'
+        f'{"".join(shards)}</sitemapindex>',
+        encoding="utf-8",
+    )
+
+
+def write_synthetic_snapshot(root: Path, event_count: int, campaign_count: int | None = None) -> dict[str, int]:
+    """Write a deterministic snapshot in the shape of the projection test fixtures.
+
+    Every event gets a detail page and an og image; categories and one series
+    page complete the search surface.
+    """
+    events = [synthetic_event(index) for index in range(event_count)]
+    write_json(root / "events.json", {"generated_at": GENERATED_AT, "count": event_count, "events": events})
+    write_json(root / "health.json", {
+        "status": "ok",
+        "event_count": event_count,
+        "enabled_sources": 1,
+        "successful_sources": 1,
+        "failed_sources": 0,
+        "generated_at": GENERATED_AT,
+    })
+    write_json(root / "event-ontology.json", {"schema_version": "3.0", "source_event_count": event_count})
+    write_json(root / "ontology-match-audit.json", {"event_count": event_count, "ontology_entries": 1})
+    write_json(root / "audit/proof.json", {"status": "ok"})
+    write_json(root / "analytics-config.json", {"ga4_measurement_id": None})
+    (root / "analytics.js").write_text("// analytics\n", encoding="utf-8")
+    (root / "calendar.ics").write_text("BEGIN:VCALENDAR\nEND:VCALENDAR\n", encoding="utf-8")
+
+    pages = [f"events/{event['id']}/" for event in events]
+    pages += [f"categories/{category}/" for category in CATEGORIES]
+    pages.append("series/sample/")
+    for url in pages:
+        write_page(root / url / "index.html", url)
+    write_page(root / "index.html", "", "".join(f'<a href="{url}">{url}</a>' for url in pages))
+    write_sitemap(root, [SEARCH_BASE_URL, *(SEARCH_BASE_URL + url for url in pages)])
+
+    placeholder = og_placeholder()
+    (root / OG_DIR).mkdir(parents=True, exist_ok=True)
+    for event in events:
+        (root / OG_DIR / f"{event['id']}.png").write_bytes(placeholder)
+
+    campaigns = []
+    for index in range(event_count if campaign_count is None else campaign_count):
+        event = events[index % event_count]
+        campaigns.append({
+            "campaign_id": f"campaign-{index:07d}",
+            "event_id": event["id"],
+            "sponsor_name": "Synthetic Organizer",
+            "starts_at": iso(EPOCH + timedelta(days=index // event_count * 7)),
+            "ends_at": iso(EPOCH + timedelta(days=index // event_count * 7 + 7)),
+            "status": "APPROVED",
+            "approved_at": iso(EPOCH - timedelta(days=1)),
+            "destination_url": event["official_url"],
+            "authorization_status": "VERIFIED",
+            "authorization_evidence_url": f"{event['official_url']}/authorization",
+        })
+    write_json(root / "sponsorships.json", {"schema_version": "featured-tonight.v1", "campaigns": campaigns})
+    return {"events": event_count, "pages": len(pages), "campaigns": len(campaigns)}
+
+
+def measure(stage: Callable[[], int]) -> dict[str, Any]:
+    """Time one stage, then run it again under tracemalloc for its peak memory.
+
+    Tracing slows allocation-heavy stages several times over, so the clock
+    only runs on the untraced pass. The stage returns how many items it
+    processed.
+    """
+    started = time.perf_counter()
+    items = stage()
+    seconds = time.perf_counter() - started
+    tracemalloc.start()
+    try:
+        stage()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "seconds": round(seconds, 6),
+        "items": items,
+        "items_per_second": round(items / seconds, 1) if seconds > 0 else None,
+        "peak_memory_bytes": peak,
+    }
+
+
+def run_benchmark(root: Path, event_count: int, campaign_count: int | None = None) -> dict[str, Any]:
+    sizes = write_synthetic_snapshot(root, event_count, campaign_count)
+    manifest_path = root.parent / f"{root.name}-projection-manifest.json"
+    state: dict[str, Any] = {}
+
+    def manifest_stage() -> int:
+        state["manifest"] = build_manifest(root, SOURCE_COMMIT, timestamp=GENERATED_AT)
+        manifest_path.write_text(json.dumps(state["manifest"]), encoding="utf-8")
+        return len(state["manifest"]["assets"])
+
+    def verify_stage() -> int:
+        return verify(root, manifest_path)["asset_count"]
+
+    def search_stage() -> int:
+        verify_search_surface(root, state["manifest"]["assets"])
+        return sizes["pages"]
+
+    def sponsorship_stage() -> int:
+        sponsorships = json.loads((root / "sponsorships.json").read_text(encoding="utf-8"))
+        events = json.loads((root / "events.json").read_text(encoding="utf-8"))
+        return validate(sponsorships, events, now=EPOCH)["campaign_count"]
+
+    stages = {
+        "build_manifest": manifest_stage,
+        "verify": verify_stage,
+        "verify_search_surface": search_stage,
+        "verify_sponsorships": sponsorship_stage,
+    }
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "event_count": event_count,
+        "snapshot": sizes,
+        "stages": {name: measure(stage) for name, stage in stages.items()},
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> list[str]:
+    """Return one message per stage whose time or peak memory regressed beyond ``threshold``."""
+    regressions = []
+    for name, stage in baseline.get("stages", {}).items():
+        measured = current["stages"].get(name)
+        if measured is None:
+            regressions.append(f"{name}: stage missing from current run")
+            continue
+        for metric in ("seconds", "peak_memory_bytes"):
+            limit = stage[metric] * (1 + threshold)
+            if measured[metric] > limit:
+                regressions.append(
+                    f"{name}: {metric} {measured[metric]} exceeds baseline {stage[metric]} "
+                    f"by more than {threshold:.0%}"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=1000, help="synthetic event count")
+    parser.add_argument("--campaigns", type=int, help="synthetic sponsorship campaigns; defaults to --events")
+    parser.add_argument("--output", help="write the benchmark result JSON here")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed regression ratio")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp:
+        result = run_benchmark(Path(temp) / "snapshot", args.events, args.campaigns)
+    rendered = json.dumps(result, ensure_ascii=False, indent=2) + "\n"
+    if args.output:
+        Path(args.output).write_text(rendered, encoding="utf-8")
+    print(rendered, end="")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        if baseline.get("event_count") != result["event_count"]:
+            raise SystemExit("baseline event_count does not match this run")
+        if baseline.get("snapshot", {}).get("campaigns") != result["snapshot"]["campaigns"]:
+            raise SystemExit("baseline campaign count does not match this run")
+        regressions = compare(result, baseline, args.threshold)
+        for message in regressions:
+            print(message, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,49 @@
+"""Constants and small helpers shared by the snapshot writers, verifiers and benchmark."""
+
+from __future__ import annotations
+
+import os
+import struct
+import zlib
+from datetime import datetime, timezone
+
+DEFAULT_JOBS = min(32, (os.cpu_count() or 1) + 4)
+PROBLEM_LIMIT = 20
+PAGE_DIR = "events"
+OG_DIR = "og/events"
+OG_SUFFIX = ".png"
+OG_WIDTH = 1200
+OG_HEIGHT = 630
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def problem_message(problems: list[str]) -> str:
+    """Join the first PROBLEM_LIMIT problems, noting how many more were cut."""
+    shown = problems[:PROBLEM_LIMIT]
+    if len(problems) > PROBLEM_LIMIT:
+        shown.append(f"and {len(problems) - PROBLEM_LIMIT} more")
+    return "; ".join(shown)
+
+
+def parse_datetime(value: object, field: str, error: type[ValueError] = ValueError) -> datetime:
+    """Parse an ISO 8601 timestamp with an explicit offset into UTC; raise ``error`` naming ``field``."""
+    if not isinstance(value, str) or not value.strip():
+        raise error(f"{field}: non-empty ISO 8601 value required")
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError as exc:
+        raise error(f"{field}: invalid ISO 8601 datetime") from exc
+    if parsed.tzinfo is None:
+        raise error(f"{field}: timezone offset required")
+    return parsed.astimezone(timezone.utc)
+
+
+def png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def og_placeholder(width: int = OG_WIDTH, height: int = OG_HEIGHT) -> bytes:
+    """Return a valid, blank RGB PNG of the og card size."""
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    pixels = zlib.compress(b"\0" * ((width * 3 + 1) * height), 9)
+    return PNG_SIGNATURE + png_chunk(b"IHDR", header) + png_chunk(b"IDAT", pixels) + png_chunk(b"IEND", b"")
@@ -0,0 +1,165 @@
+"""Opt-in run profiling shared by the manifest writer and the verifier scripts."""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+_ACTIVE: Profiler | None = None
+_HOOK_INSTALLED = False
+_UNTRACKED_PREFIXES = ("/proc/",)
+_UNTRACKED_SUFFIXES = (".py", ".pyc")
+
+
+def utc_now() -> str:
+    return datetime.now(UTC).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def bytes_read() -> int | None:
+    """Return the process's cumulative read bytes where the platform exposes them."""
+    try:
+        with open("/proc/self/io", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("rchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def _audit(event: str, args: tuple[Any, ...]) -> None:
+    profiler = _ACTIVE
+    if profiler is None or event != "open" or isinstance(args[0], int):
+        return
+    path = str(args[0])
+    if not path.startswith(_UNTRACKED_PREFIXES) and not path.endswith(_UNTRACKED_SUFFIXES):
+        profiler.files.add(path)
+
+
+class Profiler:
+    """Collect per-phase timings, bytes read, files opened and the tracemalloc peak of one run."""
+
+    def __init__(self, script: str, cprofile_path: Path | None = None) -> None:
+        self.script = script
+        self.cprofile_path = cprofile_path
+        self.files: set[str] = set()
+        self.phases: dict[str, dict[str, Any]] = {}
+        self.notes: dict[str, Any] = {}
+        self._stack: list[str] = []
+        self._cprofile: cProfile.Profile | None = None
+        self._started = 0.0
+        self._bytes_started: int | None = None
+        self.record: dict[str, Any] = {}
+
+    def __enter__(self) -> Profiler:
+        global _ACTIVE, _HOOK_INSTALLED
+        if not _HOOK_INSTALLED:
+            sys.addaudithook(_audit)
+            _HOOK_INSTALLED = True
+        _ACTIVE = self
+        tracemalloc.start()
+        if self.cprofile_path is not None:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._bytes_started = bytes_read()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, traceback: object) -> None:
+        global _ACTIVE
+        seconds = time.perf_counter() - self._started
+        read_total = bytes_read()
+        read_delta = None if read_total is None or self._bytes_started is None else read_total - self._bytes_started
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self.cprofile_path.parent.mkdir(parents=True, exist_ok=True)  # type: ignore[union-attr]
+            self._cprofile.dump_stats(str(self.cprofile_path))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        _ACTIVE = None
+        self.record = {
+            "generated_at": utc_now(),
+            "script": self.script,
+            "status": "ok" if exc_type is None else "failed",
+            "seconds": round(seconds, 6),
+            "bytes_read": read_delta,
+            "files_touched": len(self.files),
+            "tracemalloc_peak_bytes": peak,
+            "phases": self.phases,
+            **self.notes,
+        }
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        self._stack.append(name)
+        key = "/".join(self._stack)
+        files_before = len(self.files)
+        bytes_before = bytes_read()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            bytes_after = bytes_read()
+            entry = self.phases.setdefault(key, {"seconds": 0.0, "bytes_read": 0, "files_touched": 0})
+            entry["seconds"] = round(entry["seconds"] + time.perf_counter() - started, 6)
+            entry["files_touched"] += len(self.files) - files_before
+            if bytes_before is None or bytes_after is None:
+                entry["bytes_read"] = None
+            elif entry["bytes_read"] is not None:
+                entry["bytes_read"] += bytes_after - bytes_before
+            self._stack.pop()
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a phase of the active profiled run; a no-op when profiling is off."""
+    profiler = _ACTIVE
+    if profiler is None:
+        yield
+        return
+    with profiler.phase(name):
+        yield
+
+
+def note(key: str, value: Any) -> None:
+    """Attach a field such as the snapshot digest to the active run's record."""
+    if _ACTIVE is not None:
+        _ACTIVE.notes[key] = value
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--profile", metavar="LOG", help="append a performance record to this JSONL log")
+    parser.add_argument("--cprofile", metavar="PATH", help="also dump cProfile stats to this path")
+
+
+def append_record(path: Path, record: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+@contextmanager
+def profile_run(script: str, args: argparse.Namespace) -> Iterator[Profiler | None]:
+    """Profile the enclosed run when --profile or --cprofile was given.
+
+    The record is appended to the --profile log even when the run fails.
+    """
+    if not args.profile and not args.cprofile:
+        yield None
+        return
+    profiler = Profiler(script, Path(args.cprofile) if args.cprofile else None)
+    try:
+        with profiler:
+            yield profiler
+    finally:
+        if args.profile:
+            append_record(Path(args.profile), profiler.record)
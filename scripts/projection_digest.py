@@ -0,0 +1,77 @@
+"""Snapshot digests shared by the projection manifest writer and verifier."""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any
+
+MERKLE_ALGORITHM = "sha256-dirtree.v1"
+MERKLE_SUBTREES = ("categories/", "events/", "og/events/", "series/", "tonight/")
+
+
+def snapshot_digest(assets: dict[str, dict[str, Any]]) -> str:
+    digest = hashlib.sha256()
+    for name, metadata in sorted(assets.items()):
+        digest.update(name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(str(metadata["bytes"]).encode("ascii"))
+        digest.update(b"\0")
+        digest.update(metadata["sha256"].encode("ascii"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def file_entry(name: str, metadata: dict[str, Any]) -> bytes:
+    return f"f\0{name}\0{metadata['bytes']}\0{metadata['sha256']}\n".encode("utf-8")
+
+
+def directory_entry(name: str, digest: str) -> bytes:
+    return f"d\0{name}\0{digest}\n".encode("utf-8")
+
+
+def node_digest(entries: dict[str, bytes]) -> str:
+    digest = hashlib.sha256()
+    for name in sorted(entries):
+        digest.update(entries[name])
+    return digest.hexdigest()
+
+
+def directory_entries(assets: dict[str, dict[str, Any]]) -> dict[str, dict[str, bytes]]:
+    """Group asset rows by directory; directory keys are "" or end with "/"."""
+    entries: dict[str, dict[str, bytes]] = {"": {}}
+    for name, metadata in assets.items():
+        parent, _, leaf = name.rpartition("/")
+        directory = parent + "/" if parent else ""
+        entries.setdefault(directory, {})[leaf] = file_entry(leaf, metadata)
+        while directory:
+            entries.setdefault(directory, {})
+            grandparent = directory[:-1].rpartition("/")[0]
+            directory = grandparent + "/" if grandparent else ""
+    return entries
+
+
+def merkle_nodes(assets: dict[str, dict[str, Any]]) -> tuple[dict[str, str], dict[str, dict[str, bytes]]]:
+    """Return every directory hash, with "" as the snapshot root, and the entries that produced it."""
+    entries = directory_entries(assets)
+    hashes: dict[str, str] = {}
+    for directory in sorted(entries, key=lambda item: item.count("/"), reverse=True):
+        hashes[directory] = node_digest(entries[directory])
+        if directory:
+            parent, _, leaf = directory[:-1].rpartition("/")
+            entries[parent + "/" if parent else ""][leaf] = directory_entry(leaf, hashes[directory])
+    return hashes, entries
+
+
+def directory_hashes(assets: dict[str, dict[str, Any]]) -> dict[str, str]:
+    return merkle_nodes(assets)[0]
+
+
+def merkle_summary(assets: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    hashes = directory_hashes(assets)
+    return {
+        "algorithm": MERKLE_ALGORITHM,
+        "root": hashes[""],
+        "subtrees": {prefix: hashes[prefix] for prefix in MERKLE_SUBTREES if prefix in hashes},
+    }
+
+
@@ -0,0 +1,295 @@
+"""Read and parse each public snapshot artifact at most once per process."""
+
+from __future__ import annotations
+
+import codecs
+import hashlib
+import json
+import re
+import threading
+from collections.abc import Generator, Iterator
+from pathlib import Path
+from typing import Any
+
+SHARED_ARTIFACTS = frozenset(
+    {
+        "events.json",
+        "health.json",
+        "event-ontology.json",
+        "ontology-match-audit.json",
+        "sponsorships.json",
+    }
+)
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_MEMBER = "member"
+_ARRAY = "array"
+_ELEMENT = "element"
+# Bytes decoded per refill; a value longer than the window grows it geometrically.
+_WINDOW_BYTES = 64 * 1024
+
+Layout = tuple[dict[str, Any] | None, int | None, list[tuple[int, int]]]
+
+
+class _Reader:
+    """Decode ``raw`` through a sliding text window, tracking the byte offset of the cursor."""
+
+    def __init__(self, raw: bytes, name: str) -> None:
+        self.raw = raw
+        self.name = name
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.fed = 0
+        # Byte offset of buffer[self.mark].
+        self.mark = 0
+        self.mark_offset = 0
+
+    def offset(self) -> int:
+        """Byte offset of the cursor, advancing the mark so each character is encoded once."""
+        if self.pos != self.mark:
+            self.mark_offset += len(self.buffer[self.mark:self.pos].encode("utf-8"))
+            self.mark = self.pos
+        return self.mark_offset
+
+    def fill(self) -> bool:
+        if self.fed >= len(self.raw):
+            return False
+        self.offset()
+        size = max(_WINDOW_BYTES, len(self.buffer) - self.pos)
+        chunk = self.raw[self.fed:self.fed + size]
+        self.fed += len(chunk)
+        self.buffer = self.buffer[self.pos:] + self.decoder.decode(chunk, final=self.fed >= len(self.raw))
+        self.pos = self.mark = 0
+        return True
+
+    def skip(self) -> None:
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()  # type: ignore[union-attr]
+            if self.pos < len(self.buffer) or not self.fill():
+                return
+
+    def startswith(self, token: str) -> bool:
+        while len(self.buffer) - self.pos < len(token) and self.fill():
+            pass
+        return self.buffer.startswith(token, self.pos)
+
+    def expect(self, token: str) -> None:
+        if not self.startswith(token):
+            raise ValueError(f"{self.name} is not valid JSON: expected {token!r} at offset {self.offset()}")
+        self.pos += len(token)
+        self.skip()
+
+    def decode(self) -> Any:
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as exc:
+                if self.fill():
+                    continue
+                raise ValueError(f"{self.name} is not valid JSON: {exc.msg} at offset {self.offset()}") from exc
+            # A number near the window edge may continue in the next window: raw_decode stops
+            # early on a cut "1.", "1e" or "1e-", leaving up to two of its characters unread.
+            if isinstance(value, (int, float)) and len(self.buffer) - end < 3 and self.fill():
+                continue
+            if end == len(self.buffer) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _walk_array(reader: _Reader) -> Generator[tuple[str, Any, Any], None, None]:
+    reader.expect("[")
+    if reader.startswith("]"):
+        reader.pos += 1
+        return
+    while True:
+        start = reader.offset()
+        value = reader.decode()
+        # Elements carry their (byte offset, byte length) in place of a member name.
+        yield _ELEMENT, (start, reader.offset() - start), value
+        reader.skip()
+        if reader.startswith("]"):
+            reader.pos += 1
+            return
+        reader.expect(",")
+
+
+def _walk(raw: bytes, key: str, name: str) -> Iterator[tuple[str, Any, Any]]:
+    """Yield top-level members, expanding the ``key`` array one element at a time.
+
+    A top-level array is treated as the ``key`` array itself. Only a bounded
+    window of ``raw`` is decoded to text at any moment.
+    """
+    reader = _Reader(raw, name)
+    reader.skip()
+    if reader.startswith("["):
+        yield from _walk_array(reader)
+    else:
+        reader.expect("{")
+        if reader.startswith("}"):
+            reader.pos += 1
+        else:
+            while True:
+                member = reader.decode()
+                if not isinstance(member, str):
+                    raise ValueError(f"{name} is not valid JSON: object key expected at offset {reader.offset()}")
+                reader.skip()
+                reader.expect(":")
+                if member == key and reader.startswith("["):
+                    yield _ARRAY, member, None
+                    yield from _walk_array(reader)
+                else:
+                    yield _MEMBER, member, reader.decode()
+                reader.skip()
+                if reader.startswith("}"):
+                    reader.pos += 1
+                    break
+                reader.expect(",")
+    reader.skip()
+    if reader.pos != len(reader.buffer):
+        raise ValueError(f"{name} is not valid JSON: trailing data at offset {reader.offset()}")
+
+
+class SnapshotContext:
+    """Lazily load, hash and parse snapshot artifacts from one root, memoizing each step.
+
+    ``summary``, ``iter_array`` and ``iter_spans`` walk a large top-level
+    array element by element over a bounded decode window, so counting
+    events never materializes the whole event list. The first walk records
+    each element's byte span; later iterations decode only those slices,
+    or reuse the parsed document once ``json`` has loaded it.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._lock = threading.RLock()
+        self._raw: dict[str, bytes] = {}
+        self._digests: dict[str, tuple[int, str]] = {}
+        self._json: dict[str, Any] = {}
+        self._layouts: dict[tuple[str, str], Layout] = {}
+
+    def raw(self, name: str) -> bytes:
+        with self._lock:
+            if name not in self._raw:
+                self._raw[name] = (self.root / name).read_bytes()
+            return self._raw[name]
+
+    def digest(self, name: str) -> tuple[int, str]:
+        """Return (bytes, sha256) computed from the already-loaded raw bytes."""
+        with self._lock:
+            if name not in self._digests:
+                raw = self.raw(name)
+                self._digests[name] = (len(raw), hashlib.sha256(raw).hexdigest())
+            return self._digests[name]
+
+    def text(self, name: str) -> str:
+        return self.raw(name).decode("utf-8")
+
+    def json(self, name: str) -> Any:
+        with self._lock:
+            if name not in self._json:
+                self._json[name] = json.loads(self.raw(name))
+            return self._json[name]
+
+    def object(self, name: str) -> dict[str, Any]:
+        payload = self.json(name)
+        if not isinstance(payload, dict):
+            raise ValueError(f"{name} must contain an object")
+        return payload
+
+    def summary(self, name: str, key: str = "events") -> tuple[dict[str, Any] | None, int | None]:
+        """Return the top-level members except ``key`` and the length of the ``key`` array.
+
+        The header is None for a top-level array; the count is None when
+        ``key`` is absent or not an array.
+        """
+        with self._lock:
+            if (name, key) not in self._layouts and name in self._json:
+                return self._summarize_parsed(name, key)
+        header, count, _ = self._layout(name, key)
+        return header, count
+
+    def _summarize_parsed(self, name: str, key: str) -> tuple[dict[str, Any] | None, int | None]:
+        payload = self._json[name]
+        if isinstance(payload, list):
+            return None, len(payload)
+        if not isinstance(payload, dict):
+            raise ValueError(f"{name} must contain an object or array")
+        rows = payload.get(key)
+        if not isinstance(rows, list):
+            return dict(payload), None
+        return {member: value for member, value in payload.items() if member != key}, len(rows)
+
+    def _layout(self, name: str, key: str) -> Layout:
+        with self._lock:
+            if (name, key) not in self._layouts:
+                for _ in self._walk_and_record(name, key):
+                    pass
+            return self._layouts[name, key]
+
+    def _walk_and_record(self, name: str, key: str) -> Iterator[tuple[int, int, Any]]:
+        """Walk ``name`` once, yielding (offset, length, element) and memoizing the layout when done."""
+        raw = self.raw(name)
+        header: dict[str, Any] | None = None if raw.lstrip().startswith(b"[") else {}
+        count: int | None = 0 if header is None else None
+        spans: list[tuple[int, int]] = []
+        for kind, member, value in _walk(raw, key, name):
+            if kind == _ELEMENT:
+                spans.append(member)
+                count = (count or 0) + 1
+                yield member[0], member[1], value
+            elif kind == _ARRAY:
+                count = 0
+            else:
+                header[member] = value  # type: ignore[index]
+        with self._lock:
+            self._layouts[name, key] = (header, count, spans)
+
+    def _parsed_rows(self, name: str, key: str) -> list[Any] | None:
+        payload = self._json.get(name)
+        if payload is None:
+            return None
+        rows = payload if isinstance(payload, list) else payload.get(key) if isinstance(payload, dict) else None
+        if not isinstance(rows, list):
+            raise ValueError(f"{name} has no {key} array")
+        return rows
+
+    def iter_spans(self, name: str, key: str = "events") -> Iterator[tuple[int, int, Any]]:
+        """Yield (byte offset, byte length, element) for each element of the ``key`` array."""
+        with self._lock:
+            layout = self._layouts.get((name, key))
+            rows = self._parsed_rows(name, key)
+        if layout is None and rows is None:
+            yield from self._walk_and_record(name, key)
+            if self._layouts[name, key][1] is None:
+                raise ValueError(f"{name} has no {key} array")
+            return
+        if layout is None:
+            layout = self._layout(name, key)
+        if layout[1] is None:
+            raise ValueError(f"{name} has no {key} array")
+        raw = self.raw(name)
+        for position, (offset, length) in enumerate(layout[2]):
+            value = rows[position] if rows is not None else json.loads(raw[offset:offset + length])
+            yield offset, length, value
+
+    def iter_array(self, name: str, key: str = "events") -> Iterator[Any]:
+        """Yield the elements of the ``key`` array (or a top-level array) one at a time."""
+        with self._lock:
+            rows = self._parsed_rows(name, key)
+        if rows is not None:
+            yield from rows
+            return
+        for _, _, value in self.iter_spans(name, key):
+            yield value
+
+    def iter_events(self) -> Iterator[Any]:
+        return self.iter_array("events.json", "events")
+
+    def event_count(self) -> int:
+        count = self.summary("events.json", "events")[1]
+        if count is None:
+            raise ValueError("events.json has no event list")
+        return count
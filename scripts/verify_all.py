@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Run every snapshot verification stage in one process over one shared snapshot."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import xml.etree.ElementTree as ET
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+if __package__ in {None, ""}:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.common import DEFAULT_JOBS, OG_DIR, PAGE_DIR, parse_datetime  # noqa: E402
+from scripts.snapshot_context import SnapshotContext  # noqa: E402
+from scripts.verify_calendar import CALENDAR, verify_calendar  # noqa: E402
+from scripts.verify_event_artifacts import verify_event_artifacts  # noqa: E402
+from scripts.verify_og_images import verify_og_images  # noqa: E402
+from scripts.verify_projection_manifest import verify  # noqa: E402
+from scripts.verify_public_snapshot import snapshot_metrics  # noqa: E402
+from scripts.verify_sponsorships import validate  # noqa: E402
+
+Stage = Callable[[], dict[str, Any]]
+
+
+def build_stages(
+    context: SnapshotContext,
+    manifest_path: Path,
+    *,
+    now: datetime,
+    jobs: int = DEFAULT_JOBS,
+    sponsorships: str = "sponsorships.json",
+) -> dict[str, Stage]:
+    stages: dict[str, Stage] = {
+        "public_snapshot": lambda: snapshot_metrics(context),
+        "projection_manifest": lambda: verify(context.root, manifest_path, jobs, context),
+    }
+    if (context.root / CALENDAR).is_file():
+        stages["calendar"] = lambda: verify_calendar(context.root, jobs, context)
+    if (context.root / PAGE_DIR).is_dir():
+        stages["event_artifacts"] = lambda: verify_event_artifacts(context.root, context)
+    if (context.root / OG_DIR).is_dir():
+        stages["og_images"] = lambda: verify_og_images(context.root, jobs)
+    if (context.root / sponsorships).is_file():
+        stages["sponsorships"] = lambda: validate(
+            context.json(sponsorships), context.json("events.json"), now=now
+        )
+    return stages
+
+
+def run_stage(stage: Stage) -> dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        result = stage()
+    except (ValueError, OSError, SystemExit, ET.ParseError) as exc:
+        return {"status": "failed", "error": str(exc), "seconds": round(time.perf_counter() - started, 6)}
+    return {"status": "ok", "result": result, "seconds": round(time.perf_counter() - started, 6)}
+
+
+def run_stages(stages: dict[str, Stage], *, parallel: bool = True) -> dict[str, Any]:
+    """Run the stages, concurrently unless ``parallel`` is false, and combine their results."""
+    started = time.perf_counter()
+    if parallel and len(stages) > 1:
+        with ThreadPoolExecutor(max_workers=len(stages)) as pool:
+            outcomes = dict(zip(stages, pool.map(run_stage, stages.values())))
+    else:
+        outcomes = {name: run_stage(stage) for name, stage in stages.items()}
+    failed = any(outcome["status"] != "ok" for outcome in outcomes.values())
+    return {
+        "status": "failed" if failed else "ok",
+        "seconds": round(time.perf_counter() - started, 6),
+        "stages": outcomes,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--root", default=".")
+    parser.add_argument("--manifest", help="defaults to <root>/projection-manifest.json")
+    parser.add_argument("--sponsorships", default="sponsorships.json")
+    parser.add_argument("--now", help="ISO 8601 validation time; defaults to current UTC")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="parallel asset workers")
+    parser.add_argument("--serial", action="store_true", help="run stages one after another")
+    args = parser.parse_args()
+
+    now = parse_datetime(args.now, "--now") if args.now else datetime.now(timezone.utc)
+    root = Path(args.root)
+    manifest_path = Path(args.manifest) if args.manifest else root / "projection-manifest.json"
+    context = SnapshotContext(root)
+    stages = build_stages(context, manifest_path, now=now, jobs=args.jobs, sponsorships=args.sponsorships)
+    result = run_stages(stages, parallel=not args.serial)
+    print(json.dumps(result, ensure_ascii=False, sort_keys=True))
+    return 0 if result["status"] == "ok" else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Check calendar.ics and events/<id>/event.ics against the events.json they were rendered from."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from itertools import repeat
+from pathlib import Path
+from typing import BinaryIO
+
+if __package__ in {None, ""}:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.common import DEFAULT_JOBS, problem_message  # noqa: E402
+from scripts.snapshot_context import SnapshotContext  # noqa: E402
+
+CALENDAR = "calendar.ics"
+EVENT_FILE = "event.ics"
+VEVENT_FIELDS = frozenset({"UID", "DTSTART", "DTEND"})
+
+EventTimes = tuple[str, str | None]
+
+
+def ics_time(value: object, event_id: str, field: str) -> str:
+    """Render an events.json timestamp the way the calendar writer emits it (UTC basic format)."""
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError as exc:
+        raise ValueError(f"events.json event {event_id} has invalid {field}") from exc
+    if parsed.tzinfo is None:
+        raise ValueError(f"events.json event {event_id} has naive {field}")
+    return parsed.astimezone(UTC).strftime("%Y%m%dT%H%M%SZ")
+
+
+def event_index(context: SnapshotContext) -> dict[str, EventTimes]:
+    """Map every event id to its expected DTSTART/DTEND, streaming events.json once."""
+    index: dict[str, EventTimes] = {}
+    for event in context.iter_events():
+        if not isinstance(event, dict) or not isinstance(event.get("id"), str):
+            raise ValueError("events.json contains an event without a string id")
+        event_id = event["id"]
+        if event_id in index:
+            raise ValueError(f"events.json has duplicate event id: {event_id}")
+        ends_at = event.get("ends_at")
+        index[event_id] = (
+            ics_time(event.get("starts_at"), event_id, "starts_at"),
+            None if ends_at is None else ics_time(ends_at, event_id, "ends_at"),
+        )
+    return index
+
+
+def unfold(handle: BinaryIO) -> Iterator[bytes]:
+    """Yield logical content lines, joining RFC 5545 folds at the byte level."""
+    current: bytes | None = None
+    for raw in handle:
+        line = raw.rstrip(b"\r\n")
+        if line[:1] in (b" ", b"\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+
+def iter_vevents(path: Path, name: str) -> Iterator[dict[str, str]]:
+    """Stream the UID/DTSTART/DTEND of each VEVENT; a missing END fails as truncation."""
+    in_calendar = False
+    closed = False
+    vevent: dict[str, str] | None = None
+    with path.open("rb") as handle:
+        for line in unfold(handle):
+            if not line:
+                continue
+            prop, _, value = line.partition(b":")
+            key = prop.partition(b";")[0].upper()
+            if key == b"BEGIN":
+                if value == b"VCALENDAR":
+                    in_calendar = True
+                elif value == b"VEVENT":
+                    if vevent is not None:
+                        raise ValueError(f"{name} has a nested VEVENT")
+                    vevent = {}
+            elif key == b"END":
+                if value == b"VEVENT":
+                    if vevent is None:
+                        raise ValueError(f"{name} has END:VEVENT without BEGIN")
+                    yield vevent
+                    vevent = None
+                elif value == b"VCALENDAR":
+                    closed = True
+            elif vevent is not None:
+                field = key.decode("ascii", "replace")
+                if field in VEVENT_FIELDS:
+                    vevent[field] = value.decode("utf-8")
+    if not in_calendar:
+        raise ValueError(f"{name} is not a VCALENDAR")
+    if vevent is not None or not closed:
+        raise ValueError(f"{name} is truncated")
+
+
+def vevent_problems(
+    name: str, vevent: dict[str, str], index: dict[str, EventTimes]
+) -> tuple[str | None, list[str]]:
+    """Return the event id named by the VEVENT's UID and any disagreement with events.json."""
+    uid = vevent.get("UID")
+    if not uid:
+        return None, [f"{name}: VEVENT without UID"]
+    event_id = uid.partition("@")[0]
+    expected = index.get(event_id)
+    if expected is None:
+        return event_id, [f"{name}: unknown UID {uid}"]
+    problems = []
+    if vevent.get("DTSTART") != expected[0]:
+        problems.append(f"{name}: {event_id} DTSTART {vevent.get('DTSTART')} != {expected[0]}")
+    if vevent.get("DTEND") != expected[1]:
+        problems.append(f"{name}: {event_id} DTEND {vevent.get('DTEND')} != {expected[1]}")
+    return event_id, problems
+
+
+def check_calendar(path: Path, index: dict[str, EventTimes]) -> tuple[int, list[str]]:
+    """Check that calendar.ics carries every event exactly once with matching times."""
+    problems: list[str] = []
+    seen: set[str] = set()
+    count = 0
+    for vevent in iter_vevents(path, CALENDAR):
+        count += 1
+        event_id, found = vevent_problems(CALENDAR, vevent, index)
+        problems += found
+        if event_id is None:
+            continue
+        if event_id in seen:
+            problems.append(f"{CALENDAR}: duplicate UID for {event_id}")
+        seen.add(event_id)
+    missing = [event_id for event_id in index if event_id not in seen]
+    if missing:
+        problems.append(f"{CALENDAR} missing {len(missing)} events: {missing[:5]}")
+    return count, problems
+
+
+def check_event_file(path: Path, event_id: str, index: dict[str, EventTimes]) -> list[str]:
+    name = f"events/{event_id}/{EVENT_FILE}"
+    if event_id not in index:
+        return [f"{name}: stale event not in events.json"]
+    try:
+        vevents = list(iter_vevents(path, name))
+    except (OSError, UnicodeDecodeError) as exc:
+        return [f"{name}: {exc}"]
+    except ValueError as exc:
+        return [str(exc)]
+    if len(vevents) != 1:
+        return [f"{name}: expected one VEVENT, found {len(vevents)}"]
+    uid_event, problems = vevent_problems(name, vevents[0], index)
+    if uid_event is not None and uid_event != event_id:
+        problems.append(f"{name}: UID names {uid_event}")
+    return problems
+
+
+def event_files(root: Path) -> list[str]:
+    events_dir = root / "events"
+    if not events_dir.is_dir():
+        return []
+    with os.scandir(events_dir) as entries:
+        return sorted(entry.name for entry in entries if entry.is_dir())
+
+
+def verify_calendar(
+    root: Path, jobs: int = DEFAULT_JOBS, context: SnapshotContext | None = None
+) -> dict[str, int | str]:
+    """Fail when any ICS artifact disagrees with events.json on UID, DTSTART or DTEND."""
+    context = context or SnapshotContext(root)
+    index = event_index(context)
+    calendar_events, problems = check_calendar(root / CALENDAR, index)
+
+    present: list[str] = []
+    for event_id in event_files(root):
+        if (root / "events" / event_id / EVENT_FILE).is_file():
+            present.append(event_id)
+        else:
+            problems.append(f"events/{event_id}/{EVENT_FILE}: missing")
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        paths = [root / "events" / event_id / EVENT_FILE for event_id in present]
+        for found in pool.map(check_event_file, paths, present, repeat(index)):
+            problems += found
+    if problems:
+        raise ValueError(problem_message(problems))
+    return {"status": "ok", "calendar_events": calendar_events, "event_files": len(present)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--root", default=".")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="parallel event.ics workers")
+    args = parser.parse_args()
+    result = verify_calendar(Path(args.root), args.jobs)
+    print(json.dumps(result, ensure_ascii=False, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Check that event detail pages, og images and events.json describe the same events."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+if __package__ in {None, ""}:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.common import OG_DIR, OG_SUFFIX, PAGE_DIR, problem_message  # noqa: E402
+from scripts.snapshot_context import SnapshotContext  # noqa: E402
+
+
+def event_keys(context: SnapshotContext, pages: set[str]) -> tuple[int, set[str], int]:
+    """Return the event count, every id/occurrence id, and how many events have no detail page."""
+    keys: set[str] = set()
+    count = 0
+    without_pages = 0
+    for event in context.iter_events():
+        if not isinstance(event, dict) or not isinstance(event.get("id"), str):
+            raise ValueError("events.json contains an event without a string id")
+        count += 1
+        event_ids = {event["id"]}
+        if isinstance(event.get("occurrence_id"), str):
+            event_ids.add(event["occurrence_id"])
+        keys |= event_ids
+        if event_ids.isdisjoint(pages):
+            without_pages += 1
+    return count, keys, without_pages
+
+
+def list_names(directory: Path, *, suffix: str | None = None) -> set[str]:
+    """List subdirectory names, or file stems with ``suffix``, in one scandir pass."""
+    if not directory.is_dir():
+        return set()
+    with os.scandir(directory) as entries:
+        if suffix is None:
+            return {entry.name for entry in entries if entry.is_dir()}
+        return {
+            entry.name.removesuffix(suffix)
+            for entry in entries
+            if entry.name.endswith(suffix) and entry.is_file()
+        }
+
+
+def difference(label: str, names: set[str]) -> list[str]:
+    return [f"{label} ({len(names)}): {sorted(names)[:5]}"] if names else []
+
+
+def verify_event_artifacts(root: Path, context: SnapshotContext | None = None) -> dict[str, int | str]:
+    """Fail on detail pages or og images without an event, or a page and og image without each other."""
+    context = context or SnapshotContext(root)
+    pages = list_names(root / PAGE_DIR)
+    images = list_names(root / OG_DIR, suffix=OG_SUFFIX)
+    event_count, keys, without_pages = event_keys(context, pages)
+
+    problems = difference("detail pages without an event", pages - keys)
+    problems += difference("og images without an event", images - keys)
+    problems += difference("detail pages without an og image", pages - images)
+    problems += difference("og images without a detail page", images - pages)
+    if problems:
+        raise ValueError(problem_message(problems))
+    return {
+        "status": "ok",
+        "event_count": event_count,
+        "detail_pages": len(pages),
+        "og_images": len(images),
+        "events_without_pages": without_pages,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--root", default=".")
+    args = parser.parse_args()
+    result = verify_event_artifacts(Path(args.root))
+    print(json.dumps(result, ensure_ascii=False, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""Verify a deployed projection over HTTP against its provenance manifest."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import ssl
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from urllib.parse import SplitResult, quote, urlsplit
+
+if __package__ in {None, ""}:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.verify_projection_manifest import ASSET_FAILURES, validate_asset_table  # noqa: E402
+
+DEFAULT_CONNECTIONS = 16
+DEFAULT_TIMEOUT = 30.0
+READ_CHUNK_BYTES = 64 * 1024
+ETAG_CACHE_SCHEMA_VERSION = "cast-event.http-etag-cache.v1"
+USER_AGENT = "cast-event-projection-verifier"
+
+
+class EmptyResponse(ConnectionError):
+    """The server closed the connection before sending a status line."""
+
+
+class HttpConnection:
+    """One keep-alive HTTP/1.1 connection, reopened whenever the server closes it."""
+
+    def __init__(self, base: SplitResult, timeout: float) -> None:
+        self.base = base
+        self.timeout = timeout
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+        self.opened = 0
+
+    async def open(self) -> None:
+        secure = self.base.scheme == "https"
+        port = self.base.port or (443 if secure else 80)
+        self.reader, self.writer = await asyncio.open_connection(
+            self.base.hostname, port, ssl=ssl.create_default_context() if secure else None
+        )
+        self.opened += 1
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def request(
+        self,
+        method: str,
+        target: str,
+        headers: dict[str, str] | None = None,
+        sink: Callable[[bytes], object] | None = None,
+    ) -> tuple[int, dict[str, str], int]:
+        """Send one request and stream the body into ``sink``; return (status, headers, body bytes).
+
+        A request on a reused connection that the server already dropped is
+        retried once on a fresh connection.
+        """
+        for attempt in range(2):
+            reused = self.writer is not None
+            if not reused:
+                await self.open()
+            try:
+                return await asyncio.wait_for(self._exchange(method, target, headers or {}, sink), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError, EmptyResponse):
+                await self.close()
+                if not reused or attempt:
+                    raise
+            except BaseException:
+                await self.close()
+                raise
+        raise AssertionError("unreachable")
+
+    async def _exchange(
+        self, method: str, target: str, headers: dict[str, str], sink: Callable[[bytes], object] | None
+    ) -> tuple[int, dict[str, str], int]:
+        assert self.reader is not None and self.writer is not None
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {self.base.netloc}", f"User-Agent: {USER_AGENT}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise EmptyResponse
+        version, status, *_ = status_line.decode("latin-1").split(" ", 2)
+        response_headers: dict[str, str] = {}
+        while (line := await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        code = int(status)
+        size = 0
+        keep_alive = response_headers.get("connection", "").lower() != "close" and version != "HTTP/1.0"
+        if method == "HEAD" or code in (204, 304) or code < 200:
+            pass
+        elif "chunked" in response_headers.get("transfer-encoding", "").lower():
+            size = await self._read_chunked(sink)
+        elif "content-length" in response_headers:
+            size = await self._read_exactly(int(response_headers["content-length"]), sink)
+        else:
+            while chunk := await self.reader.read(READ_CHUNK_BYTES):
+                size += len(chunk)
+                if sink is not None:
+                    sink(chunk)
+            keep_alive = False
+        if not keep_alive:
+            await self.close()
+        return code, response_headers, size
+
+    async def _read_exactly(self, remaining: int, sink: Callable[[bytes], object] | None) -> int:
+        assert self.reader is not None
+        total = remaining
+        while remaining:
+            chunk = await self.reader.readexactly(min(remaining, READ_CHUNK_BYTES))
+            remaining -= len(chunk)
+            if sink is not None:
+                sink(chunk)
+        return total
+
+    async def _read_chunked(self, sink: Callable[[bytes], object] | None) -> int:
+        assert self.reader is not None
+        total = 0
+        while True:
+            size = int((await self.reader.readline()).split(b";", 1)[0], 16)
+            if size == 0:
+                while await self.reader.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+                return total
+            total += await self._read_exactly(size, sink)
+            await self.reader.readexactly(2)
+
+
+def asset_target(base: SplitResult, name: str) -> str:
+    prefix = base.path if base.path.endswith("/") else base.path + "/"
+    return prefix + quote(name)
+
+
+async def check_asset(
+    connection: HttpConnection,
+    name: str,
+    expected: dict[str, Any],
+    *,
+    head: bool,
+    etag: str | None,
+) -> tuple[str | None, str | None]:
+    """Return (failure kind or "not_modified" or None, the response ETag)."""
+    target = asset_target(connection.base, name)
+    if head:
+        status, headers, _ = await connection.request("HEAD", target)
+        if status != 200:
+            return "missing", None
+        length = headers.get("content-length")
+        return ("resized" if length is not None and int(length) != expected["bytes"] else None), headers.get("etag")
+
+    digest = hashlib.sha256()
+    request_headers = {"If-None-Match": etag} if etag else {}
+    status, headers, size = await connection.request("GET", target, request_headers, digest.update)
+    if status == 304 and etag:
+        return "not_modified", etag
+    if status != 200:
+        return "missing", None
+    if size != expected["bytes"]:
+        return "resized", None
+    if digest.hexdigest() != expected["sha256"]:
+        return "mismatched", None
+    return None, headers.get("etag")
+
+
+async def verify_deployment_async(
+    assets: dict[str, dict[str, Any]],
+    base_url: str,
+    *,
+    connections: int = DEFAULT_CONNECTIONS,
+    etags: dict[str, dict[str, str]] | None = None,
+    head: bool = False,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> tuple[dict[str, Any], dict[str, dict[str, str]]]:
+    base = urlsplit(base_url)
+    if base.scheme not in {"http", "https"} or not base.hostname:
+        raise ValueError(f"unsupported base URL: {base_url}")
+    if connections < 1:
+        raise ValueError("connections must be at least 1")
+    etags = etags or {}
+    names = sorted(assets)
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for name in names:
+        queue.put_nowait(name)
+    outcomes: dict[str, str | None] = {}
+    errors: dict[str, str] = {}
+    fresh_etags: dict[str, dict[str, str]] = {}
+    pool = [HttpConnection(base, timeout) for _ in range(min(connections, len(names)) or 1)]
+
+    async def worker(connection: HttpConnection) -> None:
+        while not queue.empty():
+            name = queue.get_nowait()
+            expected = assets[name]
+            cached = etags.get(name)
+            etag = cached["etag"] if cached and cached.get("sha256") == expected["sha256"] else None
+            try:
+                kind, response_etag = await check_asset(connection, name, expected, head=head, etag=etag)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as exc:
+                errors[name] = f"{type(exc).__name__}: {exc}"
+                continue
+            outcomes[name] = kind
+            if response_etag and kind in (None, "not_modified") and not head:
+                fresh_etags[name] = {"sha256": expected["sha256"], "etag": response_etag}
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker(connection) for connection in pool))
+    finally:
+        for connection in pool:
+            await connection.close()
+
+    report: dict[str, Any] = {"base_url": base_url, "asset_count": len(names), "mode": "head" if head else "get"}
+    for kind, _ in ASSET_FAILURES:
+        report[kind] = sorted(name for name, outcome in outcomes.items() if outcome == kind)
+    report["errors"] = dict(sorted(errors.items()))
+    report["not_modified"] = sum(1 for outcome in outcomes.values() if outcome == "not_modified")
+    failures = len(errors) + sum(len(report[kind]) for kind, _ in ASSET_FAILURES)
+    report["success_rate"] = round((len(names) - failures) / len(names), 6) if names else 1.0
+    report["connections_opened"] = sum(connection.opened for connection in pool)
+    report["seconds"] = round(time.perf_counter() - started, 6)
+    report["status"] = "failed" if failures else "ok"
+    return report, fresh_etags
+
+
+def verify_deployment(
+    manifest_path: Path,
+    base_url: str,
+    *,
+    connections: int = DEFAULT_CONNECTIONS,
+    etag_cache: Path | None = None,
+    head: bool = False,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> dict[str, Any]:
+    """Fetch every manifest asset from ``base_url`` and report failures instead of stopping at the first.
+
+    With ``etag_cache``, assets whose manifest digest is unchanged since they
+    last verified are revalidated with If-None-Match, and the cache is
+    rewritten with the ETags of every asset that verified.
+    """
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    if not isinstance(manifest, dict):
+        raise ValueError("projection manifest must contain an object")
+    assets = validate_asset_table(manifest.get("assets"))
+    etags: dict[str, dict[str, str]] = {}
+    if etag_cache is not None and etag_cache.is_file():
+        cache = json.loads(etag_cache.read_text(encoding="utf-8"))
+        if cache.get("schema_version") == ETAG_CACHE_SCHEMA_VERSION and cache.get("base_url") == base_url:
+            etags = cache.get("entries") or {}
+    report, fresh = asyncio.run(verify_deployment_async(
+        assets, base_url, connections=connections, etags=etags, head=head, timeout=timeout
+    ))
+    report["source_snapshot_sha256"] = manifest.get("source_snapshot_sha256")
+    if etag_cache is not None and not head:
+        etag_cache.parent.mkdir(parents=True, exist_ok=True)
+        etag_cache.write_text(json.dumps({
+            "schema_version": ETAG_CACHE_SCHEMA_VERSION,
+            "base_url": base_url,
+            "entries": dict(sorted(fresh.items())),
+        }) + "\n", encoding="utf-8")
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--manifest", default="projection-manifest.json")
+    parser.add_argument("--base-url", required=True, help="deployed site root, e.g. https://example.github.io/site/")
+    parser.add_argument("--connections", type=int, default=DEFAULT_CONNECTIONS, help="keep-alive connection pool size")
+    parser.add_argument("--etag-cache", help="JSON file of verified ETags used for If-None-Match revalidation")
+    parser.add_argument("--head", action="store_true", help="only check status and Content-Length with HEAD")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="per-request timeout in seconds")
+    args = parser.parse_args()
+    report = verify_deployment(
+        Path(args.manifest),
+        args.base_url,
+        connections=args.connections,
+        etag_cache=Path(args.etag_cache) if args.etag_cache else None,
+        head=args.head,
+        timeout=args.timeout,
+    )
+    print(json.dumps(report, ensure_ascii=False, sort_keys=True))
+    return 0 if report["status"] == "ok" else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Structurally check og/events/*.png from their headers, seeking past chunk data instead of reading it."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import struct
+import sys
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
+if __package__ in {None, ""}:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.common import (  # noqa: E402
+    DEFAULT_JOBS,
+    OG_DIR,
+    OG_HEIGHT,
+    OG_SUFFIX,
+    OG_WIDTH,
+    PNG_SIGNATURE,
+    problem_message,
+)
+
+# Allowed bit depths per PNG colour type (PNG spec, table 11.1).
+BIT_DEPTHS = {0: {1, 2, 4, 8, 16}, 2: {8, 16}, 3: {1, 2, 4, 8}, 4: {8, 16}, 6: {8, 16}}
+
+
+def check_png(path: Path, width: int = OG_WIDTH, height: int = OG_HEIGHT) -> str | None:
+    """Return why ``path`` is not a well-formed ``width`` x ``height`` PNG, or None.
+
+    Only the signature, the IHDR chunk and each chunk's 8-byte header are
+    read; chunk payloads are skipped with seeks.
+    """
+    try:
+        with path.open("rb", buffering=0) as handle:
+            size = os.fstat(handle.fileno()).st_size
+            head = handle.read(33)
+            if head[:8] != PNG_SIGNATURE:
+                return "not a PNG"
+            if len(head) < 33 or head[8:16] != b"\x00\x00\x00\x0dIHDR":
+                return "missing IHDR"
+            if zlib.crc32(head[12:29]) != struct.unpack(">I", head[29:33])[0]:
+                return "IHDR CRC mismatch"
+            found_width, found_height, depth, colour, compression, filtering, interlace = struct.unpack(
+                ">IIBBBBB", head[16:29]
+            )
+            if (found_width, found_height) != (width, height):
+                return f"{found_width}x{found_height}, expected {width}x{height}"
+            if depth not in BIT_DEPTHS.get(colour, ()) or compression or filtering or interlace > 1:
+                return "invalid IHDR fields"
+
+            position = 33
+            saw_data = False
+            while True:
+                header = handle.read(8)
+                if len(header) < 8:
+                    return "truncated before IEND"
+                length, kind = struct.unpack(">I4s", header)
+                if not kind.isalpha():
+                    return f"corrupt chunk header at byte {position}"
+                position += 12 + length
+                if position > size:
+                    return f"{kind.decode('ascii')} chunk runs past end of file"
+                if kind == b"IEND":
+                    if length:
+                        return "IEND chunk has data"
+                    if not saw_data:
+                        return "no IDAT chunk"
+                    return None if position == size else "trailing bytes after IEND"
+                saw_data = saw_data or kind == b"IDAT"
+                handle.seek(position)
+    except OSError as exc:
+        return f"unreadable: {exc.strerror}"
+
+
+def og_images(root: Path) -> list[str]:
+    directory = root / OG_DIR
+    if not directory.is_dir():
+        return []
+    with os.scandir(directory) as entries:
+        return sorted(entry.name for entry in entries if entry.name.endswith(OG_SUFFIX) and entry.is_file())
+
+
+def verify_og_images(
+    root: Path, jobs: int = DEFAULT_JOBS, width: int = OG_WIDTH, height: int = OG_HEIGHT
+) -> dict[str, int | str]:
+    """Fail when any og card is malformed or not ``width`` x ``height``."""
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+    names = og_images(root)
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        paths = [root / OG_DIR / name for name in names]
+        results = pool.map(check_png, paths, repeat(width), repeat(height))
+        problems = [f"{OG_DIR}/{name}: {problem}" for name, problem in zip(names, results) if problem]
+    if problems:
+        raise ValueError(problem_message(problems))
+    return {"status": "ok", "images": len(names), "width": width, "height": height}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--root", default=".")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="parallel image workers")
+    parser.add_argument("--width", type=int, default=OG_WIDTH)
+    parser.add_argument("--height", type=int, default=OG_HEIGHT)
+    args = parser.parse_args()
+    result = verify_og_images(Path(args.root), args.jobs, args.width, args.height)
+    print(json.dumps(result, ensure_ascii=False, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,36 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
+import os
+import posixpath
 import re
+import stat
+import sys
+import time
 import xml.etree.ElementTree as ET
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from html.parser import HTMLParser
+from itertools import repeat
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlsplit
+
+if __package__ in {None, ""}:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.common import DEFAULT_JOBS  # noqa: E402
+from scripts.profiling import add_profile_arguments, note, phase, profile_run  # noqa: E402
+from scripts.projection_digest import merkle_summary, snapshot_digest  # noqa: E402
+from scripts.snapshot_context import SHARED_ARTIFACTS, SnapshotContext  # noqa: E402
+from scripts.write_event_offsets import OFFSETS_PATH, verify_offsets  # noqa: E402
+from scripts.write_events_columnar import COLUMNAR_PATH, verify_columnar  # noqa: E402
+from scripts.write_featured_schedule import SCHEDULE_PATH, verify_schedule  # noqa: E402
+from scripts.write_manifest_index import index_path, verify_index  # noqa: E402
+from scripts.write_projection_manifest import content_groups  # noqa: E402
+from scripts.write_tonight_shards import SHARD_DIR, SHARD_INDEX, verify_shards  # noqa: E402
 
 REQUIRED_FIELDS = {
     "schema_version",
@@ -26,60 +52,254 @@ REQUIRED_FIELDS = {
 }
 SEARCH_BASE_URL = "https://kafka2306.github.io/vrc_cast_event_calender/"
 SEARCH_PAGE_PREFIXES = ("events/", "categories/", "series/")
+SEARCH_LINK = re.compile(r'(?:events|categories|series)/[^"\']+/')
+SITEMAP_NAMESPACE = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+SITEMAP_ENTRY_TAGS = {SITEMAP_NAMESPACE + "url": "url", SITEMAP_NAMESPACE + "sitemap": "sitemap"}
+SITEMAP_LOC_TAG = SITEMAP_NAMESPACE + "loc"
+HEAD_END = b"</head>"
+CANONICAL_LINK = re.compile(rb'rel="canonical" href="([^"]*)"')
+JSON_LD = b"application/ld+json"
+SCAN_CHUNK_BYTES = 64 * 1024
+HEAD_BYTE_CAP = 512 * 1024
+WATCH_INTERVAL = 0.5
+ASSET_FAILURES = (
+    ("missing", "missing deployed asset"),
+    ("resized", "byte mismatch"),
+    ("mismatched", "sha256 mismatch"),
+)
 
 
-def snapshot_digest(assets: dict[str, dict[str, Any]]) -> str:
-    digest = hashlib.sha256()
-    for name, metadata in sorted(assets.items()):
-        digest.update(name.encode("utf-8"))
-        digest.update(b"\0")
-        digest.update(str(metadata["bytes"]).encode("ascii"))
-        digest.update(b"\0")
-        digest.update(metadata["sha256"].encode("ascii"))
-        digest.update(b"\n")
-    return digest.hexdigest()
+def scan_page(path: Path, scan_body: bool = False) -> tuple[set[str], bool]:
+    """Return the canonical URLs in a page head and whether it carries JSON-LD.
 
+    The file is streamed only up to ``</head>`` (or ``HEAD_BYTE_CAP``) unless
+    ``scan_body`` asks for JSON-LD anywhere in the document.
+    """
+    head = bytearray()
+    with path.open("rb") as handle:
+        while len(head) < HEAD_BYTE_CAP:
+            chunk = handle.read(SCAN_CHUNK_BYTES)
+            if not chunk:
+                break
+            start = max(0, len(head) - len(HEAD_END))
+            head += chunk
+            if head.find(HEAD_END, start) >= 0:
+                break
+        end = head.find(HEAD_END)
+        section = head if end < 0 else head[:end]
+        canonical = {match.decode("utf-8", "replace") for match in CANONICAL_LINK.findall(section)}
+        has_json_ld = JSON_LD in head
+        overlap = bytes(head[-(len(JSON_LD) - 1):])
+        while scan_body and not has_json_ld:
+            chunk = handle.read(SCAN_CHUNK_BYTES)
+            if not chunk:
+                break
+            window = overlap + chunk
+            has_json_ld = JSON_LD in window
+            overlap = window[-(len(JSON_LD) - 1):]
+    return canonical, has_json_ld
 
-def verify_search_surface(root: Path, assets: dict[str, dict[str, Any]]) -> None:
-    """Validate the derived search surface once a canonical sitemap is present."""
-    if "sitemap.xml" not in assets:
-        return
 
-    required = {"index.html", "sitemap.xml", "analytics.js", "analytics-config.json"}
-    missing = sorted(required - set(assets))
-    if missing:
-        raise ValueError(f"search surface missing assets: {', '.join(missing)}")
+class HomepageLinkParser(HTMLParser):
+    """Collect relative hrefs and ``rel="next"`` continuations from one HTML document."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.hrefs: list[str] = []
+        self.continuations: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        values = dict(attrs)
+        href = values.get("href")
+        if tag not in {"a", "link"} or not href:
+            return
+        if "next" in (values.get("rel") or "").lower().split():
+            self.continuations.append(href)
+        else:
+            self.hrefs.append(href)
+
+
+def resolve_site_path(href: str, directory: str) -> str | None:
+    """Resolve a relative href against a site directory; absolute and rooted URLs are ignored."""
+    parts = urlsplit(href)
+    if parts.scheme or parts.netloc or href.startswith("/"):
+        return None
+    resolved = posixpath.normpath(posixpath.join(directory, href)) if directory else posixpath.normpath(href)
+    if resolved.startswith("../") or resolved == "..":
+        return None
+    return resolved + "/" if href.endswith("/") and not resolved.endswith("/") else resolved
+
+
+def continuation_asset(path: str) -> str:
+    return path + "index.html" if path.endswith("/") else path
+
+
+def parse_homepage_document(root: Path, name: str) -> tuple[list[str], list[str]]:
+    """Return (site-relative hrefs, continuation asset names) for an HTML page or JSON chunk.
+
+    JSON chunks are objects with a ``links`` array of site-relative hrefs and an
+    optional ``next`` chunk; HTML pages are streamed through ``HomepageLinkParser``.
+    """
+    directory = posixpath.dirname(name)
+    if name.endswith(".json"):
+        chunk = json.loads((root / name).read_text(encoding="utf-8"))
+        if not isinstance(chunk, dict) or not isinstance(chunk.get("links", []), list):
+            raise ValueError(f"invalid homepage continuation chunk: {name}")
+        hrefs = [link for link in chunk.get("links", []) if isinstance(link, str)]
+        following = [chunk["next"]] if isinstance(chunk.get("next"), str) else []
+        directory = ""
+    else:
+        parser = HomepageLinkParser()
+        with (root / name).open("r", encoding="utf-8") as handle:
+            while chunk_text := handle.read(SCAN_CHUNK_BYTES):
+                parser.feed(chunk_text)
+        parser.close()
+        hrefs, following = parser.hrefs, parser.continuations
+    links = [path for href in hrefs if (path := resolve_site_path(href, directory)) is not None]
+    pages = [
+        continuation_asset(path)
+        for href in following
+        if (path := resolve_site_path(href, posixpath.dirname(name))) is not None
+    ]
+    return links, pages
+
+
+def homepage_links(root: Path, assets: dict[str, dict[str, Any]]) -> set[str]:
+    """Return the search-page links reachable from index.html and its declared continuations."""
+    links: set[str] = set()
+    pending = ["index.html"]
+    visited: set[str] = set()
+    while pending:
+        name = pending.pop(0)
+        if name in visited:
+            continue
+        if name not in assets:
+            raise ValueError(f"homepage continuation is not a deployed asset: {name}")
+        visited.add(name)
+        page_links, continuations = parse_homepage_document(root, name)
+        links.update(link for link in page_links if SEARCH_LINK.fullmatch(link))
+        pending.extend(continuations)
+    return links
+
+
+def iter_sitemap_locs(path: Path) -> Iterator[tuple[str, str | None]]:
+    """Yield (entry kind, loc) pairs from a urlset or sitemapindex, clearing parsed elements."""
+    with path.open("rb") as handle:
+        root_element = None
+        for event, element in ET.iterparse(handle, events=("start", "end")):
+            if event == "start":
+                if root_element is None:
+                    root_element = element
+                continue
+            if element.tag in SITEMAP_ENTRY_TAGS:
+                yield SITEMAP_ENTRY_TAGS[element.tag], element.findtext(SITEMAP_LOC_TAG)
+                root_element.clear()  # type: ignore[union-attr]
+
+
+def sitemap_kind(path: Path) -> str:
+    with path.open("rb") as handle:
+        for _, element in ET.iterparse(handle, events=("start",)):
+            return element.tag.rpartition("}")[2]
+    return ""
+
+
+def scan_sitemap_shard(path: Path, positions: dict[str, int]) -> dict[str, Any]:
+    """Count expected URLs in one urlset shard using one byte per expected URL."""
+    counts = bytearray(len(positions))
+    summary: dict[str, Any] = {"first": None, "non_canonical": False, "extra": []}
+    for kind, loc in iter_sitemap_locs(path):
+        if kind != "url":
+            raise ValueError(f"sitemap shard must be a urlset: {path.name}")
+        if loc is None:
+            continue
+        if summary["first"] is None:
+            summary["first"] = loc
+        if not loc.startswith(SEARCH_BASE_URL):
+            summary["non_canonical"] = True
+        elif loc not in positions:
+            summary["extra"].append(loc)
+        else:
+            index = positions[loc]
+            counts[index] = min(2, counts[index] + 1)
+    summary["counts"] = counts
+    return summary
+
+
+def sitemap_shards(root: Path, assets: dict[str, dict[str, Any]]) -> list[Path]:
+    """Return the urlset files behind sitemap.xml, following a sitemapindex one level."""
+    sitemap = root / "sitemap.xml"
+    if sitemap_kind(sitemap) != "sitemapindex":
+        return [sitemap]
+    shards: list[Path] = []
+    seen: set[str] = set()
+    for _, loc in iter_sitemap_locs(sitemap):
+        if loc is None:
+            continue
+        if not loc.startswith(SEARCH_BASE_URL):
+            raise ValueError("sitemap contains a non-canonical URL")
+        if loc in seen:
+            raise ValueError("sitemap contains duplicate URLs")
+        seen.add(loc)
+        name = loc.removeprefix(SEARCH_BASE_URL)
+        if name not in assets:
+            raise ValueError(f"sitemap shard is not a deployed asset: {name}")
+        shards.append(root / name)
+    return shards
+
+
+def verify_sitemap(
+    root: Path, assets: dict[str, dict[str, Any]], expected_urls: list[str], jobs: int = DEFAULT_JOBS
+) -> None:
+    """Check canonical prefix, uniqueness, homepage-first order and page parity across shards."""
+    positions = {url: index for index, url in enumerate(expected_urls)}
+    shards = sitemap_shards(root, assets)
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(shards)))) as pool:
+        summaries = list(pool.map(scan_sitemap_shard, shards, repeat(positions)))
+
+    counts = bytearray(len(positions))
+    for summary in summaries:
+        counts = bytearray(min(2, a + b) for a, b in zip(counts, summary["counts"]))
+    if any(summary["non_canonical"] for summary in summaries):
+        raise ValueError("sitemap contains a non-canonical URL")
+    extra = Counter(url for summary in summaries for url in summary["extra"])
+    duplicates = [url for url, count in zip(expected_urls, counts) if count == 2]
+    duplicates += sorted(url for url, count in extra.items() if count > 1)
+    if duplicates:
+        raise ValueError(f"sitemap contains duplicate URLs: {duplicates[:5]}")
+    if not summaries or summaries[0]["first"] != SEARCH_BASE_URL:
+        raise ValueError("sitemap must start with the canonical homepage")
+    if extra or 0 in counts:
+        raise ValueError("sitemap/search-page parity mismatch")
+
 
-    search_assets = sorted(
+def search_pages(assets: dict[str, dict[str, Any]]) -> list[str]:
+    return sorted(
         name
         for name in assets
         if name.startswith(SEARCH_PAGE_PREFIXES) and name.endswith("/index.html")
     )
-    detail_assets = [name for name in search_assets if name.startswith("events/")]
-    if not detail_assets:
+
+
+def check_search_assets(assets: dict[str, dict[str, Any]], pages: list[str]) -> None:
+    required = {"index.html", "sitemap.xml", "analytics.js", "analytics-config.json"}
+    missing = sorted(required - set(assets))
+    if missing:
+        raise ValueError(f"search surface missing assets: {', '.join(missing)}")
+    if not any(name.startswith("events/") for name in pages):
         raise ValueError("search surface has no event detail pages")
 
-    sitemap = ET.parse(root / "sitemap.xml").getroot()
-    namespace = {"s": "http://www.sitemaps.org/schemas/sitemap/0.9"}
-    urls = [node.text for node in sitemap.findall("s:url/s:loc", namespace)]
-    if any(not isinstance(url, str) or not url.startswith(SEARCH_BASE_URL) for url in urls):
-        raise ValueError("sitemap contains a non-canonical URL")
-    if len(urls) != len(set(urls)):
-        raise ValueError("sitemap contains duplicate URLs")
-    if not urls or urls[0] != SEARCH_BASE_URL:
-        raise ValueError("sitemap must start with the canonical homepage")
 
-    expected_search_urls = {
-        SEARCH_BASE_URL + name.removesuffix("index.html") for name in search_assets
-    }
-    if set(urls[1:]) != expected_search_urls:
-        raise ValueError("sitemap/search-page parity mismatch")
+def check_sitemap(root: Path, assets: dict[str, dict[str, Any]], pages: list[str], jobs: int = DEFAULT_JOBS) -> None:
+    expected_urls = [
+        SEARCH_BASE_URL,
+        *(SEARCH_BASE_URL + name.removesuffix("index.html") for name in pages),
+    ]
+    verify_sitemap(root, assets, expected_urls, jobs)
 
-    expected_root_links = {name.removesuffix("index.html") for name in search_assets}
-    root_html = (root / "index.html").read_text(encoding="utf-8")
-    root_links = set(
-        re.findall(r'href=["\']((?:events|categories|series)/[^"\']+/)["\']', root_html)
-    )
+
+def check_homepage(root: Path, assets: dict[str, dict[str, Any]], pages: list[str]) -> None:
+    expected_root_links = {name.removesuffix("index.html") for name in pages}
+    root_links = homepage_links(root, assets)
     if root_links != expected_root_links:
         missing_links = sorted(expected_root_links - root_links)
         extra_links = sorted(root_links - expected_root_links)
@@ -88,15 +308,19 @@ def verify_search_surface(root: Path, assets: dict[str, dict[str, Any]]) -> None
             f"missing={missing_links[:5]} extra={extra_links[:5]}"
         )
 
-    for name in search_assets:
-        content = (root / name).read_text(encoding="utf-8")
-        expected_url = SEARCH_BASE_URL + name.removesuffix("index.html")
-        canonical = f'rel="canonical" href="{expected_url}"'
-        if canonical not in content:
-            raise ValueError(f"missing canonical search URL: {name}")
-        if name.startswith("events/") and "application/ld+json" in content:
-            raise ValueError(f"unsupported virtual-only Event JSON-LD: {name}")
 
+def page_problems(root: Path, name: str) -> list[str]:
+    """Scan one search page and describe what is wrong with it."""
+    canonical, has_json_ld = scan_page(root / name, name.startswith("events/"))
+    problems = []
+    if SEARCH_BASE_URL + name.removesuffix("index.html") not in canonical:
+        problems.append(f"missing canonical search URL: {name}")
+    if name.startswith("events/") and has_json_ld:
+        problems.append(f"unsupported virtual-only Event JSON-LD: {name}")
+    return problems
+
+
+def check_analytics_config(root: Path) -> None:
     config = json.loads((root / "analytics-config.json").read_text(encoding="utf-8"))
     measurement_id = config.get("ga4_measurement_id")
     if measurement_id is not None and (
@@ -105,8 +329,202 @@ def verify_search_surface(root: Path, assets: dict[str, dict[str, Any]]) -> None
         raise ValueError("invalid GA4 measurement ID")
 
 
-def verify(root: Path, manifest_path: Path) -> dict[str, Any]:
+def verify_search_surface(
+    root: Path, assets: dict[str, dict[str, Any]], jobs: int = DEFAULT_JOBS
+) -> None:
+    """Validate the derived search surface once a canonical sitemap is present."""
+    if "sitemap.xml" not in assets:
+        return
+
+    pages = search_pages(assets)
+    check_search_assets(assets, pages)
+    with phase("sitemap"):
+        check_sitemap(root, assets, pages, jobs)
+    with phase("homepage_links"):
+        check_homepage(root, assets, pages)
+
+    with phase("page_scan"), ThreadPoolExecutor(max_workers=jobs) as pool:
+        problems = [
+            problem for found in pool.map(page_problems, repeat(root), pages) for problem in found
+        ]
+    # Report canonical gaps before JSON-LD findings, as a single message.
+    problems.sort(key=lambda problem: not problem.startswith("missing canonical"))
+    if problems:
+        raise ValueError("; ".join(problems))
+
+    check_analytics_config(root)
+
+
+def validate_asset_table(assets: object) -> dict[str, dict[str, Any]]:
+    if not isinstance(assets, dict) or not assets:
+        raise ValueError("projection manifest has no assets")
+    for name, expected in assets.items():
+        if not isinstance(name, str) or name.startswith("/") or ".." in Path(name).parts:
+            raise ValueError(f"unsafe asset path: {name!r}")
+        if not isinstance(expected, dict):
+            raise ValueError(f"invalid asset metadata: {name}")
+        expected_bytes = expected.get("bytes")
+        expected_hash = expected.get("sha256")
+        if isinstance(expected_bytes, bool) or not isinstance(expected_bytes, int) or expected_bytes < 0:
+            raise ValueError(f"invalid asset byte count: {name}")
+        if not isinstance(expected_hash, str) or len(expected_hash) != 64:
+            raise ValueError(f"invalid asset sha256: {name}")
+    return assets
+
+
+def check_asset(
+    root: Path, name: str, expected: dict[str, Any], context: SnapshotContext | None = None
+) -> str | None:
+    """Return the failure kind for one asset, hashing only when the size already matches.
+
+    Shared artifacts are hashed from ``context`` so their bytes are read once
+    and reused for parsing.
+    """
+    path = root / name
+    try:
+        status = path.stat()
+    except OSError:
+        return "missing"
+    if not stat.S_ISREG(status.st_mode):
+        return "missing"
+    if status.st_size != expected["bytes"]:
+        return "resized"
+    if context is not None and name in SHARED_ARTIFACTS:
+        digest = context.digest(name)[1]
+    else:
+        with path.open("rb") as handle:
+            digest = hashlib.file_digest(handle, "sha256").hexdigest()
+    if digest != expected["sha256"]:
+        return "mismatched"
+    return None
+
+
+def blob_key(root: Path, name: str) -> tuple[int, int] | None:
+    try:
+        status = (root / name).stat()
+    except OSError:
+        return None
+    return status.st_dev, status.st_ino
+
+
+def check_assets(
+    root: Path,
+    assets: dict[str, dict[str, Any]],
+    jobs: int = DEFAULT_JOBS,
+    context: SnapshotContext | None = None,
+) -> dict[str, Any]:
+    """Check every asset on a worker pool and report all failures instead of the first.
+
+    Paths that are hardlinks to one blob with the same expected digest are
+    hashed once; ``unique_blobs`` counts the files actually checked.
+    """
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+    names = sorted(assets)
+    report: dict[str, Any] = {"asset_count": len(names)}
+    for kind, _ in ASSET_FAILURES:
+        report[kind] = []
+    expected = [assets[name] for name in names]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        blobs = list(pool.map(blob_key, repeat(root), names))
+        owners: dict[tuple[int, int], int] = {}
+        pending = []
+        for position, blob in enumerate(blobs):
+            owner = owners.get(blob) if blob is not None else None
+            if owner is None or expected[owner] != expected[position]:
+                pending.append(position)
+                if blob is not None:
+                    owners.setdefault(blob, position)
+        checked = dict(zip(pending, pool.map(
+            check_asset, repeat(root), [names[i] for i in pending], [expected[i] for i in pending], repeat(context)
+        )))
+    for position, name in enumerate(names):
+        kind = checked[position] if position in checked else checked[owners[blobs[position]]]  # type: ignore[index]
+        if kind is not None:
+            report[kind].append(name)
+    report["unique_blobs"] = len(pending)
+    report["status"] = "failed" if any(report[kind] for kind, _ in ASSET_FAILURES) else "ok"
+    return report
+
+
+def asset_failure_message(report: dict[str, Any]) -> str:
+    return "; ".join(
+        f"{label}: {name}" for kind, label in ASSET_FAILURES for name in report[kind]
+    )
+
+
+def verify_assets(root: Path, manifest_path: Path, jobs: int = DEFAULT_JOBS) -> dict[str, Any]:
+    """Return the asset report for a manifest without raising on content failures."""
     manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    if not isinstance(manifest, dict):
+        raise ValueError("projection manifest must contain an object")
+    return check_assets(root, validate_asset_table(manifest.get("assets")), jobs)
+
+
+def recorded_subtrees(manifest: dict[str, Any]) -> dict[str, str]:
+    """Return the subtree hashes in ``source_snapshot_merkle``; empty for a manifest written before it existed."""
+    merkle = manifest.get("source_snapshot_merkle")
+    subtrees = merkle.get("subtrees") if isinstance(merkle, dict) else None
+    return subtrees if isinstance(subtrees, dict) else {}
+
+
+def diff_subtrees(previous: dict[str, Any], current: dict[str, Any]) -> dict[str, list[str]]:
+    """Compare the recorded Merkle subtree hashes of two deploys; a subtree present in only one counts as changed."""
+    before = recorded_subtrees(previous)
+    after = recorded_subtrees(current)
+    changed = {prefix for prefix in before.keys() | after.keys() if before.get(prefix) != after.get(prefix)}
+    return {
+        "changed_subtrees": sorted(changed),
+        "unchanged_subtrees": sorted(prefix for prefix in after if before.get(prefix) == after[prefix]),
+    }
+
+
+def verify_subtree(
+    root: Path, manifest_path: Path, prefix: str, jobs: int = DEFAULT_JOBS
+) -> dict[str, Any]:
+    """Check one directory subtree on disk against a manifest whose Merkle summary matches its asset table.
+
+    The whole manifest is still parsed and its digests recomputed, so a
+    consistently edited subtree hash fails; only the disk reads are limited
+    to the subtree.
+    """
+    manifest = load_manifest(manifest_path)
+    prefix = prefix.rstrip("/") + "/"
+    recorded = recorded_subtrees(manifest).get(prefix)
+    if not isinstance(recorded, str):
+        raise ValueError(f"source_snapshot_merkle records no hash for {prefix}")
+    assets = validate_asset_table(manifest.get("assets"))
+    check_manifest_digests(manifest, assets)
+    selected = {name: metadata for name, metadata in assets.items() if name.startswith(prefix)}
+    report = check_assets(root, selected, jobs)
+    report.update({"subtree": prefix, "subtree_sha256": recorded})
+    return report
+
+
+def verify_changed(
+    root: Path, manifest_path: Path, previous_path: Path, jobs: int = DEFAULT_JOBS
+) -> dict[str, Any]:
+    """Check on disk every asset except those in subtrees whose hash matches the previous deploy's.
+
+    The previous manifest is the trust anchor: a subtree it already covered
+    with the same hash is reported as unchanged and not re-read.
+    """
+    manifest = load_manifest(manifest_path)
+    assets = validate_asset_table(manifest.get("assets"))
+    check_manifest_digests(manifest, assets)
+    diff = diff_subtrees(load_manifest(previous_path), manifest)
+    skipped = tuple(diff["unchanged_subtrees"])
+    selected = {name: metadata for name, metadata in assets.items() if not name.startswith(skipped)}
+    report = check_assets(root, selected, jobs)
+    report.update(diff)
+    report["skipped_assets"] = len(assets) - len(selected)
+    return report
+
+
+def load_manifest(manifest_path: Path) -> dict[str, Any]:
+    """Read the manifest and check its contract fields before any asset is touched."""
+    with phase("manifest_json"):
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
     if not isinstance(manifest, dict):
         raise ValueError("projection manifest must contain an object")
     missing = sorted(REQUIRED_FIELDS - set(manifest))
@@ -120,65 +538,305 @@ def verify(root: Path, manifest_path: Path) -> dict[str, Any]:
         raise ValueError("unexpected canonical repository")
     if manifest.get("validation_status") != "validated":
         raise ValueError("canonical snapshot is not validated")
+    return manifest
 
-    assets = manifest.get("assets")
-    if not isinstance(assets, dict) or not assets:
-        raise ValueError("projection manifest has no assets")
-    for name, expected in assets.items():
-        if not isinstance(name, str) or name.startswith("/") or ".." in Path(name).parts:
-            raise ValueError(f"unsafe asset path: {name!r}")
-        if not isinstance(expected, dict):
-            raise ValueError(f"invalid asset metadata: {name}")
-        expected_bytes = expected.get("bytes")
-        expected_hash = expected.get("sha256")
-        if isinstance(expected_bytes, bool) or not isinstance(expected_bytes, int) or expected_bytes < 0:
-            raise ValueError(f"invalid asset byte count: {name}")
-        if not isinstance(expected_hash, str) or len(expected_hash) != 64:
-            raise ValueError(f"invalid asset sha256: {name}")
-        path = root / name
-        if not path.is_file():
-            raise ValueError(f"missing deployed asset: {name}")
-        raw = path.read_bytes()
-        if expected_bytes != len(raw):
-            raise ValueError(f"byte mismatch: {name}")
-        if expected_hash != hashlib.sha256(raw).hexdigest():
-            raise ValueError(f"sha256 mismatch: {name}")
 
+def check_manifest_digests(manifest: dict[str, Any], assets: dict[str, dict[str, Any]]) -> str:
     expected_snapshot = snapshot_digest(assets)
     if manifest.get("source_snapshot_sha256") != expected_snapshot:
         raise ValueError("source_snapshot_sha256 mismatch")
+    if "source_snapshot_merkle" in manifest and manifest["source_snapshot_merkle"] != merkle_summary(assets):
+        raise ValueError("source_snapshot_merkle mismatch")
+    if "content_groups" in manifest and manifest["content_groups"] != content_groups(assets):
+        raise ValueError("content_groups mismatch")
+    return expected_snapshot
 
-    events = json.loads((root / "events.json").read_text(encoding="utf-8"))
-    health = json.loads((root / "health.json").read_text(encoding="utf-8"))
-    ontology = json.loads((root / "event-ontology.json").read_text(encoding="utf-8"))
-    rows = events.get("events", [])
-    if manifest.get("event_count") != len(rows):
+
+def check_event_counts(manifest: dict[str, Any], context: SnapshotContext) -> int:
+    with phase("event_json"):
+        event_count = context.event_count()
+        health = context.object("health.json")
+        ontology = context.object("event-ontology.json")
+    if manifest.get("event_count") != event_count:
         raise ValueError("manifest event_count mismatch")
-    if health.get("event_count") != len(rows):
+    if health.get("event_count") != event_count:
         raise ValueError("health event_count mismatch")
-    if ontology.get("source_event_count") != len(rows):
+    if ontology.get("source_event_count") != event_count:
         raise ValueError("ontology event_count mismatch")
     if manifest.get("collection_counts", {}).get("failed_sources") != 0:
         raise ValueError("manifest reports failed sources")
+    return event_count
+
+
+def verify(
+    root: Path,
+    manifest_path: Path,
+    jobs: int = DEFAULT_JOBS,
+    context: SnapshotContext | None = None,
+) -> dict[str, Any]:
+    manifest = load_manifest(manifest_path)
+    assets = validate_asset_table(manifest.get("assets"))
+    context = context or SnapshotContext(root)
+    with phase("hash_assets"):
+        report = check_assets(root, assets, jobs, context)
+    if report["status"] != "ok":
+        raise ValueError(asset_failure_message(report))
+
+    with phase("snapshot_digest"):
+        expected_snapshot = check_manifest_digests(manifest, assets)
+    note("source_snapshot_sha256", expected_snapshot)
+    if index_path(manifest_path).is_file():
+        with phase("manifest_index"):
+            verify_index(index_path(manifest_path), manifest)
 
-    verify_search_surface(root, assets)
+    event_count = check_event_counts(manifest, context)
+
+    with phase("search_surface"):
+        verify_search_surface(root, assets, jobs)
+
+    if COLUMNAR_PATH in assets:
+        with phase("events_columnar"):
+            verify_columnar(context)
+    if OFFSETS_PATH in assets:
+        with phase("event_offsets"):
+            verify_offsets(context)
+    if SHARD_INDEX in assets:
+        with phase("tonight_shards"):
+            verify_shards(context, assets)
+    if SCHEDULE_PATH in assets:
+        with phase("featured_schedule"):
+            verify_schedule(context)
 
     return {
         "status": "ok",
         "asset_count": len(assets),
-        "event_count": len(rows),
+        "event_count": event_count,
         "source_commit_sha": manifest["source_commit_sha"],
         "source_snapshot_sha256": expected_snapshot,
     }
 
 
+def scan_tree(root: Path) -> dict[str, tuple[int, int]]:
+    """Return (size, mtime_ns) for every file under ``root`` from one os.scandir walk."""
+    found: dict[str, tuple[int, int]] = {}
+    pending = [("", os.fspath(root))]
+    while pending:
+        prefix, directory = pending.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append((prefix + entry.name + "/", entry.path))
+                elif entry.is_file():
+                    status = entry.stat()
+                    found[prefix + entry.name] = (status.st_size, status.st_mtime_ns)
+    return found
+
+
+class Watcher:
+    """Hold one verification pass in memory and re-check only what changed on disk.
+
+    Failures are keyed by check: ``asset:<name>`` for digests, ``page:<name>``
+    for search pages, and one key per derived check (``events``,
+    ``sitemap``, ``homepage``, ...). A poll re-runs the checks whose inputs
+    changed; a changed manifest triggers a full pass.
+    """
+
+    def __init__(self, root: Path, manifest_path: Path, jobs: int = DEFAULT_JOBS) -> None:
+        self.root = root
+        self.manifest_path = manifest_path
+        self.jobs = jobs
+        self.failures: dict[str, str] = {}
+        self.files: dict[str, tuple[int, int]] = {}
+        self.manifest_seen: tuple[int, int] | None = None
+        self.assets: dict[str, dict[str, Any]] = {}
+        self.manifest: dict[str, Any] = {}
+        self.pages: set[str] = set()
+        self.search = False
+        self.context = SnapshotContext(root)
+        self.full_pass()
+
+    def manifest_stat(self) -> tuple[int, int] | None:
+        try:
+            status = self.manifest_path.stat()
+        except OSError:
+            return None
+        return status.st_size, status.st_mtime_ns
+
+    def full_pass(self) -> int:
+        self.failures = {}
+        self.files = scan_tree(self.root)
+        self.manifest_seen = self.manifest_stat()
+        self.context = SnapshotContext(self.root)
+        try:
+            self.manifest = load_manifest(self.manifest_path)
+            self.assets = validate_asset_table(self.manifest.get("assets"))
+            check_manifest_digests(self.manifest, self.assets)
+        except (OSError, ValueError) as exc:
+            self.assets = {}
+            self.failures["manifest"] = str(exc)
+            return 0
+        self.search = "sitemap.xml" in self.assets
+        self.pages = set(search_pages(self.assets)) if self.search else set()
+        report = check_assets(self.root, self.assets, self.jobs, self.context)
+        for kind, label in ASSET_FAILURES:
+            for name in report[kind]:
+                self.failures[f"asset:{name}"] = f"{label}: {name}"
+        checks = self.derived_checks(set(self.assets))
+        self.run_checks(checks)
+        return len(self.assets) + len(checks)
+
+    def derived_checks(self, changed: set[str]) -> list[str]:
+        """Map changed file names to the derived checks that read them."""
+        checks = {f"page:{name}" for name in changed & self.pages}
+        if changed & SHARED_ARTIFACTS:
+            checks.add("events")
+        if self.search:
+            if "sitemap.xml" in changed or any(name.endswith(".xml") for name in changed):
+                checks.add("sitemap")
+            if any(name.endswith((".html", ".json")) and name not in self.pages for name in changed):
+                checks.add("homepage")
+            if changed & {"index.html", "sitemap.xml", "analytics.js", "analytics-config.json"}:
+                checks.add("search_assets")
+            if "analytics-config.json" in changed:
+                checks.add("analytics")
+        if COLUMNAR_PATH in self.assets and changed & {"events.json", COLUMNAR_PATH}:
+            checks.add("columnar")
+        if OFFSETS_PATH in self.assets and changed & {"events.json", OFFSETS_PATH}:
+            checks.add("offsets")
+        if SHARD_INDEX in self.assets and (
+            "events.json" in changed or any(name.startswith(f"{SHARD_DIR}/") for name in changed)
+        ):
+            checks.add("shards")
+        if SCHEDULE_PATH in self.assets and changed & {"events.json", "sponsorships.json", SCHEDULE_PATH}:
+            checks.add("schedule")
+        return sorted(checks)
+
+    def run_check(self, key: str) -> str | None:
+        pages = sorted(self.pages)
+        try:
+            if key.startswith("page:"):
+                problems = page_problems(self.root, key.removeprefix("page:"))
+                return "; ".join(problems) or None
+            if key == "events":
+                check_event_counts(self.manifest, self.context)
+            elif key == "search_assets":
+                check_search_assets(self.assets, pages)
+            elif key == "sitemap":
+                check_sitemap(self.root, self.assets, pages, self.jobs)
+            elif key == "homepage":
+                check_homepage(self.root, self.assets, pages)
+            elif key == "analytics":
+                check_analytics_config(self.root)
+            elif key == "columnar":
+                verify_columnar(self.context)
+            elif key == "offsets":
+                verify_offsets(self.context)
+            elif key == "shards":
+                verify_shards(self.context, self.assets)
+            elif key == "schedule":
+                verify_schedule(self.context)
+        except (OSError, ValueError, ET.ParseError) as exc:
+            return str(exc)
+        return None
+
+    def run_checks(self, keys: list[str]) -> None:
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            for key, failure in zip(keys, pool.map(self.run_check, keys)):
+                if failure is None:
+                    self.failures.pop(key, None)
+                else:
+                    self.failures[key] = failure
+
+    def poll(self) -> tuple[set[str], int]:
+        """Re-check what changed since the last poll; return (changed names, checks run)."""
+        if self.manifest_stat() != self.manifest_seen:
+            return {self.manifest_path.name}, self.full_pass()
+        current = scan_tree(self.root)
+        changed = {name for name in current.keys() | self.files.keys() if current.get(name) != self.files.get(name)}
+        self.files = current
+        if not changed:
+            return changed, 0
+        self.context = SnapshotContext(self.root)
+        assets = sorted(changed & self.assets.keys())
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            results = pool.map(check_asset, repeat(self.root), assets, [self.assets[name] for name in assets],
+                               repeat(self.context))
+            labels = dict(ASSET_FAILURES)
+            for name, kind in zip(assets, results):
+                if kind is None:
+                    self.failures.pop(f"asset:{name}", None)
+                else:
+                    self.failures[f"asset:{name}"] = f"{labels[kind]}: {name}"
+        checks = self.derived_checks(changed)
+        self.run_checks(checks)
+        return changed, len(assets) + len(checks)
+
+    def status_line(self, changed: set[str], checked: int, seconds: float) -> str:
+        state = "failed" if self.failures else "ok"
+        line = (
+            f"{datetime.now().strftime('%H:%M:%S')} {state} assets={len(self.assets)} "
+            f"changed={len(changed)} rechecked={checked} {seconds * 1000:.1f}ms"
+        )
+        if self.failures:
+            messages = [self.failures[key] for key in sorted(self.failures)]
+            line += f" failures={len(messages)}: " + "; ".join(messages[:3])
+        return line
+
+
+def watch(root: Path, manifest_path: Path, jobs: int = DEFAULT_JOBS, interval: float = WATCH_INTERVAL) -> None:
+    started = time.perf_counter()
+    watcher = Watcher(root, manifest_path, jobs)
+    print(watcher.status_line(set(), len(watcher.assets), time.perf_counter() - started), flush=True)
+    try:
+        while True:
+            time.sleep(interval)
+            started = time.perf_counter()
+            changed, checked = watcher.poll()
+            if changed:
+                print(watcher.status_line(changed, checked, time.perf_counter() - started), flush=True)
+    except KeyboardInterrupt:
+        pass
+
+
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--root", required=True)
     parser.add_argument("--manifest", required=True)
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="parallel asset workers")
+    parser.add_argument(
+        "--report", action="store_true", help="print the full asset report instead of failing on the first error"
+    )
+    parser.add_argument("--subtree", help="read only one recorded Merkle subtree from disk, e.g. og/events/")
+    parser.add_argument(
+        "--changed-since",
+        metavar="PREVIOUS_MANIFEST",
+        help="skip the subtrees whose recorded hash matches this earlier manifest and report which changed",
+    )
+    parser.add_argument("--watch", action="store_true", help="keep running and re-check files as they change")
+    parser.add_argument("--interval", type=float, default=WATCH_INTERVAL, help="--watch polling interval in seconds")
+    add_profile_arguments(parser)
     args = parser.parse_args()
-    result = verify(Path(args.root), Path(args.manifest))
-    print(json.dumps(result, ensure_ascii=False, sort_keys=True))
+    if args.watch:
+        watch(Path(args.root), Path(args.manifest), args.jobs, args.interval)
+        return
+    with profile_run("verify_projection_manifest", args):
+        if args.subtree or args.changed_since:
+            if args.subtree:
+                report = verify_subtree(Path(args.root), Path(args.manifest), args.subtree, args.jobs)
+            else:
+                report = verify_changed(Path(args.root), Path(args.manifest), Path(args.changed_since), args.jobs)
+            print(json.dumps(report, ensure_ascii=False, sort_keys=True))
+            if report["status"] != "ok":
+                raise SystemExit(1)
+            return
+        if args.report:
+            report = verify_assets(Path(args.root), Path(args.manifest), args.jobs)
+            print(json.dumps(report, ensure_ascii=False, sort_keys=True))
+            if report["status"] != "ok":
+                raise SystemExit(1)
+            return
+        result = verify(Path(args.root), Path(args.manifest), args.jobs)
+        print(json.dumps(result, ensure_ascii=False, sort_keys=True))
 
 
 if __name__ == "__main__":
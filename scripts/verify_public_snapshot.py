@@ -3,22 +3,47 @@
 
 from __future__ import annotations
 
-import hashlib
+import argparse
 import json
+import sys
 from pathlib import Path
 from typing import Any
 
 ROOT = Path(__file__).resolve().parents[1]
 
+if __package__ in {None, ""}:
+    sys.path.insert(0, str(ROOT))
 
-def load_json(path: Path) -> tuple[bytes, Any]:
-    raw = path.read_bytes()
+from scripts.profiling import add_profile_arguments, note, phase, profile_run  # noqa: E402
+from scripts.snapshot_context import SnapshotContext  # noqa: E402
+
+
+def load_json(context: SnapshotContext, name: str) -> tuple[bytes, Any]:
+    raw = context.raw(name)
     if not raw:
-        raise SystemExit(f"{path.name} is empty")
+        raise SystemExit(f"{name} is empty")
     try:
-        return raw, json.loads(raw)
+        return raw, context.json(name)
     except json.JSONDecodeError as exc:
-        raise SystemExit(f"{path.name} is not valid JSON: {exc}") from exc
+        raise SystemExit(f"{name} is not valid JSON: {exc}") from exc
+
+
+def count_events(context: SnapshotContext) -> tuple[int, str, list[str]]:
+    """Count events.json rows without materializing them when the list is under "events"."""
+    raw = context.raw("events.json")
+    if not raw:
+        raise SystemExit("events.json is empty")
+    try:
+        header, count = context.summary("events.json")
+    except ValueError as exc:
+        raise SystemExit(f"events.json is not valid JSON: {exc}") from exc
+    if header is None:
+        return count or 0, "array", []
+    if count is not None:
+        return count, "object.events", sorted([*header, "events"])
+    _, payload = load_json(context, "events.json")
+    events, payload_shape, payload_keys = extract_events(payload)
+    return len(events), payload_shape, payload_keys
 
 
 def extract_events(payload: Any) -> tuple[list[dict[str, Any]], str, list[str]]:
@@ -39,14 +64,17 @@ def extract_events(payload: Any) -> tuple[list[dict[str, Any]], str, list[str]]:
     )
 
 
-def main() -> None:
-    events_raw, events_payload = load_json(ROOT / "events.json")
-    _, health = load_json(ROOT / "health.json")
-    _, event_ontology = load_json(ROOT / "event-ontology.json")
-    _, ontology_audit = load_json(ROOT / "ontology-match-audit.json")
+def snapshot_metrics(context: SnapshotContext) -> dict[str, Any]:
+    with phase("json_parse"):
+        _, health = load_json(context, "health.json")
+        _, event_ontology = load_json(context, "event-ontology.json")
+        _, ontology_audit = load_json(context, "ontology-match-audit.json")
 
-    events, payload_shape, payload_keys = extract_events(events_payload)
-    event_count = len(events)
+    with phase("event_count"):
+        event_count, payload_shape, payload_keys = count_events(context)
+    with phase("events_digest"):
+        events_bytes, events_sha256 = context.digest("events.json")
+    note("events_sha256", events_sha256)
     expected = {
         "health.json:event_count": health.get("event_count"),
         "event-ontology.json:source_event_count": event_ontology.get(
@@ -64,18 +92,26 @@ def main() -> None:
         formatted = ", ".join(f"{label}={value}" for label, value in mismatches.items())
         raise SystemExit(f"snapshot event count mismatch: events.json={event_count}, {formatted}")
 
-    metrics = {
-        "events_bytes": len(events_raw),
+    return {
+        "events_bytes": events_bytes,
         "events_count": event_count,
         "events_payload_shape": payload_shape,
         "events_payload_keys": payload_keys,
-        "events_sha256": hashlib.sha256(events_raw).hexdigest(),
+        "events_sha256": events_sha256,
         "health_generated_at": health.get("generated_at"),
         "ontology_entries": ontology_audit.get("ontology_entries"),
         "matched_events": ontology_audit.get("matched_events"),
         "ambiguous_events": ontology_audit.get("ambiguous_events"),
     }
-    print(json.dumps(metrics, ensure_ascii=False, sort_keys=True))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    with profile_run("verify_public_snapshot", args):
+        metrics = snapshot_metrics(SnapshotContext(ROOT))
+        print(json.dumps(metrics, ensure_ascii=False, sort_keys=True))
 
 
 if __name__ == "__main__":
@@ -4,14 +4,24 @@ from __future__ import annotations
 import argparse
 import json
 import re
-from datetime import datetime, timezone
+import sys
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from urllib.parse import urlparse
 
+if __package__ in {None, ""}:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts import common  # noqa: E402
+from scripts.profiling import add_profile_arguments, phase, profile_run  # noqa: E402
+from scripts.snapshot_context import SnapshotContext  # noqa: E402
+
 CAMPAIGN_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
 SCHEMA_VERSION = "featured-tonight.v1"
 ACTIVE_STATUS = "APPROVED"
 STATUSES = {ACTIVE_STATUS, "PAUSED", "EXPIRED"}
+MAX_CAMPAIGN_DURATION = timedelta(days=7)
 URL_FIELDS = (
     "official_url",
     "source_url",
@@ -30,16 +40,7 @@ class SponsorshipValidationError(ValueError):
 
 
 def parse_datetime(value: object, field: str) -> datetime:
-    if not isinstance(value, str) or not value.strip():
-        raise SponsorshipValidationError(f"{field}: non-empty ISO 8601 value required")
-    normalized = value.replace("Z", "+00:00")
-    try:
-        parsed = datetime.fromisoformat(normalized)
-    except ValueError as exc:
-        raise SponsorshipValidationError(f"{field}: invalid ISO 8601 datetime") from exc
-    if parsed.tzinfo is None:
-        raise SponsorshipValidationError(f"{field}: timezone offset required")
-    return parsed.astimezone(timezone.utc)
+    return common.parse_datetime(value, field, SponsorshipValidationError)
 
 
 def valid_https_url(value: object) -> bool:
@@ -81,7 +82,101 @@ def allowed_destinations(event: dict) -> set[str]:
     }
 
 
+Interval = tuple[datetime, datetime, int, str, str]
+EARLIEST = datetime.min.replace(tzinfo=timezone.utc)
+
+
+class IntervalTree:
+    """Intervals sorted by start over a segment tree of maximum ends.
+
+    A query bisects the starts, then descends only into subtrees whose
+    maximum end lies after the query time: O(log n) per reported interval,
+    plus O(log n) for the search itself.
+    """
+
+    def __init__(self, intervals: list[Interval]) -> None:
+        self.intervals = intervals
+        self.starts = [interval[0] for interval in intervals]
+        self.size = 1
+        while self.size < len(intervals):
+            self.size *= 2
+        self.max_end = [EARLIEST] * (2 * self.size)
+        for position, interval in enumerate(intervals):
+            self.max_end[self.size + position] = interval[1]
+        for node in range(self.size - 1, 0, -1):
+            self.max_end[node] = max(self.max_end[2 * node], self.max_end[2 * node + 1])
+
+    def stab(self, when: datetime) -> list[Interval]:
+        """Return the intervals with ``starts_at <= when < ends_at``, in start order."""
+        return self._ending_after(bisect_right(self.starts, when), when)
+
+    def overlapping(self, starts_at: datetime, ends_at: datetime) -> list[Interval]:
+        """Return the intervals that share time with ``[starts_at, ends_at)``, in start order."""
+        return self._ending_after(bisect_left(self.starts, ends_at), starts_at)
+
+    def _ending_after(self, limit: int, when: datetime) -> list[Interval]:
+        """Return the first ``limit`` intervals whose end lies after ``when``."""
+        found = []
+        stack = [(1, 0, self.size)]
+        while stack:
+            node, low, high = stack.pop()
+            if low >= limit or self.max_end[node] <= when:
+                continue
+            if high - low == 1:
+                found.append(self.intervals[low])
+                continue
+            middle = (low + high) // 2
+            stack.append((2 * node + 1, middle, high))
+            stack.append((2 * node, low, middle))
+        return found
+
+
+class CampaignIndex:
+    """APPROVED campaign intervals sorted by start, overall and per event.
+
+    Intervals are half-open ``[starts_at, ends_at)`` and hold (starts_at,
+    ends_at, position, campaign_id, event_id).
+    """
+
+    def __init__(self, intervals: list[Interval]) -> None:
+        self.intervals = sorted(intervals)
+        self.by_event: dict[str, list[Interval]] = {}
+        for interval in self.intervals:
+            self.by_event.setdefault(interval[4], []).append(interval)
+        self.tree = IntervalTree(self.intervals)
+        self.event_trees = {event: IntervalTree(intervals) for event, intervals in self.by_event.items()}
+
+    def overlaps(self) -> list[tuple[Interval, Interval]]:
+        """Return every (earlier, later) pair of APPROVED campaigns that overlap on the same event."""
+        pairs = []
+        for event, intervals in self.by_event.items():
+            tree = self.event_trees[event]
+            for interval in intervals:
+                pairs.extend(
+                    (interval, other) for other in tree.overlapping(interval[0], interval[1]) if other > interval
+                )
+        return sorted(pairs)
+
+    def active_at(self, when: datetime, event: str | None = None) -> list[str]:
+        """Return the campaign ids live at ``when``, optionally for one event."""
+        tree = self.tree if event is None else self.event_trees.get(event)
+        if tree is None:
+            return []
+        return [interval[3] for interval in tree.stab(when)]
+
+
 def validate(payload: object, events_payload: object, *, now: datetime) -> dict:
+    return validate_with_index(payload, events_payload, now=now)[0]
+
+
+def validate_with_index(
+    payload: object, events_payload: object, *, now: datetime | None
+) -> tuple[dict, CampaignIndex]:
+    """Validate the manifest and return its result with the APPROVED campaign index.
+
+    With ``now=None`` the expiry policy is skipped and the time-dependent
+    result fields are None, so the outcome depends only on the two files.
+    """
     if not isinstance(payload, dict):
         raise SponsorshipValidationError("manifest: object required")
     if payload.get("schema_version") != SCHEMA_VERSION:
@@ -100,7 +195,8 @@ def validate(payload: object, events_payload: object, *, now: datetime) -> dict:
             indexed[eid] = event
 
     seen: set[str] = set()
-    active_count = 0
+    destinations: dict[str, set[str]] = {}
+    approved: list[Interval] = []
     for pos, campaign in enumerate(campaigns):
         prefix = f"campaigns[{pos}]"
         if not isinstance(campaign, dict):
@@ -131,7 +227,7 @@ def validate(payload: object, events_payload: object, *, now: datetime) -> dict:
         approved_at = parse_datetime(campaign.get("approved_at"), f"{prefix}.approved_at")
         if ends_at <= starts_at:
             raise SponsorshipValidationError(f"{prefix}: ends_at must be after starts_at")
-        if (ends_at - starts_at).total_seconds() > 7 * 24 * 60 * 60:
+        if ends_at - starts_at > MAX_CAMPAIGN_DURATION:
             raise SponsorshipValidationError(f"{prefix}: campaign exceeds 7 days")
         if approved_at > ends_at:
             raise SponsorshipValidationError(f"{prefix}: approved_at must not be after ends_at")
@@ -139,7 +235,9 @@ def validate(payload: object, events_payload: object, *, now: datetime) -> dict:
         destination = campaign.get("destination_url")
         if not valid_https_url(destination):
             raise SponsorshipValidationError(f"{prefix}.destination_url: HTTPS URL required")
-        if destination not in allowed_destinations(event):
+        if eid not in destinations:
+            destinations[eid] = allowed_destinations(event)
+        if destination not in destinations[eid]:
             raise SponsorshipValidationError(
                 f"{prefix}.destination_url: must match event official/participation URL"
             )
@@ -152,25 +250,24 @@ def validate(payload: object, events_payload: object, *, now: datetime) -> dict:
             )
 
         if status == ACTIVE_STATUS:
-            if now >= ends_at:
+            if now is not None and now >= ends_at:
                 raise SponsorshipValidationError(
                     f"{prefix}: expired APPROVED campaign must be marked EXPIRED or removed"
                 )
-            if starts_at <= now < ends_at:
-                active_count += 1
+            approved.append((starts_at, ends_at, pos, cid, eid))
 
-    return {
+    index = CampaignIndex(approved)
+
+    result = {
         "schema_version": SCHEMA_VERSION,
         "campaign_count": len(campaigns),
-        "active_campaign_count": active_count,
+        "active_campaign_count": len(index.active_at(now)) if now is not None else None,
         "event_count": len(events),
-        "validated_at": now.astimezone(timezone.utc).isoformat().replace("+00:00", "Z"),
+        # Overlaps are allowed; they are reported so an operator can resolve them.
+        "overlapping_campaigns": [[earlier[3], later[3]] for earlier, later in index.overlaps()],
+        "validated_at": now.astimezone(timezone.utc).isoformat().replace("+00:00", "Z") if now is not None else None,
     }
-
-
-def load_json(path: Path) -> object:
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+    return result, index
 
 
 def main() -> int:
@@ -178,11 +275,18 @@ def main() -> int:
     parser.add_argument("--events", default="events.json")
     parser.add_argument("--sponsorships", default="sponsorships.json")
     parser.add_argument("--now", help="ISO 8601 validation time; defaults to current UTC")
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
     now = parse_datetime(args.now, "--now") if args.now else datetime.now(timezone.utc)
-    result = validate(load_json(Path(args.sponsorships)), load_json(Path(args.events)), now=now)
-    print(json.dumps(result, ensure_ascii=False, sort_keys=True))
+    with profile_run("verify_sponsorships", args):
+        context = SnapshotContext(Path.cwd())
+        with phase("load_json"):
+            sponsorships = context.json(args.sponsorships)
+            events = context.json(args.events)
+        with phase("validate"):
+            result = validate(sponsorships, events, now=now)
+        print(json.dumps(result, ensure_ascii=False, sort_keys=True))
     return 0
 
 
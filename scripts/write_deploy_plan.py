@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Compute the minimal changed-file deploy plan between two projection manifests."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any
+
+SCHEMA_VERSION = "cast-event.deploy-plan.v1"
+
+
+def read_manifest(path: Path) -> dict[str, Any]:
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(payload, dict) or not isinstance(payload.get("assets"), dict):
+        raise ValueError(f"{path.name} must contain a projection manifest with assets")
+    return payload
+
+
+def asset_delta(
+    previous: dict[str, dict[str, Any]], current: dict[str, dict[str, Any]]
+) -> dict[str, Any]:
+    """Merge the two sorted asset tables once and classify every path."""
+    before = sorted(previous)
+    after = sorted(current)
+    added: list[str] = []
+    removed: list[str] = []
+    modified: list[str] = []
+    unchanged = 0
+    i = j = 0
+    while i < len(before) or j < len(after):
+        if j == len(after) or (i < len(before) and before[i] < after[j]):
+            removed.append(before[i])
+            i += 1
+        elif i == len(before) or after[j] < before[i]:
+            added.append(after[j])
+            j += 1
+        else:
+            name = before[i]
+            old, new = previous[name], current[name]
+            if old.get("sha256") == new.get("sha256") and old.get("bytes") == new.get("bytes"):
+                unchanged += 1
+            else:
+                modified.append(name)
+            i += 1
+            j += 1
+
+    removed_by_digest: dict[str, list[str]] = {}
+    for name in removed:
+        removed_by_digest.setdefault(previous[name]["sha256"], []).append(name)
+    renamed: list[dict[str, str]] = []
+    for name in added:
+        candidates = removed_by_digest.get(current[name]["sha256"])
+        if candidates:
+            renamed.append({"from": candidates.pop(0), "to": name, "sha256": current[name]["sha256"]})
+    moved_from = {item["from"] for item in renamed}
+    moved_to = {item["to"] for item in renamed}
+
+    return {
+        "added": [name for name in added if name not in moved_to],
+        "removed": [name for name in removed if name not in moved_from],
+        "modified": modified,
+        "renamed": renamed,
+        "unchanged_count": unchanged,
+    }
+
+
+def build_plan(previous: dict[str, Any], current: dict[str, Any]) -> dict[str, Any]:
+    delta = asset_delta(previous["assets"], current["assets"])
+    upload = sorted([*delta["added"], *delta["modified"], *(item["to"] for item in delta["renamed"])])
+    delete = sorted([*delta["removed"], *(item["from"] for item in delta["renamed"])])
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "previous_snapshot_sha256": previous.get("source_snapshot_sha256"),
+        "current_snapshot_sha256": current.get("source_snapshot_sha256"),
+        "previous_source_commit_sha": previous.get("source_commit_sha"),
+        "current_source_commit_sha": current.get("source_commit_sha"),
+        **delta,
+        "upload": upload,
+        "delete": delete,
+        "verify": upload,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--previous", required=True, help="previously deployed projection-manifest.json")
+    parser.add_argument("--current", required=True, help="new projection-manifest.json")
+    parser.add_argument("--output", help="write the plan here instead of stdout")
+    args = parser.parse_args()
+
+    plan = build_plan(read_manifest(Path(args.previous)), read_manifest(Path(args.current)))
+    rendered = json.dumps(plan, ensure_ascii=False, indent=2) + "\n"
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(rendered, encoding="utf-8")
+    else:
+        print(rendered, end="")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Write events.offsets.json, mapping each event id to its byte span inside events.json.
+
+A consumer that needs a few events can mmap events.json and decode only
+their records with ``load_event`` instead of parsing the whole catalog.
+Ids that occur more than once are listed under ``duplicates`` with every
+span and are left out of ``offsets``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import sys
+from pathlib import Path
+from typing import Any
+
+if __package__ in {None, ""}:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.snapshot_context import SnapshotContext  # noqa: E402
+
+SCHEMA_VERSION = "cast-event.event-offsets.v1"
+OFFSETS_PATH = "events.offsets.json"
+
+
+def build_offsets(context: SnapshotContext) -> dict[str, Any]:
+    spans: dict[str, list[list[int]]] = {}
+    count = 0
+    unidentified = 0
+    for offset, length, event in context.iter_spans("events.json"):
+        count += 1
+        identifier = event.get("id") if isinstance(event, dict) else None
+        if not isinstance(identifier, str) or not identifier.strip():
+            unidentified += 1
+            continue
+        spans.setdefault(identifier, []).append([offset, length])
+    duplicates = {identifier: found for identifier, found in spans.items() if len(found) > 1}
+    size, digest = context.digest("events.json")
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "events_sha256": digest,
+        "events_bytes": size,
+        "count": count,
+        "unidentified": unidentified,
+        "duplicate_id_status": "duplicated" if duplicates else "unique",
+        "duplicates": duplicates,
+        "offsets": {identifier: found[0] for identifier, found in spans.items() if len(found) == 1},
+    }
+
+
+def render(payload: dict[str, Any]) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def load_event(events_path: Path, offsets: dict[str, Any], identifier: str) -> dict[str, Any] | None:
+    """Decode one event from a memory-mapped events.json; None when the id is not indexed uniquely."""
+    span = offsets["offsets"].get(identifier)
+    if span is None:
+        return None
+    offset, length = span
+    with events_path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        if len(buffer) != offsets["events_bytes"]:
+            raise ValueError(f"{OFFSETS_PATH} was built from a different events.json")
+        return json.loads(buffer[offset:offset + length])
+
+
+def verify_offsets(context: SnapshotContext) -> int:
+    """Fail unless events.offsets.json is exactly what the deployed events.json produces."""
+    deployed = context.json(OFFSETS_PATH)
+    if not isinstance(deployed, dict):
+        raise ValueError(f"{OFFSETS_PATH} must contain an object")
+    if deployed.get("events_sha256") != context.digest("events.json")[1]:
+        raise ValueError(f"{OFFSETS_PATH} was built from a different events.json")
+    expected = build_offsets(context)
+    if deployed != expected:
+        differing = sorted(key for key in expected.keys() | deployed.keys() if deployed.get(key) != expected.get(key))
+        raise ValueError(f"{OFFSETS_PATH} is inconsistent with events.json: {', '.join(differing)}")
+    return expected["count"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--root", default=".")
+    parser.add_argument("--output", help=f"defaults to <root>/{OFFSETS_PATH}")
+    args = parser.parse_args()
+    root = Path(args.root)
+    offsets = build_offsets(SnapshotContext(root))
+    output = Path(args.output) if args.output else root / OFFSETS_PATH
+    output.write_text(render(offsets), encoding="utf-8")
+    print(json.dumps({
+        "count": offsets["count"],
+        "duplicate_id_status": offsets["duplicate_id_status"],
+        "unidentified": offsets["unidentified"],
+    }, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
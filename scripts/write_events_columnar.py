@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Write events.columnar.json, a column-oriented, string-interned encoding of events.json.
+
+Layout (``cast-event.events-columnar.v1``):
+
+- ``strings``: every string in the payload once, most frequent first.
+- ``header``: the top-level members of events.json other than ``events``,
+  with ``events_position`` recording where ``events`` sat among them.
+- ``column_names`` / ``columns``: one array per top-level event key, one
+  slot per event (``null`` where the event lacks the key).
+- ``record_shapes`` / ``record_shape``: each event's key order as column
+  positions, and which of those shapes every event uses.
+- ``shapes``: key lists (string indices) for nested objects.
+
+Values are encoded recursively: a string is its integer index in
+``strings``; ``null``/``true``/``false`` stay literal; a number is
+``[2, value]``; a list is ``[0, *items]``; an object is
+``[1, shape, *values]``. Decoding reproduces events.json exactly, key
+order included.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+if __package__ in {None, ""}:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.snapshot_context import SnapshotContext  # noqa: E402
+
+SCHEMA_VERSION = "cast-event.events-columnar.v1"
+COLUMNAR_PATH = "events.columnar.json"
+LIST, OBJECT, NUMBER = 0, 1, 2
+
+
+def count_strings(value: Any, counts: Counter[str]) -> None:
+    if isinstance(value, str):
+        counts[value] += 1
+    elif isinstance(value, list):
+        for item in value:
+            count_strings(item, counts)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            counts[key] += 1
+            count_strings(item, counts)
+
+
+class Encoder:
+    def __init__(self, strings: list[str]) -> None:
+        self.string_ids = {value: index for index, value in enumerate(strings)}
+        self.shapes: list[list[int]] = []
+        self.shape_ids: dict[tuple[str, ...], int] = {}
+
+    def shape(self, keys: tuple[str, ...]) -> int:
+        if keys not in self.shape_ids:
+            self.shape_ids[keys] = len(self.shapes)
+            self.shapes.append([self.string_ids[key] for key in keys])
+        return self.shape_ids[keys]
+
+    def encode(self, value: Any) -> Any:
+        if isinstance(value, str):
+            return self.string_ids[value]
+        if value is None or isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)):
+            return [NUMBER, value]
+        if isinstance(value, list):
+            return [LIST, *map(self.encode, value)]
+        if isinstance(value, dict):
+            return [OBJECT, self.shape(tuple(value)), *map(self.encode, value.values())]
+        raise ValueError(f"unsupported JSON value: {type(value).__name__}")
+
+
+def encode_events(payload: Any, events_sha256: str) -> dict[str, Any]:
+    if not isinstance(payload, dict) or not isinstance(payload.get("events"), list):
+        raise ValueError("events.json must be an object with an events list")
+    events = payload["events"]
+    if not all(isinstance(event, dict) for event in events):
+        raise ValueError("events.json contains a non-object event")
+    header = {key: value for key, value in payload.items() if key != "events"}
+
+    counts: Counter[str] = Counter()
+    count_strings(events, counts)
+    # Counter keeps first-seen order for ties, so the table is deterministic.
+    strings = [value for value, _ in counts.most_common()]
+    encoder = Encoder(strings)
+
+    column_names: list[str] = []
+    positions: dict[str, int] = {}
+    for event in events:
+        for key in event:
+            if key not in positions:
+                positions[key] = len(column_names)
+                column_names.append(key)
+    columns: list[list[Any]] = [[None] * len(events) for _ in column_names]
+    record_shapes: list[list[int]] = []
+    record_shape_ids: dict[tuple[int, ...], int] = {}
+    record_shape = []
+    for row, event in enumerate(events):
+        layout = tuple(positions[key] for key in event)
+        if layout not in record_shape_ids:
+            record_shape_ids[layout] = len(record_shapes)
+            record_shapes.append(list(layout))
+        record_shape.append(record_shape_ids[layout])
+        for key, value in event.items():
+            columns[positions[key]][row] = encoder.encode(value)
+
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "events_sha256": events_sha256,
+        "count": len(events),
+        "header": header,
+        "events_position": list(payload).index("events"),
+        "strings": strings,
+        "shapes": encoder.shapes,
+        "column_names": column_names,
+        "record_shapes": record_shapes,
+        "record_shape": record_shape,
+        "columns": columns,
+    }
+
+
+def decode_events(compact: dict[str, Any]) -> dict[str, Any]:
+    """Rebuild the events.json payload from its columnar encoding."""
+    if compact.get("schema_version") != SCHEMA_VERSION:
+        raise ValueError(f"{COLUMNAR_PATH}: unsupported schema")
+    strings = compact["strings"]
+    shapes = [[strings[key] for key in shape] for shape in compact["shapes"]]
+
+    def decode(value: Any) -> Any:
+        if value is None or isinstance(value, bool):
+            return value
+        if isinstance(value, int):
+            return strings[value]
+        tag = value[0]
+        if tag == NUMBER:
+            return value[1]
+        if tag == LIST:
+            return [decode(item) for item in value[1:]]
+        if tag == OBJECT:
+            return dict(zip(shapes[value[1]], map(decode, value[2:])))
+        raise ValueError(f"{COLUMNAR_PATH}: unknown value tag {tag!r}")
+
+    names = compact["column_names"]
+    columns = compact["columns"]
+    layouts = compact["record_shapes"]
+    events = [
+        {names[column]: decode(columns[column][row]) for column in layouts[shape]}
+        for row, shape in enumerate(compact["record_shape"])
+    ]
+    members = list(compact["header"].items())
+    members.insert(compact["events_position"], ("events", events))
+    return dict(members)
+
+
+def render(compact: dict[str, Any]) -> str:
+    return json.dumps(compact, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def canonical(payload: Any) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def verify_columnar(context: SnapshotContext) -> int:
+    """Fail unless events.columnar.json decodes back to exactly the deployed events.json."""
+    compact = context.json(COLUMNAR_PATH)
+    if not isinstance(compact, dict):
+        raise ValueError(f"{COLUMNAR_PATH} must contain an object")
+    if compact.get("events_sha256") != context.digest("events.json")[1]:
+        raise ValueError(f"{COLUMNAR_PATH} was built from a different events.json")
+    try:
+        decoded = decode_events(compact)
+    except (KeyError, IndexError, TypeError) as exc:
+        raise ValueError(f"{COLUMNAR_PATH} is malformed: {exc!r}") from exc
+    if canonical(decoded) != canonical(context.json("events.json")):
+        raise ValueError(f"{COLUMNAR_PATH} does not round-trip to events.json")
+    return compact["count"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--root", default=".")
+    parser.add_argument("--output", help=f"defaults to <root>/{COLUMNAR_PATH}")
+    args = parser.parse_args()
+    root = Path(args.root)
+    context = SnapshotContext(root)
+    rendered = render(encode_events(context.json("events.json"), context.digest("events.json")[1]))
+    output = Path(args.output) if args.output else root / COLUMNAR_PATH
+    output.write_text(rendered, encoding="utf-8")
+    print(json.dumps({"bytes": len(rendered.encode("utf-8")), "source_bytes": context.digest("events.json")[0]}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Compile validated APPROVED sponsorships into the small schedule the featured-tonight widget reads."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+if __package__ in {None, ""}:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.common import parse_datetime  # noqa: E402
+from scripts.snapshot_context import SnapshotContext  # noqa: E402
+from scripts.verify_sponsorships import event_id, event_records, validate_with_index  # noqa: E402
+
+SCHEMA_VERSION = "featured-tonight.schedule.v1"
+SCHEDULE_PATH = "tonight/featured-tonight-schedule.json"
+# Fallback orders mirror the field pickers in tonight/featured-tonight.js.
+TITLE_FIELDS = ("title", "name", "event_name")
+HOST_FIELDS = ("organizer", "host", "group_name", "author", "account_name")
+METHOD_FIELDS = ("participation_method", "join_method", "how_to_join", "participation")
+START_FIELDS = ("start_at", "start_time", "start", "datetime", "event_start", "starts_at", "date")
+
+
+def iso(value: datetime) -> str:
+    return value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def pick(event: dict, fields: tuple[str, ...]) -> str | None:
+    for key in fields:
+        value = event.get(key)
+        if value is not None and value != "":
+            return str(value)
+    return None
+
+
+def compile_schedule(
+    sponsorships: object, events_payload: object, *, now: datetime | None, digests: dict[str, str]
+) -> dict[str, Any]:
+    """Return the APPROVED activation windows sorted by start, with the event fields already resolved.
+
+    ``now`` enforces the expiry policy while writing; ``None`` skips it.
+    """
+    _, index = validate_with_index(sponsorships, events_payload, now=now)
+    events = {event_id(event): event for event in event_records(events_payload)}
+    campaigns = sponsorships["campaigns"]  # type: ignore[index]
+    windows = []
+    for starts_at, ends_at, pos, campaign_id, eid in index.intervals:
+        event = events[eid]
+        windows.append({
+            "campaign_id": campaign_id,
+            "event_id": eid,
+            "starts_at": iso(starts_at),
+            "ends_at": iso(ends_at),
+            "destination_url": campaigns[pos]["destination_url"],
+            "title": pick(event, TITLE_FIELDS),
+            "organizer": pick(event, HOST_FIELDS),
+            "participation": pick(event, METHOD_FIELDS),
+            "event_starts_at": pick(event, START_FIELDS),
+        })
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "sponsorships_sha256": digests["sponsorships.json"],
+        "events_sha256": digests["events.json"],
+        "windows": windows,
+    }
+
+
+def schedule_for(context: SnapshotContext, *, now: datetime | None) -> dict[str, Any]:
+    digests = {name: context.digest(name)[1] for name in ("sponsorships.json", "events.json")}
+    return compile_schedule(
+        context.json("sponsorships.json"), context.json("events.json"), now=now, digests=digests
+    )
+
+
+def render(schedule: dict[str, Any]) -> str:
+    return json.dumps(schedule, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def verify_schedule(context: SnapshotContext) -> int:
+    """Fail unless the deployed schedule is exactly what the current manifests compile to.
+
+    The check does not depend on the clock: expired campaigns are the
+    sponsorships stage's concern, not a sign of a stale schedule.
+    """
+    deployed = context.root / SCHEDULE_PATH
+    try:
+        current = json.loads(deployed.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as exc:
+        raise ValueError(f"{SCHEDULE_PATH} is unreadable: {exc}") from exc
+    if not isinstance(current, dict) or any(
+        current.get(f"{name.removesuffix('.json')}_sha256") != context.digest(name)[1]
+        for name in ("sponsorships.json", "events.json")
+    ):
+        raise ValueError(f"{SCHEDULE_PATH} is stale for the deployed sponsorships.json/events.json")
+    expected = schedule_for(context, now=None)
+    if current != expected:
+        raise ValueError(f"{SCHEDULE_PATH} is stale for the deployed sponsorships.json/events.json")
+    return len(expected["windows"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--root", default=".")
+    parser.add_argument("--output", help=f"defaults to <root>/{SCHEDULE_PATH}")
+    parser.add_argument("--now", help="ISO 8601 validation time; defaults to current UTC")
+    args = parser.parse_args()
+
+    now = parse_datetime(args.now, "--now") if args.now else datetime.now(timezone.utc)
+    root = Path(args.root)
+    schedule = schedule_for(SnapshotContext(root), now=now)
+    output = Path(args.output) if args.output else root / SCHEDULE_PATH
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(render(schedule), encoding="utf-8")
+    print(json.dumps({"windows": len(schedule["windows"]), "bytes": output.stat().st_size}, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
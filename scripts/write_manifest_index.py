@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Write the binary-searchable sidecar of a projection manifest's asset table.
+
+Layout (``CEMIDX03``, all integers big-endian):
+
+- header: magic, record count, record size, and the manifest's
+  ``source_snapshot_sha256`` as 32 raw bytes.
+- records: one fixed-width record per asset, sorted by the UTF-8 bytes of
+  its path: path offset and length into the string table, byte size, and
+  the raw sha256 digest.
+- string table: every path's UTF-8 bytes, concatenated in record order.
+
+The JSON manifest remains the contract; the sidecar only makes single-path
+lookups and full iteration cheap on a memory-mapped file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import struct
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+MAGIC = b"CEMIDX03"
+HEADER = struct.Struct(">8sII32s")
+RECORD = struct.Struct(">IIQ32s")
+INDEX_SUFFIX = ".idx"
+
+
+def index_path(manifest_path: Path) -> Path:
+    """Return where the sidecar of ``manifest_path`` lives, e.g. projection-manifest.idx."""
+    return manifest_path.with_suffix(INDEX_SUFFIX)
+
+
+def build_index(manifest: dict[str, Any]) -> bytes:
+    assets = manifest["assets"]
+    entries = sorted((name.encode("utf-8"), metadata) for name, metadata in assets.items())
+    records = bytearray()
+    strings = bytearray()
+    for encoded, metadata in entries:
+        records += RECORD.pack(len(strings), len(encoded), metadata["bytes"], bytes.fromhex(metadata["sha256"]))
+        strings += encoded
+    header = HEADER.pack(MAGIC, len(entries), RECORD.size, bytes.fromhex(manifest["source_snapshot_sha256"]))
+    return header + bytes(records) + bytes(strings)
+
+
+class ManifestIndex:
+    """A memory-mapped manifest sidecar: binary-search lookups and zero-copy iteration."""
+
+    def __init__(self, path: Path) -> None:
+        with path.open("rb") as handle:
+            self.buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.buffer)
+        if len(self.buffer) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path.name}: truncated header")
+        magic, self.count, record_size, snapshot = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"{path.name}: not a {MAGIC.decode('ascii')} manifest index")
+        self.source_snapshot_sha256 = snapshot.hex()
+        self.strings_offset = HEADER.size + self.count * RECORD.size
+        if self.strings_offset > len(self.buffer):
+            self.close()
+            raise ValueError(f"{path.name}: truncated records")
+
+    def __enter__(self) -> ManifestIndex:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.view.release()
+        self.buffer.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def record(self, position: int) -> tuple[memoryview, int, bytes]:
+        """Return (path bytes, size, raw sha256) of the ``position``-th record."""
+        offset, length, size, digest = RECORD.unpack_from(self.buffer, HEADER.size + position * RECORD.size)
+        start = self.strings_offset + offset
+        if start + length > len(self.buffer):
+            raise ValueError(f"manifest index record {position} points past the string table")
+        return self.view[start:start + length], size, digest
+
+    def lookup(self, name: str) -> dict[str, Any] | None:
+        """Return ``{"bytes", "sha256"}`` for ``name`` by binary search, or None."""
+        key = name.encode("utf-8")
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            path, size, digest = self.record(middle)
+            if path == key:
+                return {"bytes": size, "sha256": digest.hex()}
+            if path.tobytes() < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def __iter__(self) -> Iterator[tuple[memoryview, int, bytes]]:
+        """Yield every record in path order; release the path views before closing the index."""
+        for position in range(self.count):
+            yield self.record(position)
+
+
+def verify_index(path: Path, manifest: dict[str, Any]) -> int:
+    """Fail unless the sidecar at ``path`` lists exactly the manifest's assets, sorted and unique."""
+    assets = manifest["assets"]
+    with ManifestIndex(path) as index:
+        if index.source_snapshot_sha256 != manifest.get("source_snapshot_sha256"):
+            raise ValueError(f"{path.name} was built from a different manifest")
+        if len(index) != len(assets):
+            raise ValueError(f"{path.name} lists {len(index)} assets, manifest lists {len(assets)}")
+        previous = b""
+        for position, (encoded, size, digest) in enumerate(index):
+            key = encoded.tobytes()
+            encoded.release()
+            if position and key <= previous:
+                raise ValueError(f"{path.name} records are not strictly sorted at {position}")
+            previous = key
+            expected = assets.get(key.decode("utf-8"))
+            if expected is None or expected["bytes"] != size or expected["sha256"] != digest.hex():
+                raise ValueError(f"{path.name} disagrees with the manifest for {key.decode('utf-8')}")
+        return len(index)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--manifest", default="projection-manifest.json")
+    parser.add_argument("--output", help="defaults to the manifest path with an .idx suffix")
+    parser.add_argument("--lookup", help="print one asset's entry from an existing index instead of writing")
+    args = parser.parse_args()
+    manifest_path = Path(args.manifest)
+    output = Path(args.output) if args.output else index_path(manifest_path)
+    if args.lookup:
+        with ManifestIndex(output) as index:
+            print(json.dumps(index.lookup(args.lookup), sort_keys=True))
+        return
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    payload = build_index(manifest)
+    output.write_bytes(payload)
+    print(json.dumps({"assets": len(manifest["assets"]), "bytes": len(payload)}, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Maintain the repository KPIs of docs/canonical-flow.md incrementally from append-only logs.
+
+Each run reads only the bytes appended to accepted-event-kpi.jsonl (and an
+optional verification log of verify_http_deploy reports) since the offsets
+persisted in ``--state``, folds the new records and any given manifests into
+fixed-size rolling windows, and prints the KPI summary.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+if __package__ in {None, ""}:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.common import parse_datetime  # noqa: E402
+
+STATE_SCHEMA_VERSION = "cast-event.projection-kpi-state.v1"
+SUMMARY_SCHEMA_VERSION = "cast-event.projection-kpi.v1"
+KPI_LOG = "accepted-event-kpi.jsonl"
+DEFAULT_WINDOW = 30
+
+
+def empty_state(window: int) -> dict[str, Any]:
+    return {
+        "schema_version": STATE_SCHEMA_VERSION,
+        "window": window,
+        "cursors": {},
+        "snapshots_received": 0,
+        # [generated_at, accepted_event_cumulative, delta] per snapshot, newest last.
+        "snapshots": [],
+        "validated": [],
+        "manifests_seen": [],
+        # [deployed_at, seconds] per validated projection, newest last.
+        "freshness": [],
+        "verifications": [],
+    }
+
+
+def load_state(path: Path, window: int) -> dict[str, Any]:
+    if not path.is_file():
+        return empty_state(window)
+    state = json.loads(path.read_text(encoding="utf-8"))
+    if state.get("schema_version") != STATE_SCHEMA_VERSION or state.get("window") != window:
+        return empty_state(window)
+    return state
+
+
+def read_tail(path: Path, cursor: dict[str, int] | None) -> tuple[list[Any], dict[str, int], bool]:
+    """Return the JSON lines appended since ``cursor``, the new cursor, and whether the log restarted.
+
+    A log that shrank or was replaced (new inode) is read again from the
+    start. A trailing line without its newline is left for the next run.
+    """
+    with path.open("rb") as handle:
+        status = os.fstat(handle.fileno())
+        offset = (cursor or {}).get("offset", 0)
+        restarted = cursor is not None and (cursor.get("inode") != status.st_ino or status.st_size < offset)
+        if restarted:
+            offset = 0
+        handle.seek(offset)
+        chunk = handle.read(status.st_size - offset)
+    complete = chunk[: chunk.rfind(b"\n") + 1]
+    records = []
+    for number, line in enumerate(complete.splitlines(), 1):
+        if line.strip():
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"{path.name}: invalid JSON in line {number} after byte {offset}") from exc
+    return records, {"offset": offset + len(complete), "inode": status.st_ino}, restarted
+
+
+def ingest_snapshots(state: dict[str, Any], records: Iterable[Any]) -> None:
+    window = state["window"]
+    for record in records:
+        if not isinstance(record, dict) or not isinstance(record.get("generated_at"), str):
+            raise ValueError(f"{KPI_LOG}: record without generated_at")
+        state["snapshots_received"] += 1
+        state["snapshots"].append(
+            [record["generated_at"], record.get("accepted_event_cumulative"), record.get("delta")]
+        )
+    del state["snapshots"][:-window]
+
+
+def ingest_manifest(state: dict[str, Any], manifest: dict[str, Any]) -> bool:
+    """Fold one projection manifest in; return False when it was already counted."""
+    key = f"{manifest.get('source_snapshot_sha256')}@{manifest.get('deployed_at')}"
+    if key in state["manifests_seen"]:
+        return False
+    state["manifests_seen"] = [*state["manifests_seen"], key][-state["window"]:]
+    if manifest.get("validation_status") != "validated":
+        return True
+    generated = manifest.get("source_snapshot_generated_at")
+    deployed = manifest.get("deployed_at")
+    if generated is None or deployed is None:
+        return True
+    elapsed = parse_datetime(deployed, "deployed_at") - parse_datetime(generated, "source_snapshot_generated_at")
+    state["freshness"] = [*state["freshness"], [deployed, elapsed.total_seconds()]][-state["window"]:]
+    if generated not in state["validated"]:
+        state["validated"] = [*state["validated"], generated][-state["window"] * 2:]
+    return True
+
+
+def ingest_verifications(state: dict[str, Any], records: Iterable[Any]) -> None:
+    for record in records:
+        if not isinstance(record, dict) or "status" not in record:
+            raise ValueError("verification log: record without status")
+        state["verifications"].append(record["status"] == "ok")
+    del state["verifications"][:-state["window"]]
+
+
+def percentile(values: list[float], fraction: float) -> float | None:
+    """Nearest-rank percentile; None when there are no samples."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def rate(numerator: int, denominator: int) -> float | None:
+    return round(numerator / denominator, 6) if denominator else None
+
+
+def summarize(state: dict[str, Any]) -> dict[str, Any]:
+    """Return the three repository KPIs over the rolling window; unavailable ones stay None."""
+    snapshots = state["snapshots"]
+    validated = set(state["validated"])
+    freshness = [seconds for _, seconds in state["freshness"]]
+    verifications = state["verifications"]
+    latest = snapshots[-1] if snapshots else None
+    return {
+        "schema_version": SUMMARY_SCHEMA_VERSION,
+        "window": state["window"],
+        "snapshots_received": state["snapshots_received"],
+        "latest_snapshot_generated_at": latest[0] if latest else None,
+        "accepted_event_cumulative": latest[1] if latest else None,
+        "accepted_event_delta_in_window": sum(delta for _, _, delta in snapshots if isinstance(delta, int)),
+        # No validation result recorded yet means the rate is unavailable, not zero.
+        "canonical_snapshot_acceptance_rate": rate(
+            sum(1 for generated_at, _, _ in snapshots if generated_at in validated), len(snapshots)
+        ) if state["manifests_seen"] else None,
+        "projection_freshness": {
+            "samples": len(freshness),
+            "p50_seconds": percentile(freshness, 0.50),
+            "p95_seconds": percentile(freshness, 0.95),
+        },
+        "public_verification_success_rate": rate(sum(verifications), len(verifications)),
+    }
+
+
+def update(
+    state: dict[str, Any],
+    kpi_log: Path,
+    manifests: Iterable[dict[str, Any]] = (),
+    verification_log: Path | None = None,
+) -> dict[str, int]:
+    """Fold everything new into ``state``; return how many records each source contributed."""
+    read: dict[str, int] = {}
+    records, state["cursors"]["kpi"], restarted = read_tail(kpi_log, state["cursors"].get("kpi"))
+    if restarted:
+        state["snapshots"], state["snapshots_received"] = [], 0
+    ingest_snapshots(state, records)
+    read["snapshots"] = len(records)
+    read["manifests"] = sum(ingest_manifest(state, manifest) for manifest in manifests)
+    if verification_log is not None and verification_log.is_file():
+        records, state["cursors"]["verification"], restarted = read_tail(
+            verification_log, state["cursors"].get("verification")
+        )
+        if restarted:
+            state["verifications"] = []
+        ingest_verifications(state, records)
+        read["verifications"] = len(records)
+    return read
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--root", default=".")
+    parser.add_argument("--state", required=True, help="JSON file holding log offsets and the rolling windows")
+    parser.add_argument("--manifest", action="append", default=[], help="projection manifest to fold in; repeatable")
+    parser.add_argument("--verification-log", help="JSONL of verify_http_deploy reports, one per attempt")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="snapshots per rolling window")
+    parser.add_argument("--output", help="also write the summary here, e.g. metrics/projection-kpi.json")
+    args = parser.parse_args()
+    if args.window < 1:
+        raise ValueError("window must be at least 1")
+
+    state_path = Path(args.state)
+    state = load_state(state_path, args.window)
+    manifests = [json.loads(Path(path).read_text(encoding="utf-8")) for path in args.manifest]
+    read = update(
+        state,
+        Path(args.root) / KPI_LOG,
+        manifests,
+        Path(args.verification_log) if args.verification_log else None,
+    )
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    state_path.write_text(json.dumps(state, separators=(",", ":")) + "\n", encoding="utf-8")
+    summary = summarize(state)
+    if args.output:
+        Path(args.output).write_text(json.dumps(summary, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    print(json.dumps({**summary, "records_read": read}, ensure_ascii=False, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,16 +6,37 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
+if __package__ in {None, ""}:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.common import DEFAULT_JOBS  # noqa: E402
+from scripts.profiling import add_profile_arguments, note, phase, profile_run  # noqa: E402
+from scripts.projection_digest import merkle_summary, snapshot_digest  # noqa: E402
+from scripts.snapshot_context import SHARED_ARTIFACTS, SnapshotContext  # noqa: E402
+from scripts.write_manifest_index import build_index, index_path  # noqa: E402
+
 SCHEMA_VERSION = "cast-event.projection-manifest.v2"
+STAT_CACHE_SCHEMA_VERSION = "cast-event.projection-stat-cache.v1"
 SOURCE_REPOSITORY = "KAFKA2306/cast_event_cal"
 
 
 def sha256(path: Path) -> str:
-    return hashlib.sha256(path.read_bytes()).hexdigest()
+    return hash_file(path)[1]
+
+
+def hash_file(path: Path) -> tuple[int, str]:
+    """Stream one file into SHA-256 and return its size from the same open handle."""
+    with path.open("rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        return size, hashlib.file_digest(handle, "sha256").hexdigest()
 
 
 def utc_now() -> str:
@@ -29,49 +50,171 @@ def read_json(path: Path) -> dict[str, Any]:
     return payload
 
 
-def canonical_assets(canonical_root: Path) -> dict[str, dict[str, Any]]:
+def file_stat(status: os.stat_result) -> list[int]:
+    return [status.st_size, status.st_mtime_ns, status.st_ino]
+
+
+def collect_assets(
+    canonical_root: Path,
+    jobs: int = DEFAULT_JOBS,
+    *,
+    previous_manifest: dict[str, Any] | None = None,
+    stat_cache: dict[str, Any] | None = None,
+    context: SnapshotContext | None = None,
+) -> tuple[dict[str, dict[str, Any]], dict[str, list[int]], dict[str, int]]:
+    """Hash the snapshot, reusing previous digests for files whose stat is unchanged.
+
+    A digest is only reused when the stat cache was written for the same
+    ``source_snapshot_sha256`` as ``previous_manifest`` and both the recorded
+    (size, mtime_ns, inode) and the manifest byte count still match. Shared
+    artifacts already loaded by ``context`` are hashed from those bytes.
+    """
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+    paths = sorted(p for p in canonical_root.rglob("*") if p.is_file())
+    names = [path.relative_to(canonical_root).as_posix() for path in paths]
+    statuses = [path.stat() for path in paths]
+    stats = [file_stat(status) for status in statuses]
+
+    previous_assets: dict[str, Any] = {}
+    cached_stats: dict[str, Any] = {}
+    if (
+        previous_manifest is not None
+        and stat_cache is not None
+        and stat_cache.get("schema_version") == STAT_CACHE_SCHEMA_VERSION
+        and stat_cache.get("source_snapshot_sha256") == previous_manifest.get("source_snapshot_sha256")
+    ):
+        previous_assets = previous_manifest.get("assets") or {}
+        cached_stats = stat_cache.get("files") or {}
+
+    reused: dict[str, dict[str, Any]] = {}
+    for name, current in zip(names, stats):
+        previous = previous_assets.get(name)
+        if (
+            isinstance(previous, dict)
+            and cached_stats.get(name) == current
+            and previous.get("bytes") == current[0]
+            and isinstance(previous.get("sha256"), str)
+        ):
+            reused[name] = {"bytes": previous["bytes"], "sha256": previous["sha256"]}
+
+    def digest(path: Path) -> tuple[int, str]:
+        name = path.relative_to(canonical_root).as_posix()
+        if context is not None and name in SHARED_ARTIFACTS:
+            return context.digest(name)
+        return hash_file(path)
+
+    # Hardlinked copies share (st_dev, st_ino), so each blob is hashed once.
+    blobs: dict[tuple[int, int], Path] = {}
+    for path, name, status in zip(paths, names, statuses):
+        if name not in reused:
+            blobs.setdefault((status.st_dev, status.st_ino), path)
+    pending = list(blobs.values())
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        hashed = dict(zip(pending, pool.map(digest, pending)))
     assets: dict[str, dict[str, Any]] = {}
-    for path in sorted(p for p in canonical_root.rglob("*") if p.is_file()):
-        relative = path.relative_to(canonical_root).as_posix()
-        assets[relative] = {"bytes": path.stat().st_size, "sha256": sha256(path)}
+    for name, status in zip(names, statuses):
+        if name in reused:
+            assets[name] = reused[name]
+        else:
+            size, digest = hashed[blobs[status.st_dev, status.st_ino]]
+            assets[name] = {"bytes": size, "sha256": digest}
     if not assets:
         raise ValueError("canonical snapshot contains no files")
-    return assets
+    counts = {"reused": len(reused), "rehashed": len(pending)}
+    return assets, dict(zip(names, stats)), counts
+
+
+def content_groups(assets: dict[str, dict[str, Any]]) -> list[list[str]]:
+    """Group asset names whose bytes are identical; only groups of two or more are returned."""
+    groups: dict[tuple[int, str], list[str]] = {}
+    for name, entry in assets.items():
+        groups.setdefault((entry["bytes"], entry["sha256"]), []).append(name)
+    return sorted(sorted(names) for names in groups.values() if len(names) > 1)
 
 
-def snapshot_digest(assets: dict[str, dict[str, Any]]) -> str:
-    digest = hashlib.sha256()
-    for name, metadata in sorted(assets.items()):
-        digest.update(name.encode("utf-8"))
-        digest.update(b"\0")
-        digest.update(str(metadata["bytes"]).encode("ascii"))
-        digest.update(b"\0")
-        digest.update(metadata["sha256"].encode("ascii"))
-        digest.update(b"\n")
-    return digest.hexdigest()
+def blob_path(blob_dir: Path, digest: str) -> Path:
+    return blob_dir / digest[:2] / digest
 
 
-def build_manifest(canonical_root: Path, source_commit: str, timestamp: str | None = None) -> dict[str, Any]:
+def write_blob_store(canonical_root: Path, assets: dict[str, dict[str, Any]], blob_dir: Path) -> dict[str, int]:
+    """Copy each distinct asset once into ``blob_dir``, named by its SHA-256, and report what was saved.
+
+    The canonical tree is only read: later writers rewrite its files in
+    place, so linking copies together there would let one write change
+    them all. Blobs already in the store are left alone.
+    """
+    if blob_dir.resolve().is_relative_to(canonical_root.resolve()):
+        raise ValueError("blob directory must be outside the canonical root")
+    first: dict[str, str] = {}
+    for name, entry in sorted(assets.items()):
+        first.setdefault(entry["sha256"], name)
+    written = 0
+    for digest, name in first.items():
+        target = blob_path(blob_dir, digest)
+        if target.is_file():
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temporary = target.with_name(f".{digest}.tmp")
+        shutil.copyfile(canonical_root / name, temporary)
+        os.replace(temporary, target)
+        written += 1
+    total = sum(entry["bytes"] for entry in assets.values())
+    unique = sum(assets[name]["bytes"] for name in first.values())
+    return {
+        "groups": len(content_groups(assets)),
+        "blobs": len(first),
+        "written": written,
+        "bytes_saved": total - unique,
+    }
+
+
+def canonical_assets(
+    canonical_root: Path, jobs: int = DEFAULT_JOBS, context: SnapshotContext | None = None
+) -> dict[str, dict[str, Any]]:
+    return collect_assets(canonical_root, jobs, context=context)[0]
+
+
+def build_stat_cache(manifest: dict[str, Any], stats: dict[str, list[int]]) -> dict[str, Any]:
+    return {
+        "schema_version": STAT_CACHE_SCHEMA_VERSION,
+        "source_snapshot_sha256": manifest["source_snapshot_sha256"],
+        "files": stats,
+    }
+
+
+def build_manifest(
+    canonical_root: Path,
+    source_commit: str,
+    timestamp: str | None = None,
+    *,
+    jobs: int = DEFAULT_JOBS,
+    assets: dict[str, dict[str, Any]] | None = None,
+    context: SnapshotContext | None = None,
+) -> dict[str, Any]:
     if len(source_commit) != 40 or any(ch not in "0123456789abcdef" for ch in source_commit.lower()):
         raise ValueError("source_commit must be a 40-character git SHA")
 
-    events = read_json(canonical_root / "events.json")
-    health = read_json(canonical_root / "health.json")
-    ontology = read_json(canonical_root / "event-ontology.json")
-    rows = events.get("events", [])
-    if not isinstance(rows, list):
+    context = context or SnapshotContext(canonical_root)
+    events, event_count = context.summary("events.json")
+    if events is None:
+        raise ValueError("events.json must contain an object")
+    health = context.object("health.json")
+    ontology = context.object("event-ontology.json")
+    if event_count is None:
         raise ValueError("events.json has no event list")
-    if events.get("count") != len(rows):
+    if events.get("count") != event_count:
         raise ValueError("events.json count does not match event list")
     if health.get("status") != "ok" or health.get("failed_sources") != 0:
         raise ValueError("canonical health must be ok with zero failed sources")
-    if health.get("event_count") != len(rows):
+    if health.get("event_count") != event_count:
         raise ValueError("health event count does not match events.json")
 
-    assets = canonical_assets(canonical_root)
+    if assets is None:
+        assets = canonical_assets(canonical_root, jobs=jobs, context=context)
     created = timestamp or utc_now()
     collection_counts = {
-        "event_count": len(rows),
+        "event_count": event_count,
         "enabled_sources": health.get("enabled_sources"),
         "successful_sources": health.get("successful_sources"),
         "failed_sources": health.get("failed_sources"),
@@ -85,12 +228,13 @@ def build_manifest(canonical_root: Path, source_commit: str, timestamp: str | No
         "source_repository": SOURCE_REPOSITORY,
         "source_commit_sha": source_commit.lower(),
         "source_snapshot_sha256": snapshot_digest(assets),
+        "source_snapshot_merkle": merkle_summary(assets),
         "source_snapshot_generated_at": events.get("generated_at"),
         "generated_at": created,
         "received_at": created,
         "deployed_at": created,
         "collection_counts": collection_counts,
-        "event_count": len(rows),
+        "event_count": event_count,
         "ontology_version": ontology.get("schema_version"),
         "validation_status": "validated",
         "assets": assets,
@@ -108,12 +252,58 @@ def main() -> None:
     parser.add_argument("--canonical-root", required=True)
     parser.add_argument("--source-commit", required=True)
     parser.add_argument("--output", required=True)
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="parallel hashing workers")
+    parser.add_argument("--previous-manifest", help="projection-manifest.json to reuse digests from")
+    parser.add_argument("--stat-cache", help="sidecar stat cache read before and rewritten after the build")
+    parser.add_argument(
+        "--dedupe",
+        metavar="BLOB_DIR",
+        help="copy each distinct file once into this content-addressed directory and record content groups",
+    )
+    parser.add_argument("--index", action="store_true", help="also write the binary-searchable .idx sidecar")
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    manifest = build_manifest(Path(args.canonical_root), args.source_commit)
-    output = Path(args.output)
-    output.parent.mkdir(parents=True, exist_ok=True)
-    output.write_text(json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    with profile_run("write_projection_manifest", args):
+        canonical_root = Path(args.canonical_root)
+        previous_manifest = None
+        stat_cache = None
+        if args.previous_manifest and Path(args.previous_manifest).is_file():
+            previous_manifest = read_json(Path(args.previous_manifest))
+        if args.stat_cache and Path(args.stat_cache).is_file():
+            stat_cache = read_json(Path(args.stat_cache))
+        context = SnapshotContext(canonical_root)
+        with phase("hash_assets"):
+            assets, stats, counts = collect_assets(
+                canonical_root, args.jobs, previous_manifest=previous_manifest, stat_cache=stat_cache, context=context
+            )
+        note("asset_count", len(assets))
+        if args.dedupe:
+            with phase("dedupe"):
+                saved = write_blob_store(canonical_root, assets, Path(args.dedupe))
+
+        with phase("build_manifest"):
+            manifest = build_manifest(
+                canonical_root, args.source_commit, jobs=args.jobs, assets=assets, context=context
+            )
+        if args.dedupe:
+            manifest["content_groups"] = content_groups(assets)
+        note("source_snapshot_sha256", manifest["source_snapshot_sha256"])
+        with phase("write_output"):
+            output = Path(args.output)
+            output.parent.mkdir(parents=True, exist_ok=True)
+            output.write_text(json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+            if args.index:
+                index_path(output).write_bytes(build_index(manifest))
+
+            if args.stat_cache:
+                cache_path = Path(args.stat_cache)
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                cache_path.write_text(json.dumps(build_stat_cache(manifest, stats)) + "\n", encoding="utf-8")
+        if args.stat_cache:
+            print(json.dumps({"asset_count": len(assets), **counts}, sort_keys=True))
+        if args.dedupe:
+            print(json.dumps({"dedupe": saved}, sort_keys=True))
 
 
 if __name__ == "__main__":
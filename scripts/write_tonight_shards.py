@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Split events.json into per-JST-day shards so the Tonight page loads one day, not the catalog."""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+if __package__ in {None, ""}:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.snapshot_context import SnapshotContext  # noqa: E402
+
+SCHEMA_VERSION = "cast-event.tonight-shards.v1"
+SHARD_DIR = "tonight/shards"
+SHARD_INDEX = f"{SHARD_DIR}/index.json"
+JST = timezone(timedelta(hours=9))
+# The trimmed field set kept in each shard; everything else stays in events.json.
+SHARD_FIELDS = (
+    "id",
+    "canonical_name",
+    "starts_at",
+    "ends_at",
+    "primary_action_url",
+    "official_links",
+    "review_required",
+)
+
+
+def render(payload: Any) -> bytes:
+    return (json.dumps(payload, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def jst_day(event: dict[str, Any]) -> str | None:
+    """Return the JST date ``event`` starts on, or None when it has no start time."""
+    value = event.get("starts_at")
+    if value is None or value == "":
+        return None
+    try:
+        starts_at = datetime.fromisoformat(str(value))
+    except ValueError as exc:
+        raise ValueError(f"events.json event {event.get('id')} has invalid starts_at") from exc
+    if starts_at.tzinfo is None:
+        raise ValueError(f"events.json event {event.get('id')} has naive starts_at")
+    return starts_at.astimezone(JST).date().isoformat()
+
+
+def build_shards(context: SnapshotContext) -> dict[str, bytes]:
+    """Return every shard file and the shard index, keyed by their path under the root."""
+    header, _ = context.summary("events.json")
+    days: dict[str, list[dict[str, Any]]] = {}
+    undated = 0
+    for event in context.iter_events():
+        if not isinstance(event, dict):
+            raise ValueError("events.json contains a non-object event")
+        day = jst_day(event)
+        if day is None:
+            # Undated events cannot be placed on a night; count them instead of failing the build.
+            undated += 1
+            continue
+        days.setdefault(day, []).append({key: event[key] for key in SHARD_FIELDS if key in event})
+
+    files: dict[str, bytes] = {}
+    shards = []
+    for day in sorted(days):
+        events = sorted(days[day], key=lambda event: (str(event["starts_at"]), str(event.get("id"))))
+        path = f"{SHARD_DIR}/{day}.json"
+        files[path] = render({"schema_version": SCHEMA_VERSION, "date": day, "events": events})
+        shards.append({
+            "date": day,
+            "path": path,
+            "count": len(events),
+            "bytes": len(files[path]),
+            "sha256": hashlib.sha256(files[path]).hexdigest(),
+        })
+    files[SHARD_INDEX] = render({
+        "schema_version": SCHEMA_VERSION,
+        "generated_at": (header or {}).get("generated_at"),
+        "timezone": "Asia/Tokyo",
+        "events_sha256": context.digest("events.json")[1],
+        "undated_events": undated,
+        "shards": shards,
+    })
+    return files
+
+
+def verify_shards(context: SnapshotContext, assets: dict[str, dict[str, Any]]) -> int:
+    """Fail unless the manifest lists exactly the shards events.json produces, with matching digests.
+
+    The manifest digests have already been checked against disk, so the
+    shards are compared by hash without reading them back.
+    """
+    expected = build_shards(context)
+    deployed = {name for name in assets if name.startswith(f"{SHARD_DIR}/")}
+    problems = []
+    missing = sorted(expected.keys() - deployed)
+    extra = sorted(deployed - expected.keys())
+    if missing:
+        problems.append(f"missing tonight shards: {missing[:5]}")
+    if extra:
+        problems.append(f"unexpected tonight shards: {extra[:5]}")
+    stale = sorted(
+        name
+        for name in expected.keys() & deployed
+        if assets[name]["sha256"] != hashlib.sha256(expected[name]).hexdigest()
+    )
+    if stale:
+        problems.append(f"stale tonight shards: {stale[:5]}")
+    if problems:
+        raise ValueError("; ".join(problems))
+    return len(expected) - 1
+
+
+def write_shards(root: Path, files: dict[str, bytes]) -> None:
+    """Replace the shard directory with ``files`` so removed days do not linger."""
+    shard_dir = root / SHARD_DIR
+    if shard_dir.is_dir():
+        for stale in shard_dir.glob("*.json"):
+            if f"{SHARD_DIR}/{stale.name}" not in files:
+                stale.unlink()
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    for name, payload in files.items():
+        (root / name).write_bytes(payload)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--root", default=".")
+    args = parser.parse_args()
+    root = Path(args.root)
+    files = build_shards(SnapshotContext(root))
+    write_shards(root, files)
+    undated = json.loads(files[SHARD_INDEX])["undated_events"]
+    print(json.dumps(
+        {"shards": len(files) - 1, "bytes": sum(map(len, files.values())), "undated_events": undated}, sort_keys=True
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""A minimal canonical snapshot and a throwaway projection manifest for verifier tests."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from scripts.write_projection_manifest import build_manifest
+
+MANIFEST_TIMESTAMP = "2026-08-10T00:01:00Z"
+
+
+def write_snapshot(
+    root: Path,
+    events: list[dict[str, Any]] | dict[str, Any],
+    *,
+    extra: dict[str, Any] | None = None,
+    indent: int | None = None,
+) -> None:
+    """Write events.json with matching health.json and event-ontology.json, plus any ``extra`` documents.
+
+    ``events`` is either the event list or a whole events.json payload.
+    """
+    payload = events if isinstance(events, dict) else {
+        "generated_at": "2026-08-10T00:00:00Z",
+        "count": len(events),
+        "events": events,
+    }
+    count = len(payload["events"])
+    documents = {
+        "events.json": payload,
+        "health.json": {
+            "status": "ok",
+            "event_count": count,
+            "enabled_sources": 1,
+            "successful_sources": 1,
+            "failed_sources": 0,
+        },
+        "event-ontology.json": {"schema_version": "3.0", "source_event_count": count},
+        **(extra or {}),
+    }
+    for name, document in documents.items():
+        (root / name).write_text(json.dumps(document, ensure_ascii=False, indent=indent) + "\n", encoding="utf-8")
+
+
+@contextmanager
+def published_manifest(root: Path, source_commit: str = "d" * 40) -> Iterator[Callable[[], Path]]:
+    """Yield ``publish()``, which rebuilds the manifest for ``root`` beside it; the file is removed afterwards."""
+    path = root.parent / f"{root.name}-projection-manifest.json"
+
+    def publish() -> Path:
+        manifest = build_manifest(root, source_commit, timestamp=MANIFEST_TIMESTAMP)
+        path.write_text(json.dumps(manifest), encoding="utf-8")
+        return path
+
+    try:
+        yield publish
+    finally:
+        path.unlink(missing_ok=True)
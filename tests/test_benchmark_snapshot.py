@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import copy
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.benchmark_snapshot import compare, run_benchmark
+
+
+class BenchmarkSnapshotTest(unittest.TestCase):
+    def test_synthetic_snapshot_passes_every_stage_and_compares_against_baseline(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            result = run_benchmark(Path(temp) / "snapshot", 3)
+
+        self.assertEqual(result["snapshot"], {"events": 3, "pages": 8, "campaigns": 3})
+        for stage in result["stages"].values():
+            self.assertGreater(stage["peak_memory_bytes"], 0)
+        self.assertEqual(
+            set(result["stages"]),
+            {"build_manifest", "verify", "verify_search_surface", "verify_sponsorships"},
+        )
+        self.assertEqual(result["stages"]["verify"]["items"], result["stages"]["build_manifest"]["items"])
+        self.assertEqual(compare(result, result), [])
+
+        faster = copy.deepcopy(result)
+        faster["stages"]["verify"]["seconds"] = result["stages"]["verify"]["seconds"] / 10
+        regressions = compare(result, faster, threshold=0.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("verify: seconds"))
+
+    def test_campaign_count_scales_independently_of_events(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            result = run_benchmark(Path(temp) / "snapshot", 2, campaign_count=5)
+        self.assertEqual(result["snapshot"]["campaigns"], 5)
+        self.assertEqual(result["stages"]["verify_sponsorships"]["items"], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
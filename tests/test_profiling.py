@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.profiling import Profiler, add_profile_arguments, note, phase, profile_run
+
+
+class ProfilingTest(unittest.TestCase):
+    def test_profiler_records_nested_phases_and_touched_files(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            (root / "events.json").write_text('{"events": []}\n', encoding="utf-8")
+            (root / "health.json").write_text('{"status": "ok"}\n', encoding="utf-8")
+
+            with Profiler("test") as profiler:
+                with phase("load"):
+                    (root / "events.json").read_bytes()
+                    with phase("health"):
+                        (root / "health.json").read_bytes()
+                note("events_sha256", "a" * 64)
+
+            record = profiler.record
+            self.assertEqual(record["status"], "ok")
+            self.assertEqual(record["files_touched"], 2)
+            self.assertEqual(record["events_sha256"], "a" * 64)
+            self.assertEqual(set(record["phases"]), {"load", "load/health"})
+            self.assertEqual(record["phases"]["load"]["files_touched"], 2)
+            self.assertEqual(record["phases"]["load/health"]["files_touched"], 1)
+            self.assertGreater(record["tracemalloc_peak_bytes"], 0)
+
+    def test_phase_is_a_no_op_without_an_active_profiler(self) -> None:
+        with phase("idle"):
+            note("ignored", True)
+
+    def test_profile_run_appends_compact_records_even_on_failure(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            log = Path(temp) / "perf" / "runs.jsonl"
+            cprofile = Path(temp) / "perf" / "run.prof"
+            parser = argparse.ArgumentParser()
+            add_profile_arguments(parser)
+            args = parser.parse_args(["--profile", str(log), "--cprofile", str(cprofile)])
+
+            with profile_run("verify_test", args):
+                pass
+            with self.assertRaises(ValueError), profile_run("verify_test", args):
+                raise ValueError("drift")
+
+            lines = log.read_text(encoding="utf-8").splitlines()
+            self.assertEqual([json.loads(line)["status"] for line in lines], ["ok", "failed"])
+            self.assertNotIn(", ", lines[0])
+            self.assertTrue(cprofile.is_file())
+
+    def test_profile_run_is_disabled_by_default(self) -> None:
+        parser = argparse.ArgumentParser()
+        add_profile_arguments(parser)
+        with profile_run("verify_test", parser.parse_args([])) as profiler:
+            self.assertIsNone(profiler)
+
+
+if __name__ == "__main__":
+    unittest.main()
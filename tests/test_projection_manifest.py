@@ -2,12 +2,28 @@ from __future__ import annotations
 
 import hashlib
 import json
+import os
 import tempfile
 import unittest
 from pathlib import Path
 
-from scripts.verify_projection_manifest import SEARCH_BASE_URL, verify
-from scripts.write_projection_manifest import build_manifest
+from scripts.verify_projection_manifest import (
+    SEARCH_BASE_URL,
+    Watcher,
+    verify,
+    verify_assets,
+    verify_changed,
+    verify_subtree,
+)
+from scripts.write_projection_manifest import (
+    blob_path,
+    build_manifest,
+    build_stat_cache,
+    canonical_assets,
+    collect_assets,
+    content_groups,
+    write_blob_store,
+)
 
 
 class ProjectionManifestTest(unittest.TestCase):
@@ -89,6 +105,83 @@ class ProjectionManifestTest(unittest.TestCase):
             self.assertEqual(result["status"], "ok")
             self.assertEqual(result["asset_count"], 5)
 
+    def test_parallel_hashing_matches_serial_asset_map(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_fixture(root)
+            self.write_search_surface(root)
+            serial = canonical_assets(root, jobs=1)
+            parallel = canonical_assets(root, jobs=8)
+
+            self.assertEqual(json.dumps(serial), json.dumps(parallel))
+            for name, metadata in parallel.items():
+                raw = (root / name).read_bytes()
+                self.assertEqual(metadata, {"bytes": len(raw), "sha256": hashlib.sha256(raw).hexdigest()})
+            with self.assertRaisesRegex(ValueError, "jobs must be at least 1"):
+                canonical_assets(root, jobs=0)
+
+    def test_incremental_build_rehashes_only_changed_files(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_fixture(root)
+            assets, stats, counts = collect_assets(root)
+            self.assertEqual(counts, {"reused": 0, "rehashed": 5})
+            previous = build_manifest(root, "a" * 40, timestamp="2026-08-10T00:01:00Z", assets=assets)
+            cache = build_stat_cache(previous, stats)
+
+            (root / "calendar.ics").write_text("BEGIN:VCALENDAR\nX-CHANGED:1\nEND:VCALENDAR\n", encoding="utf-8")
+            assets, _, counts = collect_assets(root, previous_manifest=previous, stat_cache=cache)
+
+            self.assertEqual(counts, {"reused": 4, "rehashed": 1})
+            self.assertEqual(assets, canonical_assets(root))
+
+            stale = dict(cache, source_snapshot_sha256="0" * 64)
+            _, _, counts = collect_assets(root, previous_manifest=previous, stat_cache=stale)
+            self.assertEqual(counts, {"reused": 0, "rehashed": 5})
+
+    def test_dedupe_stores_blobs_outside_the_tree_and_hashes_each_blob_once(self) -> None:
+        with tempfile.TemporaryDirectory() as temp, tempfile.TemporaryDirectory() as store:
+            root = Path(temp)
+            blob_dir = Path(store)
+            self.write_fixture(root)
+            for name in ("og/events/a.png", "og/events/b.png"):
+                (root / name).parent.mkdir(parents=True, exist_ok=True)
+                (root / name).write_bytes(b"placeholder")
+            assets = canonical_assets(root)
+            groups = content_groups(assets)
+            self.assertEqual(groups, [["og/events/a.png", "og/events/b.png"]])
+
+            saved = write_blob_store(root, assets, blob_dir)
+
+            self.assertEqual(saved, {"groups": 1, "blobs": 6, "written": 6, "bytes_saved": 11})
+            digest = assets["og/events/a.png"]["sha256"]
+            self.assertEqual(blob_path(blob_dir, digest).read_bytes(), b"placeholder")
+            self.assertNotEqual((root / "og/events/a.png").stat().st_ino, (root / "og/events/b.png").stat().st_ino)
+            self.assertEqual(write_blob_store(root, assets, blob_dir)["written"], 0)
+            with self.assertRaisesRegex(ValueError, "outside the canonical root"):
+                write_blob_store(root, assets, root / "blobs")
+
+            # Copies that already share an inode are hashed once.
+            os.link(root / "og/events/a.png", root / "og/events/c.png")
+            deduped, _, counts = collect_assets(root)
+            assets = canonical_assets(root)
+            groups = content_groups(assets)
+            self.assertEqual(deduped, assets)
+            self.assertEqual(counts, {"reused": 0, "rehashed": 7})
+
+            manifest = build_manifest(root, "f" * 40, timestamp="2026-08-10T00:01:00Z", assets=deduped)
+            manifest["content_groups"] = groups
+            manifest_path = root.parent / "projection-manifest-dedupe.json"
+            manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+            self.assertEqual(verify(root, manifest_path)["status"], "ok")
+            report = verify_assets(root, manifest_path)
+            self.assertEqual((report["asset_count"], report["unique_blobs"]), (8, 7))
+
+            manifest["content_groups"] = []
+            manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+            with self.assertRaisesRegex(ValueError, "content_groups mismatch"):
+                verify(root, manifest_path)
+
     def test_search_surface_accepts_event_category_and_series_pages(self) -> None:
         with tempfile.TemporaryDirectory() as temp:
             root = Path(temp)
@@ -141,6 +234,141 @@ class ProjectionManifestTest(unittest.TestCase):
             with self.assertRaisesRegex(ValueError, "homepage/search-page one-hop parity mismatch"):
                 verify(root, manifest_path)
 
+    def test_homepage_parity_covers_declared_continuation_pages(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_fixture(root)
+            self.write_search_surface(root)
+            (root / "index.html").write_text(
+                '<!doctype html><head><link rel="next" href="page/2/"></head>'
+                '<a href="events/event-1/">event</a><script>`<a href="events/${id}/">`</script>',
+                encoding="utf-8",
+            )
+            (root / "page/2").mkdir(parents=True)
+            (root / "page/2/index.html").write_text(
+                '<a href="../../series/sample/">series</a><a rel="next" href="../../page/3.json">more</a>',
+                encoding="utf-8",
+            )
+            (root / "page/3.json").write_text('{"links": ["categories/music/"]}\n', encoding="utf-8")
+            manifest = build_manifest(root, "d" * 40, timestamp="2026-08-10T00:01:00Z")
+            manifest_path = root.parent / "projection-manifest-continuation.json"
+            manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+
+            self.assertEqual(verify(root, manifest_path)["status"], "ok")
+
+            (root / "page/3.json").write_text('{"links": []}\n', encoding="utf-8")
+            manifest = build_manifest(root, "d" * 40, timestamp="2026-08-10T00:01:00Z")
+            manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+            with self.assertRaisesRegex(ValueError, r"one-hop parity mismatch: missing=\['categories/music/'\]"):
+                verify(root, manifest_path)
+
+    def write_sitemap_index(self, root: Path, shards: dict[str, list[str]]) -> None:
+        namespace = "http://www.sitemaps.org/schemas/sitemap/0.9"
+        for name, urls in shards.items():
+            body = "".join(f"<url><loc>{SEARCH_BASE_URL}{url}</loc></url>" for url in urls)
+            (root / name).write_text(f'<urlset xmlns="{namespace}">{body}</urlset>', encoding="utf-8")
+        entries = "".join(f"<sitemap><loc>{SEARCH_BASE_URL}{name}</loc></sitemap>" for name in shards)
+        (root / "sitemap.xml").write_text(f'<sitemapindex xmlns="{namespace}">{entries}</sitemapindex>', encoding="utf-8")
+
+    def test_search_surface_follows_sitemap_index_shards(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_fixture(root)
+            self.write_search_surface(root)
+            self.write_sitemap_index(root, {
+                "sitemap-pages.xml": ["", "categories/music/", "series/sample/"],
+                "sitemap-events.xml": ["events/event-1/"],
+            })
+            manifest = build_manifest(root, "d" * 40, timestamp="2026-08-10T00:01:00Z")
+            manifest_path = root.parent / "projection-manifest-sitemap-index.json"
+            manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+            self.assertEqual(verify(root, manifest_path)["status"], "ok")
+
+            self.write_sitemap_index(root, {
+                "sitemap-pages.xml": ["", "categories/music/", "series/sample/", "events/event-1/"],
+                "sitemap-events.xml": ["events/event-1/"],
+            })
+            manifest = build_manifest(root, "d" * 40, timestamp="2026-08-10T00:01:00Z")
+            manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+            with self.assertRaisesRegex(ValueError, r"sitemap contains duplicate URLs: \['[^']*events/event-1/'\]"):
+                verify(root, manifest_path)
+
+            # A repeated URL that is not a deployed page is named as a duplicate, not a parity gap.
+            self.write_sitemap_index(root, {
+                "sitemap-pages.xml": ["", "categories/music/", "series/sample/", "events/gone/"],
+                "sitemap-events.xml": ["events/event-1/", "events/gone/"],
+            })
+            manifest = build_manifest(root, "d" * 40, timestamp="2026-08-10T00:01:00Z")
+            manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+            with self.assertRaisesRegex(ValueError, r"duplicate URLs: \['[^']*events/gone/'\]"):
+                verify(root, manifest_path)
+
+    def test_search_surface_reports_every_offending_page(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_fixture(root)
+            self.write_search_surface(root)
+            (root / "categories/music/index.html").write_text(
+                "<!doctype html><head><title>music</title></head>"
+                f'<body><link rel="canonical" href="{SEARCH_BASE_URL}categories/music/"></body>\n',
+                encoding="utf-8",
+            )
+            event_page = root / "events/event-1/index.html"
+            event_page.write_text(
+                event_page.read_text(encoding="utf-8")
+                + "</head><body>" + "x" * 200_000 + '<script type="application/ld+json">{}</script>\n',
+                encoding="utf-8",
+            )
+            manifest = build_manifest(root, "f" * 40, timestamp="2026-08-10T00:01:00Z")
+            manifest_path = root.parent / "projection-manifest-page-scan.json"
+            manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+
+            with self.assertRaises(ValueError) as raised:
+                verify(root, manifest_path)
+            self.assertEqual(
+                str(raised.exception),
+                "missing canonical search URL: categories/music/index.html; "
+                "unsupported virtual-only Event JSON-LD: events/event-1/index.html",
+            )
+
+    def test_watcher_rechecks_only_what_changed(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_fixture(root)
+            self.write_search_surface(root)
+            manifest = build_manifest(root, "d" * 40, timestamp="2026-08-10T00:01:00Z")
+            manifest_path = root.parent / f"{root.name}-watch-manifest.json"
+            manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+            try:
+                watcher = Watcher(root, manifest_path, jobs=2)
+                self.assertEqual(watcher.failures, {})
+                self.assertEqual(watcher.poll(), (set(), 0))
+
+                page = root / "series/sample/index.html"
+                original = page.read_bytes()
+                page.write_text("<!doctype html><title>no canonical</title>\n", encoding="utf-8")
+                changed, checked = watcher.poll()
+                self.assertEqual(changed, {"series/sample/index.html"})
+                self.assertEqual(checked, 2)
+                self.assertEqual(
+                    sorted(watcher.failures), ["asset:series/sample/index.html", "page:series/sample/index.html"]
+                )
+                self.assertIn("failed", watcher.status_line(changed, checked, 0.001))
+
+                page.write_bytes(original)
+                watcher.poll()
+                self.assertEqual(watcher.failures, {})
+
+                sitemap = root / "sitemap.xml"
+                sitemap.write_text(
+                    sitemap.read_text(encoding="utf-8").replace(f"<url><loc>{SEARCH_BASE_URL}</loc></url>", ""),
+                    encoding="utf-8",
+                )
+                self.assertEqual(watcher.poll(), ({"sitemap.xml"}, 3))
+                self.assertIn("sitemap", watcher.failures)
+            finally:
+                manifest_path.unlink()
+
     def test_tampered_asset_is_rejected(self) -> None:
         with tempfile.TemporaryDirectory() as temp:
             root = Path(temp)
@@ -152,6 +380,88 @@ class ProjectionManifestTest(unittest.TestCase):
             with self.assertRaisesRegex(ValueError, "mismatch"):
                 verify(root, manifest_path)
 
+    def test_asset_report_lists_every_failure_in_one_pass(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_fixture(root)
+            manifest = build_manifest(root, "c" * 40, timestamp="2026-08-10T00:01:00Z")
+            manifest_path = root.parent / "projection-manifest-report.json"
+            manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+            (root / "calendar.ics").write_text("tampered\n", encoding="utf-8")
+            (root / "audit/proof.json").write_text('{"status":"no"}\n', encoding="utf-8")
+            (root / "event-ontology.json").unlink()
+
+            report = verify_assets(root, manifest_path, jobs=4)
+
+            self.assertEqual(report["status"], "failed")
+            self.assertEqual(report["asset_count"], 5)
+            self.assertEqual(report["missing"], ["event-ontology.json"])
+            self.assertEqual(report["resized"], ["calendar.ics"])
+            self.assertEqual(report["mismatched"], ["audit/proof.json"])
+            with self.assertRaisesRegex(ValueError, "missing deployed asset: event-ontology.json; byte mismatch"):
+                verify(root, manifest_path)
+
+    def test_merkle_subtree_is_verified_against_the_recorded_root(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_fixture(root)
+            self.write_search_surface(root)
+            manifest = build_manifest(root, "a" * 40, timestamp="2026-08-10T00:01:00Z")
+            merkle = manifest["source_snapshot_merkle"]
+            self.assertEqual(set(merkle["subtrees"]), {"categories/", "events/", "series/"})
+            manifest_path = root.parent / "projection-manifest-merkle.json"
+            manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+
+            report = verify_subtree(root, manifest_path, "events")
+            self.assertEqual(report["status"], "ok")
+            self.assertEqual(report["subtree_sha256"], merkle["subtrees"]["events/"])
+            self.assertEqual(report["asset_count"], 1)
+
+            (root / "calendar.ics").write_text("tampered outside the subtree\n", encoding="utf-8")
+            self.assertEqual(verify_subtree(root, manifest_path, "events/")["status"], "ok")
+            (root / "events/event-1/index.html").write_text("tampered\n", encoding="utf-8")
+            self.assertEqual(verify_subtree(root, manifest_path, "events/")["resized"], ["events/event-1/index.html"])
+
+            with self.assertRaisesRegex(ValueError, "no hash for audit/"):
+                verify_subtree(root, manifest_path, "audit/")
+
+            # A subtree hash edited to match nothing on disk is caught against the asset table.
+            manifest["source_snapshot_merkle"]["subtrees"]["series/"] = "0" * 64
+            manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+            with self.assertRaisesRegex(ValueError, "source_snapshot_merkle mismatch"):
+                verify_subtree(root, manifest_path, "series/")
+            with self.assertRaisesRegex(ValueError, "mismatch"):
+                verify(root, manifest_path)
+
+            manifest["validation_status"] = "pending"
+            manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+            with self.assertRaisesRegex(ValueError, "not validated"):
+                verify_subtree(root, manifest_path, "events/")
+
+    def test_changed_subtrees_are_reported_and_only_they_are_reread(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_fixture(root)
+            self.write_search_surface(root)
+            previous_path = root.parent / "projection-manifest-previous.json"
+            manifest_path = root.parent / "projection-manifest-current.json"
+            try:
+                previous_path.write_text(json.dumps(build_manifest(root, "a" * 40)), encoding="utf-8")
+                (root / "series/sample/index.html").write_text("<html>renamed</html>\n", encoding="utf-8")
+                manifest_path.write_text(json.dumps(build_manifest(root, "b" * 40)), encoding="utf-8")
+
+                report = verify_changed(root, manifest_path, previous_path)
+                self.assertEqual(report["status"], "ok")
+                self.assertEqual(report["changed_subtrees"], ["series/"])
+                self.assertEqual(report["unchanged_subtrees"], ["categories/", "events/"])
+                self.assertEqual(report["skipped_assets"], 2)
+
+                (root / "series/sample/index.html").write_text("tampered\n", encoding="utf-8")
+                self.assertEqual(verify_changed(root, manifest_path, previous_path)["status"], "failed")
+            finally:
+                previous_path.unlink(missing_ok=True)
+                manifest_path.unlink(missing_ok=True)
+
     def test_failed_canonical_health_is_rejected(self) -> None:
         with tempfile.TemporaryDirectory() as temp:
             root = Path(temp)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from scripts import snapshot_context
+from scripts.snapshot_context import SnapshotContext
+
+
+class SnapshotContextTest(unittest.TestCase):
+    def test_streaming_summary_matches_full_parse_and_reads_once(self) -> None:
+        payload = {
+            "generated_at": "2026-08-10T00:00:00Z",
+            "count": 3,
+            "events": [{"id": "event-1", "tags": ["a", "b"]}, {"id": "event-2"}, {"id": "event-3"}],
+            "timezone": "Asia/Tokyo",
+        }
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            raw = (json.dumps(payload, indent=2) + "\n").encode("utf-8")
+            (root / "events.json").write_bytes(raw)
+            context = SnapshotContext(root)
+
+            header, count = context.summary("events.json")
+            self.assertEqual(count, 3)
+            self.assertEqual(header, {"generated_at": "2026-08-10T00:00:00Z", "count": 3, "timezone": "Asia/Tokyo"})
+            self.assertEqual(context.digest("events.json"), (len(raw), hashlib.sha256(raw).hexdigest()))
+
+            (root / "events.json").unlink()
+            self.assertEqual(list(context.iter_events()), payload["events"])
+            self.assertEqual(context.event_count(), 3)
+            self.assertEqual(context.json("events.json"), payload)
+
+    def test_top_level_array_and_missing_event_list(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            (root / "array.json").write_text('[{"id": 1}, {"id": 2}]', encoding="utf-8")
+            (root / "events.json").write_text('{"events": null}', encoding="utf-8")
+            context = SnapshotContext(root)
+
+            self.assertEqual(context.summary("array.json"), (None, 2))
+            self.assertEqual(list(context.iter_array("array.json")), [{"id": 1}, {"id": 2}])
+            with self.assertRaisesRegex(ValueError, "no event list"):
+                context.event_count()
+
+    def test_walk_across_small_windows_reports_byte_spans(self) -> None:
+        events = [{"id": f"event-{index}", "title": "ナイト" * index, "score": 10 ** index} for index in range(40)]
+        payload = {"generated_at": "2026-08-10T00:00:00Z", "events": events, "note": "末尾"}
+        with tempfile.TemporaryDirectory() as temp, mock.patch.object(snapshot_context, "_WINDOW_BYTES", 7):
+            root = Path(temp)
+            raw = json.dumps(payload, ensure_ascii=False, indent=1).encode("utf-8")
+            (root / "events.json").write_bytes(raw)
+            context = SnapshotContext(root)
+
+            header = {"generated_at": "2026-08-10T00:00:00Z", "note": "末尾"}
+            self.assertEqual(context.summary("events.json"), (header, 40))
+            spans = list(context.iter_spans("events.json"))
+            self.assertEqual([value for _, _, value in spans], events)
+            for offset, length, value in spans:
+                self.assertEqual(json.loads(raw[offset:offset + length]), value)
+
+            with mock.patch.object(snapshot_context, "_walk", side_effect=AssertionError("walked twice")):
+                self.assertEqual(list(context.iter_events()), events)
+                context.json("events.json")
+                self.assertEqual(list(context.iter_spans("events.json")), spans)
+
+    def test_numbers_split_at_every_window_edge(self) -> None:
+        rows = [1.25, 22, -3e-5, 4.5E+10, 0, -0.5, 123456789, 1e3]
+        raw = json.dumps({"pad": "x", "events": rows}).encode("utf-8")
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            (root / "events.json").write_bytes(raw)
+            for window in range(1, len(raw) + 1):
+                with self.subTest(window=window), mock.patch.object(snapshot_context, "_WINDOW_BYTES", window):
+                    context = SnapshotContext(root)
+                    self.assertEqual(context.summary("events.json"), ({"pad": "x"}, len(rows)))
+                    self.assertEqual(list(context.iter_events()), rows)
+
+    def test_malformed_json_is_reported_with_its_byte_offset(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            (root / "events.json").write_text('{"events": [{"id": 1} {"id": 2}]}', encoding="utf-8")
+            with self.assertRaisesRegex(ValueError, "expected ',' at offset 22"):
+                SnapshotContext(root).summary("events.json")
+
+
+if __name__ == "__main__":
+    unittest.main()
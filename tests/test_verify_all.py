@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+from scripts.snapshot_context import SnapshotContext
+from scripts.verify_all import build_stages, run_stages
+from tests.snapshot_fixture import published_manifest, write_snapshot
+
+NOW = datetime(2026, 8, 11, 0, 0, tzinfo=timezone.utc)
+
+
+class VerifyAllTest(unittest.TestCase):
+    def write_snapshot(self, root: Path) -> None:
+        write_snapshot(root, [{"id": "event-1"}], extra={
+            "ontology-match-audit.json": {"event_count": 1, "ontology_entries": 1},
+            "sponsorships.json": {"schema_version": "featured-tonight.v1", "campaigns": []},
+        })
+
+    def test_all_stages_share_one_context_and_report_timings(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_snapshot(root)
+            with published_manifest(root) as publish:
+                result = run_stages(build_stages(SnapshotContext(root), publish(), now=NOW))
+
+            self.assertEqual(result["status"], "ok")
+            self.assertEqual(set(result["stages"]), {"public_snapshot", "projection_manifest", "sponsorships"})
+            for outcome in result["stages"].values():
+                self.assertEqual(outcome["status"], "ok")
+                self.assertGreaterEqual(outcome["seconds"], 0)
+            self.assertEqual(result["stages"]["projection_manifest"]["result"]["event_count"], 1)
+
+    def test_failed_stage_does_not_hide_other_results(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_snapshot(root)
+            with published_manifest(root) as publish:
+                manifest_path = publish()
+                (root / "health.json").write_text('{"status": "ok", "event_count": 2}\n', encoding="utf-8")
+                result = run_stages(build_stages(SnapshotContext(root), manifest_path, now=NOW), parallel=False)
+
+            self.assertEqual(result["status"], "failed")
+            self.assertEqual(result["stages"]["projection_manifest"]["status"], "failed")
+            self.assertIn("mismatch", result["stages"]["projection_manifest"]["error"])
+            self.assertEqual(result["stages"]["public_snapshot"]["status"], "failed")
+            self.assertEqual(result["stages"]["sponsorships"]["status"], "ok")
+
+    def test_malformed_sitemap_is_recorded_as_a_failed_stage(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_snapshot(root)
+            (root / "events/event-1").mkdir(parents=True)
+            (root / "events/event-1/index.html").write_text("<!doctype html>\n", encoding="utf-8")
+            (root / "index.html").write_text('<a href="events/event-1/">event</a>\n', encoding="utf-8")
+            (root / "analytics.js").write_text("// analytics\n", encoding="utf-8")
+            (root / "analytics-config.json").write_text('{"ga4_measurement_id":null}\n', encoding="utf-8")
+            (root / "sitemap.xml").write_text('<?xml version="1.0"?><urlset><url><loc>', encoding="utf-8")
+            with published_manifest(root) as publish:
+                result = run_stages(build_stages(SnapshotContext(root), publish(), now=NOW))
+
+            self.assertEqual(result["status"], "failed")
+            self.assertEqual(result["stages"]["projection_manifest"]["status"], "failed")
+            self.assertIn("no element found", result["stages"]["projection_manifest"]["error"])
+            self.assertEqual(result["stages"]["sponsorships"]["status"], "ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.verify_calendar import verify_calendar
+
+EVENTS = [
+    {"id": "occ_a", "starts_at": "2026-08-16T10:30:00Z", "ends_at": None},
+    {"id": "event-b", "starts_at": "2026-08-16T20:00:00+09:00", "ends_at": "2026-08-16T21:00:00+09:00"},
+]
+
+
+def vevent(uid: str, start: str, end: str | None = None) -> str:
+    lines = ["BEGIN:VEVENT", f"UID:{uid}", "DTSTAMP:20260817T033057Z", f"DTSTART:{start}"]
+    if end is not None:
+        lines.append(f"DTEND:{end}")
+    lines += ["SUMMARY:長いタイトルを折り返して", " 確認する", "END:VEVENT"]
+    return "\r\n".join(lines)
+
+
+def calendar(*vevents: str) -> str:
+    return "\r\n".join(["BEGIN:VCALENDAR", "VERSION:2.0", *vevents, "END:VCALENDAR"]) + "\r\n"
+
+
+class VerifyCalendarTest(unittest.TestCase):
+    def write_snapshot(self, root: Path) -> None:
+        (root / "events.json").write_text(
+            json.dumps({"count": len(EVENTS), "events": EVENTS}), encoding="utf-8"
+        )
+        (root / "calendar.ics").write_text(
+            calendar(
+                vevent("occ_a@cast-event-cal", "20260816T103000Z"),
+                vevent("event-b@cast-event-cal", "20260816T110000Z", "20260816T120000Z"),
+            ),
+            encoding="utf-8",
+        )
+        for event_id, start, end in (
+            ("occ_a", "20260816T103000Z", None),
+            ("event-b", "20260816T110000Z", "20260816T120000Z"),
+        ):
+            (root / "events" / event_id).mkdir(parents=True)
+            (root / "events" / event_id / "event.ics").write_text(
+                calendar(vevent(f"{event_id}@kafka2306.github.io", start, end)), encoding="utf-8"
+            )
+
+    def test_matching_calendars_pass(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_snapshot(root)
+
+            result = verify_calendar(root, jobs=2)
+
+            self.assertEqual(result, {"status": "ok", "calendar_events": 2, "event_files": 2})
+
+    def test_folded_uid_is_unfolded_before_matching(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_snapshot(root)
+            path = root / "events" / "event-b" / "event.ics"
+            path.write_text(
+                path.read_text(encoding="utf-8").replace("UID:event-b@", "UID:ev\r\n ent-b@"), encoding="utf-8"
+            )
+
+            self.assertEqual(verify_calendar(root)["event_files"], 2)
+
+    def test_truncated_calendar_fails(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_snapshot(root)
+            text = (root / "calendar.ics").read_text(encoding="utf-8")
+            (root / "calendar.ics").write_text(text[: text.rindex("END:VEVENT")], encoding="utf-8")
+
+            with self.assertRaisesRegex(ValueError, "calendar.ics is truncated"):
+                verify_calendar(root)
+
+    def test_stale_times_missing_events_and_orphans_are_all_reported(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_snapshot(root)
+            (root / "calendar.ics").write_text(
+                calendar(vevent("occ_a@cast-event-cal", "20260816T113000Z")), encoding="utf-8"
+            )
+            (root / "events" / "gone").mkdir()
+            (root / "events" / "gone" / "event.ics").write_text(
+                calendar(vevent("gone@kafka2306.github.io", "20260816T103000Z")), encoding="utf-8"
+            )
+
+            with self.assertRaises(ValueError) as raised:
+                verify_calendar(root)
+
+            message = str(raised.exception)
+            self.assertIn("calendar.ics: occ_a DTSTART 20260816T113000Z != 20260816T103000Z", message)
+            self.assertIn("calendar.ics missing 1 events: ['event-b']", message)
+            self.assertIn("events/gone/event.ics: stale event not in events.json", message)
+
+
+if __name__ == "__main__":
+    unittest.main()
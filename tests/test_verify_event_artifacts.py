@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.verify_event_artifacts import verify_event_artifacts
+
+
+class VerifyEventArtifactsTest(unittest.TestCase):
+    def write_snapshot(self, root: Path, pages: list[str], images: list[str]) -> None:
+        events = [
+            {"id": "event-1", "occurrence_id": "event-1"},
+            {"id": "event-2", "occurrence_id": "occ_2"},
+            {"id": "event-3", "occurrence_id": "event-3"},
+        ]
+        (root / "events.json").write_text(json.dumps({"count": 3, "events": events}), encoding="utf-8")
+        for name in pages:
+            (root / "events" / name).mkdir(parents=True)
+            (root / "events" / name / "index.html").write_text("<html></html>\n", encoding="utf-8")
+        (root / "og/events").mkdir(parents=True)
+        for name in images:
+            (root / "og/events" / f"{name}.png").write_bytes(b"\x89PNG\r\n\x1a\n")
+
+    def test_pages_may_cover_a_subset_of_events_by_id_or_occurrence_id(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_snapshot(root, ["event-1", "occ_2"], ["event-1", "occ_2"])
+
+            result = verify_event_artifacts(root)
+
+            self.assertEqual(result["detail_pages"], 2)
+            self.assertEqual(result["og_images"], 2)
+            self.assertEqual(result["events_without_pages"], 1)
+
+    def test_orphans_and_missing_images_are_reported_as_set_differences(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_snapshot(root, ["event-1", "removed"], ["event-1", "event-3"])
+
+            with self.assertRaises(ValueError) as raised:
+                verify_event_artifacts(root)
+
+            message = str(raised.exception)
+            self.assertIn("detail pages without an event (1): ['removed']", message)
+            self.assertIn("detail pages without an og image (1): ['removed']", message)
+            self.assertIn("og images without a detail page (1): ['event-3']", message)
+            self.assertNotIn("og images without an event", message)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import tempfile
+import threading
+import unittest
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from scripts.verify_http_deploy import verify_deployment
+from scripts.write_projection_manifest import canonical_assets
+
+
+class SnapshotHandler(SimpleHTTPRequestHandler):
+    """http.server stand-in for the static host: keep-alive plus content ETags."""
+
+    protocol_version = "HTTP/1.1"
+    requests: list[tuple[str, str, int]] = []
+
+    def send_head(self):  # type: ignore[override]
+        path = Path(self.translate_path(self.path))
+        if path.is_file():
+            etag = '"' + hashlib.sha256(path.read_bytes()).hexdigest()[:16] + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self.requests.append((self.command, self.path, 304))
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return None
+            self._etag = etag
+        self.requests.append((self.command, self.path, 200 if path.is_file() else 404))
+        return super().send_head()
+
+    def end_headers(self) -> None:
+        etag = getattr(self, "_etag", None)
+        if etag:
+            self.send_header("ETag", etag)
+            self._etag = None
+        super().end_headers()
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+class VerifyHttpDeployTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp.name) / "site"
+        (self.root / "events/event-1").mkdir(parents=True)
+        (self.root / "index.html").write_text("<!doctype html>\n", encoding="utf-8")
+        (self.root / "events/event-1/index.html").write_text("<p>イベント</p>\n", encoding="utf-8")
+        (self.root / "og.png").write_bytes(bytes(range(256)) * 600)
+        self.manifest_path = Path(self.temp.name) / "projection-manifest.json"
+        self.manifest_path.write_text(json.dumps({"assets": canonical_assets(self.root)}), encoding="utf-8")
+
+        SnapshotHandler.requests = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), partial(SnapshotHandler, directory=str(self.root)))
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self.temp.cleanup()
+
+    def test_assets_stream_through_a_reused_connection(self) -> None:
+        report = verify_deployment(self.manifest_path, self.base_url, connections=1)
+
+        self.assertEqual(report["status"], "ok")
+        self.assertEqual(report["success_rate"], 1.0)
+        self.assertEqual(report["connections_opened"], 1)
+        self.assertEqual(len(SnapshotHandler.requests), 3)
+
+    def test_drift_is_reported_per_asset(self) -> None:
+        (self.root / "og.png").write_bytes(b"\0" * (256 * 600))
+        (self.root / "index.html").write_text("<!doctype html><p>changed</p>\n", encoding="utf-8")
+        (self.root / "events/event-1/index.html").unlink()
+
+        report = verify_deployment(self.manifest_path, self.base_url, connections=2)
+
+        self.assertEqual(report["status"], "failed")
+        self.assertEqual(report["missing"], ["events/event-1/index.html"])
+        self.assertEqual(report["resized"], ["index.html"])
+        self.assertEqual(report["mismatched"], ["og.png"])
+        self.assertEqual(report["success_rate"], 0.0)
+
+    def test_etag_cache_revalidates_unchanged_assets(self) -> None:
+        cache = Path(self.temp.name) / "etags.json"
+        first = verify_deployment(self.manifest_path, self.base_url, etag_cache=cache)
+        self.assertEqual(first["not_modified"], 0)
+        SnapshotHandler.requests = []
+
+        second = verify_deployment(self.manifest_path, self.base_url, etag_cache=cache)
+
+        self.assertEqual(second["status"], "ok")
+        self.assertEqual(second["not_modified"], 3)
+        self.assertEqual({status for _, _, status in SnapshotHandler.requests}, {304})
+
+    def test_head_mode_checks_status_and_length_only(self) -> None:
+        report = verify_deployment(self.manifest_path, self.base_url, head=True)
+
+        self.assertEqual(report["status"], "ok")
+        self.assertEqual({command for command, _, _ in SnapshotHandler.requests}, {"HEAD"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.common import og_placeholder, png_chunk
+from scripts.verify_og_images import check_png, verify_og_images
+
+
+class VerifyOgImagesTest(unittest.TestCase):
+    def write_image(self, root: Path, name: str, payload: bytes) -> Path:
+        path = root / "og/events" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(payload)
+        return path
+
+    def test_valid_og_cards_pass(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            for name in ("event-1.png", "event-2.png"):
+                self.write_image(root, name, og_placeholder())
+
+            result = verify_og_images(root, jobs=2)
+
+            self.assertEqual(result["images"], 2)
+
+    def test_structural_problems_are_detected_from_headers(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            valid = og_placeholder()
+            cases = {
+                "wrong-size.png": og_placeholder(600, 315),
+                "truncated.png": valid[:-12],
+                "trailing.png": valid + b"junk",
+                "jpeg.png": b"\xff\xd8\xff\xe0" + valid[4:],
+                "bad-crc.png": valid[:29] + b"\0\0\0\0" + valid[33:],
+                "no-idat.png": valid[:33] + png_chunk(b"IEND", b""),
+                "overrun.png": valid[:33] + struct.pack(">I", 1 << 30) + b"IDAT" + valid[41:],
+            }
+            expected = {
+                "wrong-size.png": "600x315, expected 1200x630",
+                "truncated.png": "truncated before IEND",
+                "trailing.png": "trailing bytes after IEND",
+                "jpeg.png": "not a PNG",
+                "bad-crc.png": "IHDR CRC mismatch",
+                "no-idat.png": "no IDAT chunk",
+                "overrun.png": "IDAT chunk runs past end of file",
+            }
+            for name, payload in cases.items():
+                self.assertEqual(check_png(self.write_image(root, name, payload)), expected[name], name)
+
+            with self.assertRaises(ValueError) as raised:
+                verify_og_images(root)
+            self.assertEqual(str(raised.exception).count("og/events/"), len(cases))
+
+
+if __name__ == "__main__":
+    unittest.main()
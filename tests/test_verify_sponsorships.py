@@ -1,8 +1,9 @@
 import copy
+import random
 import unittest
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
-from scripts.verify_sponsorships import SponsorshipValidationError, validate
+from scripts.verify_sponsorships import CampaignIndex, SponsorshipValidationError, validate, validate_with_index
 
 NOW = datetime(2026, 8, 11, 0, 0, tzinfo=timezone.utc)
 
@@ -87,6 +88,70 @@ class SponsorshipValidationTests(unittest.TestCase):
         with self.assertRaisesRegex(SponsorshipValidationError, "duplicate"):
             validate(payload, event_payload(), now=NOW)
 
+    def test_overlapping_approved_campaigns_for_one_event_are_reported_not_rejected(self):
+        payload = campaign_payload()
+        overlapping = copy.deepcopy(payload["campaigns"][0])
+        overlapping.update(
+            campaign_id="demo-002", starts_at="2026-08-15T00:00:00Z", ends_at="2026-08-17T00:00:00Z"
+        )
+        payload["campaigns"].append(overlapping)
+        result, index = validate_with_index(payload, event_payload(), now=NOW)
+        self.assertEqual(result["active_campaign_count"], 1)
+        self.assertEqual(result["overlapping_campaigns"], [["demo-001", "demo-002"]])
+        self.assertEqual([(earlier[3], later[3]) for earlier, later in index.overlaps()], [("demo-001", "demo-002")])
+
+        overlapping["status"] = "PAUSED"
+        self.assertEqual(validate_with_index(payload, event_payload(), now=NOW)[1].overlaps(), [])
+
+    def test_nested_overlaps_are_all_reported(self):
+        def interval(hours, position, cid):
+            return (NOW + timedelta(hours=hours[0]), NOW + timedelta(hours=hours[1]), position, cid, "event-001")
+
+        index = CampaignIndex([interval((0, 10), 0, "a"), interval((1, 3), 1, "b"), interval((2, 4), 2, "c")])
+        self.assertEqual(
+            [(earlier[3], later[3]) for earlier, later in index.overlaps()], [("a", "b"), ("a", "c"), ("b", "c")]
+        )
+
+    def test_index_answers_active_campaigns_at_a_time(self):
+        payload = campaign_payload()
+        following = copy.deepcopy(payload["campaigns"][0])
+        following.update(
+            campaign_id="demo-002", starts_at="2026-08-16T00:00:00Z", ends_at="2026-08-20T00:00:00Z"
+        )
+        payload["campaigns"].append(following)
+
+        _, index = validate_with_index(payload, event_payload(), now=NOW)
+
+        self.assertEqual(index.active_at(NOW), ["demo-001"])
+        handover = datetime(2026, 8, 16, tzinfo=timezone.utc)
+        self.assertEqual(index.active_at(handover), ["demo-002"])
+        self.assertEqual(index.active_at(handover, "event-001"), ["demo-002"])
+        self.assertEqual(index.active_at(datetime(2026, 8, 20, tzinfo=timezone.utc)), [])
+        self.assertEqual(index.active_at(NOW, "missing"), [])
+
+    def test_interval_index_matches_a_linear_scan(self):
+        generator = random.Random(7)
+        intervals = []
+        for position in range(300):
+            starts_at = NOW + timedelta(hours=generator.randrange(1000))
+            ends_at = starts_at + timedelta(hours=generator.randrange(1, 169))
+            intervals.append((starts_at, ends_at, position, f"c-{position}", f"event-{position % 7}"))
+        index = CampaignIndex(intervals)
+        for hour in range(-5, 1200, 13):
+            when = NOW + timedelta(hours=hour)
+            live = sorted(interval for interval in intervals if interval[0] <= when < interval[1])
+            self.assertEqual(index.active_at(when), [interval[3] for interval in live])
+            self.assertEqual(
+                index.active_at(when, "event-3"), [interval[3] for interval in live if interval[4] == "event-3"]
+            )
+        overlapping = sorted(
+            (earlier, later)
+            for earlier in intervals
+            for later in intervals
+            if earlier < later and earlier[4] == later[4] and later[0] < earlier[1] and earlier[0] < later[1]
+        )
+        self.assertEqual(index.overlaps(), overlapping)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import unittest
+
+from scripts.write_deploy_plan import build_plan
+
+
+def asset(digit: str, size: int = 10) -> dict:
+    return {"bytes": size, "sha256": digit * 64}
+
+
+class DeployPlanTest(unittest.TestCase):
+    def test_plan_classifies_added_removed_modified_and_renamed_assets(self) -> None:
+        previous = {
+            "source_snapshot_sha256": "1" * 64,
+            "assets": {
+                "events.json": asset("a"),
+                "events/old/index.html": asset("b"),
+                "og/events/old.png": asset("c"),
+                "health.json": asset("d"),
+            },
+        }
+        current = {
+            "source_snapshot_sha256": "2" * 64,
+            "assets": {
+                "events.json": asset("e", 12),
+                "events/new/index.html": asset("f"),
+                "og/events/new.png": asset("c"),
+                "health.json": asset("d"),
+            },
+        }
+
+        plan = build_plan(previous, current)
+
+        self.assertEqual(plan["added"], ["events/new/index.html"])
+        self.assertEqual(plan["removed"], ["events/old/index.html"])
+        self.assertEqual(plan["modified"], ["events.json"])
+        self.assertEqual(
+            plan["renamed"],
+            [{"from": "og/events/old.png", "to": "og/events/new.png", "sha256": "c" * 64}],
+        )
+        self.assertEqual(plan["unchanged_count"], 1)
+        self.assertEqual(plan["upload"], ["events.json", "events/new/index.html", "og/events/new.png"])
+        self.assertEqual(plan["delete"], ["events/old/index.html", "og/events/old.png"])
+        self.assertEqual(plan["current_snapshot_sha256"], "2" * 64)
+
+    def test_identical_manifests_produce_an_empty_plan(self) -> None:
+        manifest = {"assets": {"index.html": asset("a"), "events.json": asset("b")}}
+        plan = build_plan(manifest, manifest)
+        self.assertEqual(plan["upload"], [])
+        self.assertEqual(plan["delete"], [])
+        self.assertEqual(plan["unchanged_count"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.snapshot_context import SnapshotContext
+from scripts.verify_projection_manifest import verify
+from scripts.write_event_offsets import OFFSETS_PATH, build_offsets, load_event, render, verify_offsets
+from tests.snapshot_fixture import published_manifest, write_snapshot
+
+EVENTS = [
+    {"id": "first", "title": "ナイトイベント", "starts_at": "2026-08-16T11:00:00Z"},
+    {"id": "second", "title": "Morning", "starts_at": "2026-08-17T00:00:00Z"},
+    {"id": "first", "title": "Repeat", "starts_at": "2026-08-18T00:00:00Z"},
+    {"title": "No id"},
+]
+
+
+class EventOffsetsTest(unittest.TestCase):
+    def write_snapshot(self, root: Path, events: list[dict[str, str]]) -> None:
+        # Indented, non-ASCII output so byte offsets differ from character offsets.
+        write_snapshot(root, events, indent=2)
+
+    def test_offsets_point_at_each_record_and_flag_duplicates(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_snapshot(root, EVENTS)
+
+            offsets = build_offsets(SnapshotContext(root))
+
+            self.assertEqual(offsets["count"], 4)
+            self.assertEqual(offsets["unidentified"], 1)
+            self.assertEqual(offsets["duplicate_id_status"], "duplicated")
+            self.assertEqual(list(offsets["duplicates"]), ["first"])
+            self.assertEqual(list(offsets["offsets"]), ["second"])
+            raw = (root / "events.json").read_bytes()
+            for offset, length in offsets["duplicates"]["first"]:
+                self.assertEqual(json.loads(raw[offset:offset + length])["id"], "first")
+            self.assertEqual(load_event(root / "events.json", offsets, "second"), EVENTS[1])
+            self.assertIsNone(load_event(root / "events.json", offsets, "first"))
+
+    def test_verify_rejects_offsets_from_a_different_events_json(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_snapshot(root, EVENTS[:2])
+            (root / OFFSETS_PATH).write_text(render(build_offsets(SnapshotContext(root))), encoding="utf-8")
+            self.assertEqual(verify_offsets(SnapshotContext(root)), 2)
+            with published_manifest(root) as publish:
+                self.assertEqual(verify(root, publish())["status"], "ok")
+
+                self.write_snapshot(root, [EVENTS[1], EVENTS[0]])
+                with self.assertRaisesRegex(ValueError, "built from a different events.json"):
+                    verify(root, publish())
+
+                offsets = build_offsets(SnapshotContext(root))
+                offsets["offsets"]["second"] = [0, 1]
+                (root / OFFSETS_PATH).write_text(render(offsets), encoding="utf-8")
+                with self.assertRaisesRegex(ValueError, "inconsistent with events.json: offsets"):
+                    verify(root, publish())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.snapshot_context import SnapshotContext
+from scripts.verify_projection_manifest import verify
+from scripts.write_events_columnar import COLUMNAR_PATH, canonical, decode_events, encode_events, render
+from tests.snapshot_fixture import published_manifest, write_snapshot
+
+PAYLOAD = {
+    "schema_version": "2",
+    "generated_at": "2026-08-10T00:00:00Z",
+    "events": [
+        {
+            "id": "event-1",
+            "status": "scheduled",
+            "confidence": 0.9,
+            "review_required": False,
+            "tags": ["VRChat", "music"],
+            "official_links": [{"url": "https://example.com/1", "kind": "official_site", "label": "公式サイト"}],
+        },
+        {
+            "status": "scheduled",
+            "id": "event-2",
+            "ends_at": None,
+            "confidence": 1,
+            "tags": [],
+            "official_links": [{"url": "https://example.com/2", "kind": "official_site", "label": "公式サイト"}],
+            "provenance": {"source": {"nested": [1, 2.5, True]}},
+        },
+    ],
+    "count": 2,
+}
+
+
+class EventsColumnarTest(unittest.TestCase):
+    def test_round_trip_preserves_values_types_and_key_order(self) -> None:
+        compact = encode_events(PAYLOAD, "0" * 64)
+
+        self.assertEqual(canonical(decode_events(compact)), canonical(PAYLOAD))
+        self.assertEqual(compact["strings"][0], "id")
+        self.assertEqual(compact["columns"][compact["column_names"].index("ends_at")][0], None)
+        self.assertEqual(len(compact["record_shapes"]), 2)
+        self.assertEqual(len(compact["shapes"]), 3)
+
+    def test_verify_round_trips_the_deployed_projection(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            write_snapshot(root, PAYLOAD)
+            context = SnapshotContext(root)
+            compact = encode_events(PAYLOAD, context.digest("events.json")[1])
+            (root / COLUMNAR_PATH).write_text(render(compact), encoding="utf-8")
+
+            with published_manifest(root, "e" * 40) as publish:
+                self.assertEqual(verify(root, publish())["status"], "ok")
+
+                compact["columns"][compact["column_names"].index("confidence")][1] = [2, 1.0]
+                (root / COLUMNAR_PATH).write_text(render(compact), encoding="utf-8")
+                with self.assertRaisesRegex(ValueError, "does not round-trip"):
+                    verify(root, publish())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+from scripts.snapshot_context import SnapshotContext
+from scripts.verify_projection_manifest import verify
+from scripts.verify_sponsorships import validate
+from scripts.write_featured_schedule import SCHEDULE_PATH, render, schedule_for, verify_schedule
+from tests.snapshot_fixture import published_manifest, write_snapshot
+
+NOW = datetime(2026, 8, 11, 0, 0, tzinfo=timezone.utc)
+
+
+def campaign(campaign_id: str, event_id: str, starts_at: str, ends_at: str, status: str = "APPROVED") -> dict:
+    return {
+        "campaign_id": campaign_id,
+        "event_id": event_id,
+        "sponsor_name": "Synthetic Organizer",
+        "starts_at": starts_at,
+        "ends_at": ends_at,
+        "status": status,
+        "approved_at": "2026-08-09T00:00:00Z",
+        "destination_url": f"https://example.com/{event_id}",
+        "authorization_status": "VERIFIED",
+        "authorization_evidence_url": f"https://example.com/{event_id}/authorization",
+    }
+
+
+class FeaturedScheduleTest(unittest.TestCase):
+    def write_snapshot(self, root: Path) -> None:
+        events = [
+            {
+                "id": event_id,
+                "title": f"Event {event_id}",
+                "organizer": "Host",
+                "starts_at": "2026-08-12T11:00:00Z",
+                "official_url": f"https://example.com/{event_id}",
+            }
+            for event_id in ("event-1", "event-2")
+        ]
+        sponsorships = {
+            "schema_version": "featured-tonight.v1",
+            "campaigns": [
+                campaign("late", "event-1", "2026-08-13T00:00:00Z", "2026-08-14T00:00:00Z"),
+                campaign("paused", "event-2", "2026-08-10T00:00:00Z", "2026-08-12T00:00:00Z", "PAUSED"),
+                campaign("early", "event-2", "2026-08-10T00:00:00Z", "2026-08-12T00:00:00Z"),
+            ],
+        }
+        write_snapshot(root, events, extra={"sponsorships.json": sponsorships})
+
+    def test_schedule_lists_approved_windows_by_start_with_resolved_event_fields(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_snapshot(root)
+
+            schedule = schedule_for(SnapshotContext(root), now=NOW)
+
+            self.assertEqual([window["campaign_id"] for window in schedule["windows"]], ["early", "late"])
+            self.assertEqual(schedule["windows"][0]["title"], "Event event-2")
+            self.assertEqual(schedule["windows"][0]["organizer"], "Host")
+            self.assertEqual(schedule["windows"][0]["destination_url"], "https://example.com/event-2")
+            self.assertEqual(schedule["windows"][0]["event_starts_at"], "2026-08-12T11:00:00Z")
+            self.assertEqual(len(schedule["events_sha256"]), 64)
+
+    def test_manifest_verification_rejects_a_stale_schedule(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_snapshot(root)
+            schedule_path = root / SCHEDULE_PATH
+            schedule_path.parent.mkdir(parents=True)
+            schedule_path.write_text(render(schedule_for(SnapshotContext(root), now=NOW)), encoding="utf-8")
+            with published_manifest(root) as publish:
+                self.assertEqual(verify(root, publish())["status"], "ok")
+
+                sponsorships = json.loads((root / "sponsorships.json").read_text(encoding="utf-8"))
+                sponsorships["campaigns"].pop()
+                (root / "sponsorships.json").write_text(json.dumps(sponsorships) + "\n", encoding="utf-8")
+                with self.assertRaisesRegex(ValueError, "featured-tonight-schedule.json is stale"):
+                    verify(root, publish())
+
+    def test_schedule_check_does_not_depend_on_the_clock(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_snapshot(root)
+            (root / SCHEDULE_PATH).parent.mkdir(parents=True)
+            (root / SCHEDULE_PATH).write_text(render(schedule_for(SnapshotContext(root), now=NOW)), encoding="utf-8")
+            context = SnapshotContext(root)
+            later = datetime(2026, 9, 1, tzinfo=timezone.utc)
+
+            with self.assertRaisesRegex(ValueError, "expired APPROVED campaign"):
+                validate(context.json("sponsorships.json"), context.json("events.json"), now=later)
+            self.assertEqual(verify_schedule(context), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
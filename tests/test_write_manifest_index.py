@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.verify_projection_manifest import verify
+from scripts.write_manifest_index import HEADER, ManifestIndex, build_index, index_path, verify_index
+from scripts.write_projection_manifest import build_manifest
+from tests.snapshot_fixture import MANIFEST_TIMESTAMP, published_manifest, write_snapshot
+
+
+class ManifestIndexTest(unittest.TestCase):
+    def write_snapshot(self, root: Path) -> None:
+        write_snapshot(root, [{"id": "event-1"}])
+        for name in ("og/events/b.png", "og/events/a.png", "events/ä/index.html"):
+            (root / name).parent.mkdir(parents=True, exist_ok=True)
+            (root / name).write_bytes(name.encode("utf-8"))
+
+    def test_lookup_and_iteration_match_the_manifest(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_snapshot(root)
+            manifest = build_manifest(root, "d" * 40, timestamp=MANIFEST_TIMESTAMP)
+            path = root.parent / f"{root.name}-manifest.idx"
+            path.write_bytes(build_index(manifest))
+            try:
+                with ManifestIndex(path) as index:
+                    self.assertEqual(len(index), len(manifest["assets"]))
+                    for name, expected in manifest["assets"].items():
+                        self.assertEqual(index.lookup(name), expected)
+                    self.assertIsNone(index.lookup("og/events/c.png"))
+                    self.assertIsNone(index.lookup(""))
+                    names = [bytes(encoded).decode("utf-8") for encoded, _, _ in index]
+                self.assertEqual(names, sorted(manifest["assets"], key=lambda name: name.encode("utf-8")))
+                self.assertEqual(verify_index(path, manifest), len(names))
+            finally:
+                path.unlink()
+
+    def test_verify_cross_checks_the_sidecar_against_the_manifest(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            self.write_snapshot(root)
+            with published_manifest(root) as publish:
+                manifest_path = publish()
+                manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+                sidecar = index_path(manifest_path)
+                try:
+                    sidecar.write_bytes(build_index(manifest))
+                    self.assertEqual(verify(root, manifest_path)["status"], "ok")
+
+                    assets = {**manifest["assets"], "og/events/a.png": {"bytes": 1, "sha256": "0" * 64}}
+                    sidecar.write_bytes(build_index(dict(manifest, assets=assets)))
+                    with self.assertRaisesRegex(ValueError, "disagrees with the manifest for og/events/a.png"):
+                        verify(root, manifest_path)
+
+                    sidecar.write_bytes(build_index(manifest)[: HEADER.size + 10])
+                    with self.assertRaisesRegex(ValueError, "truncated records"):
+                        verify(root, manifest_path)
+                finally:
+                    sidecar.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.write_projection_kpi import KPI_LOG, empty_state, percentile, summarize, update
+
+
+def snapshot_line(generated_at: str, cumulative: int, delta: int | None) -> str:
+    record = {"generated_at": generated_at, "accepted_event_cumulative": cumulative, "delta": delta}
+    return json.dumps(record, separators=(",", ":")) + "\n"
+
+
+def manifest(generated_at: str, deployed_at: str, status: str = "validated") -> dict[str, str]:
+    return {
+        "source_snapshot_sha256": generated_at,
+        "source_snapshot_generated_at": generated_at,
+        "deployed_at": deployed_at,
+        "validation_status": status,
+    }
+
+
+class ProjectionKpiTest(unittest.TestCase):
+    def test_each_run_reads_only_the_appended_tail(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            log = Path(temp) / KPI_LOG
+            log.write_text(
+                snapshot_line("2026-08-15T10:00:00Z", 700, None) + snapshot_line("2026-08-15T11:00:00Z", 704, 4),
+                encoding="utf-8",
+            )
+            state = empty_state(window=2)
+            self.assertEqual(update(state, log)["snapshots"], 2)
+
+            with log.open("a", encoding="utf-8") as handle:
+                handle.write(snapshot_line("2026-08-15T12:00:00Z", 710, 6))
+                handle.write('{"generated_at":"2026-08-15T13:00:00Z"')
+            self.assertEqual(update(state, log)["snapshots"], 1)
+            with log.open("a", encoding="utf-8") as handle:
+                handle.write(',"accepted_event_cumulative":711,"delta":1}\n')
+            self.assertEqual(update(state, log)["snapshots"], 1)
+
+            summary = summarize(state)
+            self.assertEqual(summary["snapshots_received"], 4)
+            self.assertEqual(summary["accepted_event_cumulative"], 711)
+            self.assertEqual(summary["accepted_event_delta_in_window"], 7)
+            self.assertIsNone(summary["canonical_snapshot_acceptance_rate"])
+            self.assertIsNone(summary["public_verification_success_rate"])
+            update(state, log, [manifest("2026-08-15T12:00:00Z", "2026-08-15T12:30:00Z", status="failed")])
+            self.assertEqual(summarize(state)["canonical_snapshot_acceptance_rate"], 0.0)
+
+            log.write_text(snapshot_line("2026-08-16T00:00:00Z", 1, None), encoding="utf-8")
+            self.assertEqual(update(state, log)["snapshots"], 1)
+            self.assertEqual(summarize(state)["snapshots_received"], 1)
+
+    def test_freshness_acceptance_and_verification_rates(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            log = root / KPI_LOG
+            log.write_text(
+                "".join(snapshot_line(f"2026-08-15T1{hour}:00:00Z", hour, 1) for hour in range(4)), encoding="utf-8"
+            )
+            verifications = root / "verification.jsonl"
+            verifications.write_text('{"status":"ok"}\n{"status":"failed"}\n{"status":"ok"}\n', encoding="utf-8")
+            manifests = [
+                manifest("2026-08-15T10:00:00Z", "2026-08-15T10:10:00Z"),
+                manifest("2026-08-15T11:00:00Z", "2026-08-15T11:30:00Z"),
+                manifest("2026-08-15T12:00:00Z", "2026-08-15T13:00:00Z", status="failed"),
+            ]
+            state = empty_state(window=10)
+            read = update(state, log, manifests, verifications)
+            self.assertEqual(read, {"snapshots": 4, "manifests": 3, "verifications": 3})
+            self.assertEqual(update(state, log, manifests[:1], verifications)["manifests"], 0)
+
+            summary = summarize(state)
+            self.assertEqual(summary["canonical_snapshot_acceptance_rate"], 0.5)
+            self.assertEqual(
+                summary["projection_freshness"], {"samples": 2, "p50_seconds": 600.0, "p95_seconds": 1800.0}
+            )
+            self.assertEqual(summary["public_verification_success_rate"], 0.666667)
+
+    def test_percentile_uses_nearest_rank(self) -> None:
+        self.assertIsNone(percentile([], 0.5))
+        self.assertEqual(percentile([float(value) for value in range(1, 101)], 0.95), 95.0)
+        self.assertEqual(percentile([3.0, 1.0, 2.0], 0.5), 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
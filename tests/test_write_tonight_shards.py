@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.snapshot_context import SnapshotContext
+from scripts.verify_projection_manifest import verify
+from scripts.write_tonight_shards import SHARD_DIR, SHARD_INDEX, build_shards, write_shards
+from tests.snapshot_fixture import published_manifest, write_snapshot
+
+EVENTS = [
+    {
+        "id": "late-night",
+        "canonical_name": "Late night",
+        "starts_at": "2026-08-16T15:30:00Z",
+        "ends_at": "2026-08-16T16:30:00Z",
+        "description": "dropped from the shard",
+        "provenance": {"source": "dropped"},
+        "review_required": False,
+    },
+    {"id": "evening", "canonical_name": "Evening", "starts_at": "2026-08-16T11:00:00Z", "review_required": False},
+    {"id": "morning", "canonical_name": "Morning", "starts_at": "2026-08-16T00:00:00+09:00"},
+    {"id": "undated", "canonical_name": "Date to be announced"},
+]
+PAYLOAD = {"generated_at": "2026-08-16T00:00:00Z", "count": len(EVENTS), "events": EVENTS}
+
+
+class TonightShardsTest(unittest.TestCase):
+    def test_events_are_bucketed_by_jst_day_with_only_tonight_fields(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            write_snapshot(root, PAYLOAD)
+
+            files = build_shards(SnapshotContext(root))
+
+            index = json.loads(files[SHARD_INDEX])
+            self.assertEqual([shard["date"] for shard in index["shards"]], ["2026-08-16", "2026-08-17"])
+            self.assertEqual(index["generated_at"], "2026-08-16T00:00:00Z")
+            self.assertEqual(index["undated_events"], 1)
+            first = json.loads(files[f"{SHARD_DIR}/2026-08-16.json"])
+            self.assertEqual([event["id"] for event in first["events"]], ["morning", "evening"])
+            late = json.loads(files[f"{SHARD_DIR}/2026-08-17.json"])["events"][0]
+            self.assertEqual(set(late), {"id", "canonical_name", "starts_at", "ends_at", "review_required"})
+
+    def test_verify_checks_shards_against_events_json(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            write_snapshot(root, PAYLOAD)
+            write_shards(root, build_shards(SnapshotContext(root)))
+            with published_manifest(root) as publish:
+                self.assertEqual(verify(root, publish())["status"], "ok")
+
+                (root / SHARD_DIR / "2026-08-17.json").write_text('{"events":[]}\n', encoding="utf-8")
+                (root / SHARD_DIR / "2026-08-20.json").write_text('{"events":[]}\n', encoding="utf-8")
+                with self.assertRaises(ValueError) as raised:
+                    verify(root, publish())
+            message = str(raised.exception)
+            self.assertIn("unexpected tonight shards: ['tonight/shards/2026-08-20.json']", message)
+            self.assertIn("stale tonight shards: ['tonight/shards/2026-08-17.json']", message)
+
+            write_shards(root, build_shards(SnapshotContext(root)))
+            self.assertFalse((root / SHARD_DIR / "2026-08-20.json").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()